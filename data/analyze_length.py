@@ -2,58 +2,98 @@
 """
 Identifiziert Fragen wo die richtige Antwort die längste ist 
 und schlägt kürzere Alternativ-Formulierungen vor.
+
+Mit --stream werden die Fragen einzeln von der Platte gelesen (konstanter Speicher).
 """
 
+import heapq
 import json
+import sys
 from pathlib import Path
 
+from bank_stream import iter_items
+from length_stats import build_arrays, length_diff_ranking, single_mask
+
 DATA_DIR = Path(__file__).parent
 
 def load_questions():
     with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def analyze_length_pattern(data):
-    problematic = []
+def find_length_problem(q):
+    """Gibt einen Eintrag zurück, wenn die richtige Antwort signifikant am längsten ist."""
+    if q.get("isMultiSelect", False):
+        return None
     
-    for q in data["mcQuestions"]:
-        if q.get("isMultiSelect", False):
-            continue
-        
-        # Find correct answer
-        correct_opt = None
-        max_len = 0
-        for opt in q["options"]:
-            if opt["correct"]:
-                correct_opt = opt
-            if len(opt["text"]) > max_len:
-                max_len = len(opt["text"])
+    # Find correct answer
+    correct_opt = None
+    max_len = 0
+    for opt in q["options"]:
+        if opt["correct"]:
+            correct_opt = opt
+        if len(opt["text"]) > max_len:
+            max_len = len(opt["text"])
+    
+    if correct_opt and len(correct_opt["text"]) == max_len:
+        # Kürze die richtige Antwort oder verlängere eine falsche
+        other_lengths = [len(opt["text"]) for opt in q["options"] if not opt["correct"]]
+        max_wrong = max(other_lengths) if other_lengths else 0
         
-        if correct_opt and len(correct_opt["text"]) == max_len:
-            # Kürze die richtige Antwort oder verlängere eine falsche
-            other_lengths = [len(opt["text"]) for opt in q["options"] if not opt["correct"]]
-            max_wrong = max(other_lengths) if other_lengths else 0
-            
-            if len(correct_opt["text"]) > max_wrong + 20:  # Signifikant länger
-                problematic.append({
-                    "id": q["id"],
-                    "stem": q["stem"][:80],
-                    "correct": correct_opt["text"],
-                    "correct_len": len(correct_opt["text"]),
-                    "max_wrong_len": max_wrong,
-                    "diff": len(correct_opt["text"]) - max_wrong
-                })
+        if len(correct_opt["text"]) > max_wrong + 20:  # Signifikant länger
+            return {
+                "id": q["id"],
+                "stem": q["stem"][:80],
+                "correct": correct_opt["text"],
+                "correct_len": len(correct_opt["text"]),
+                "max_wrong_len": max_wrong,
+                "diff": len(correct_opt["text"]) - max_wrong
+            }
+    return None
+
+def analyze_length_pattern(data, top=10):
+    mc_questions = data["mcQuestions"]
     
-    # Sort by difference
-    problematic.sort(key=lambda x: x["diff"], reverse=True)
+    if isinstance(mc_questions, list):
+        # Vektorisiert über NumPy-Arrays
+        arrays = build_arrays(mc_questions)
+        indices, diffs, correct_lens, _ = length_diff_ranking(arrays, single_mask(arrays))
+        total = len(indices)
+        worst = []
+        for index, diff, correct_len in zip(indices[:top], diffs[:top], correct_lens[:top]):
+            q = mc_questions[index]
+            correct_text = [opt["text"] for opt in q["options"] if opt["correct"]][-1]
+            worst.append({
+                "id": q["id"],
+                "stem": q["stem"][:80],
+                "correct": correct_text,
+                "correct_len": int(correct_len),
+                "diff": int(diff)
+            })
+    else:
+        # Streaming: nur die Top-Einträge bleiben im Speicher
+        total = 0
+        
+        def problems():
+            nonlocal total
+            for q in mc_questions:
+                p = find_length_problem(q)
+                if p:
+                    total += 1
+                    yield p
+        
+        # Sort by difference
+        worst = heapq.nlargest(top, problems(), key=lambda x: x["diff"])
     
-    print(f"Fragen mit signifikant längerer richtiger Antwort: {len(problematic)}")
-    print("\nTop 10 problematisch (größte Längen-Differenz):")
-    for p in problematic[:10]:
+    print(f"Fragen mit signifikant längerer richtiger Antwort: {total}")
+    print(f"\nTop {top} problematisch (größte Längen-Differenz):")
+    for p in worst:
         print(f"\n{p['id']}: Diff={p['diff']}")
         print(f"  Frage: {p['stem']}...")
         print(f"  Richtig ({p['correct_len']}): {p['correct'][:80]}...")
 
 if __name__ == "__main__":
-    data = load_questions()
+    if "--stream" in sys.argv:
+        data = {"mcQuestions": iter_items("mcQuestions")}
+    else:
+        data = load_questions()
     analyze_length_pattern(data)
@@ -7,47 +7,68 @@ import json
 from pathlib import Path
 from collections import Counter
 
+import length_stats
+from length_stats import build_arrays, position_histogram, single_mask
+
 DATA_DIR = Path(__file__).parent
 
 def load_questions():
     with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def analyze_patterns(data):
-    mc_questions = data["mcQuestions"]
-    
-    print("=" * 60)
-    print("ANALYSE: Muster in den Fragen")
-    print("=" * 60)
+def collect_pattern_stats(mc_questions):
+    """Sammelt die Zähler für die Muster-Analyse (ohne Ausgabe)."""
+    # 1./2. Längste=Richtig und Positionen vektorisiert (nur Single-Choice)
+    arrays = build_arrays(mc_questions)
+    single = single_mask(arrays, by_flag=False)
+    longest_is_correct, total_single_correct = length_stats.longest_is_correct(arrays, single, first_only=True)
+    position_counts = Counter({
+        pos: int(count) for pos, count in enumerate(position_histogram(arrays, single)) if count
+    })
     
-    # 1. Check: Ist die richtige Antwort immer die längste?
-    print("\n1. LÄNGSTE ANTWORT = RICHTIG?")
-    longest_is_correct = 0
-    total_single_correct = 0
+    multi_select = []
+    topic_difficulty = {}
     
     for q in mc_questions:
-        # Skip multi-select questions
         correct_count = sum(1 for opt in q["options"] if opt["correct"])
-        if correct_count != 1:
-            continue
         
-        total_single_correct += 1
-        
-        # Find longest option
-        max_len = 0
-        longest_option = None
-        correct_option = None
+        # 3. Multi-Select Fragen
+        if correct_count > 1:
+            multi_select.append({
+                "id": q["id"],
+                "stem": q["stem"][:60] + "...",
+                "correct_count": correct_count,
+                "has_note": "note" in q
+            })
         
-        for opt in q["options"]:
-            if len(opt["text"]) > max_len:
-                max_len = len(opt["text"])
-                longest_option = opt
-            if opt["correct"]:
-                correct_option = opt
+        # 4. Difficulty distribution per topic
+        topic = q.get("topicName", "Unknown")
+        diff = q.get("difficulty", "medium")
         
-        if longest_option == correct_option:
-            longest_is_correct += 1
+        if topic not in topic_difficulty:
+            topic_difficulty[topic] = {"easy": 0, "medium": 0, "hard": 0}
+        topic_difficulty[topic][diff] = topic_difficulty[topic].get(diff, 0) + 1
     
+    return {
+        "total_single_correct": total_single_correct,
+        "longest_is_correct": longest_is_correct,
+        "position_counts": position_counts,
+        "multi_select": multi_select,
+        "topic_difficulty": topic_difficulty
+    }
+
+def print_pattern_report(stats):
+    total_single_correct = stats["total_single_correct"]
+    longest_is_correct = stats["longest_is_correct"]
+    position_counts = stats["position_counts"]
+    multi_select = stats["multi_select"]
+    
+    print("=" * 60)
+    print("ANALYSE: Muster in den Fragen")
+    print("=" * 60)
+    
+    # 1. Check: Ist die richtige Antwort immer die längste?
+    print("\n1. LÄNGSTE ANTWORT = RICHTIG?")
     print(f"   Single-Choice Fragen: {total_single_correct}")
     print(f"   Längste = Richtig: {longest_is_correct} ({longest_is_correct/total_single_correct*100:.1f}%)")
     if longest_is_correct / total_single_correct > 0.4:
@@ -57,17 +78,6 @@ def analyze_patterns(data):
     
     # 2. Check: Position der richtigen Antwort
     print("\n2. POSITION DER RICHTIGEN ANTWORT")
-    position_counts = Counter()
-    
-    for q in mc_questions:
-        correct_count = sum(1 for opt in q["options"] if opt["correct"])
-        if correct_count != 1:
-            continue
-        
-        for i, opt in enumerate(q["options"]):
-            if opt["correct"]:
-                position_counts[i] = position_counts.get(i, 0) + 1
-    
     for pos, count in sorted(position_counts.items()):
         letter = chr(65 + pos)  # A, B, C, D
         percentage = count / total_single_correct * 100
@@ -81,18 +91,6 @@ def analyze_patterns(data):
     
     # 3. Multi-Select Fragen
     print("\n3. MULTI-SELECT FRAGEN (All-that-apply)")
-    multi_select = []
-    
-    for q in mc_questions:
-        correct_count = sum(1 for opt in q["options"] if opt["correct"])
-        if correct_count > 1:
-            multi_select.append({
-                "id": q["id"],
-                "stem": q["stem"][:60] + "...",
-                "correct_count": correct_count,
-                "has_note": "note" in q
-            })
-    
     print(f"   Anzahl Multi-Select: {len(multi_select)}")
     for ms in multi_select[:5]:
         print(f"   - {ms['id']}: {ms['correct_count']} richtige | marked: {ms['has_note']}")
@@ -101,19 +99,13 @@ def analyze_patterns(data):
     
     # 4. Difficulty distribution per topic
     print("\n4. SCHWIERIGKEIT PRO THEMA")
-    topic_difficulty = {}
-    for q in mc_questions:
-        topic = q.get("topicName", "Unknown")
-        diff = q.get("difficulty", "medium")
-        
-        if topic not in topic_difficulty:
-            topic_difficulty[topic] = {"easy": 0, "medium": 0, "hard": 0}
-        topic_difficulty[topic][diff] = topic_difficulty[topic].get(diff, 0) + 1
-    
-    for topic, diffs in topic_difficulty.items():
+    for topic, diffs in stats["topic_difficulty"].items():
         print(f"   {topic[:40]}: E:{diffs['easy']} M:{diffs['medium']} H:{diffs['hard']}")
-    
-    return multi_select
+
+def analyze_patterns(data):
+    stats = collect_pattern_stats(data["mcQuestions"])
+    print_pattern_report(stats)
+    return stats["multi_select"]
 
 def main():
     data = load_questions()
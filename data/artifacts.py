@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Erzeugt die Build-Artefakte für das Frontend aus questions.json:
+1. Ein Shard pro Thema (shards/topic_NN.<hash>.json) mit den MC- und offenen Fragen
+   sowie den Erklärungsblöcken, auf die diese Fragen verweisen
+2. Content-adressierte Kopien der Gesamtdateien (questions.<hash>.json, flashcards.<hash>.json)
+   und der Suchindex (search_index.<hash>.json, siehe search_index.py)
+   sowie vorab erzeugte Prüfungsvarianten (exam_variants.<hash>.json, siehe exam_variants.py;
+   nur neu erzeugt, wenn sich die Datenbank-Version geändert hat; erfüllt die Datenbank
+   die Quoten nicht, steht im Manifest examVariants: null)
+3. Einen Delta-Patch vom vorigen Stand (patches/patch_<von>.<hash>.json, siehe bank_delta.py);
+   die Kette der Patches steht im Manifest
+4. Ein kleines Manifest (manifest.json) mit Metadaten, Themen, Fragenanzahl und Dateinamen;
+   veraltete Dateien werden erst entfernt, wenn das neue Manifest geschrieben ist
+
+Das Frontend lädt zuerst nur das Manifest und holt die Fragen eines Themas erst,
+wenn es gebraucht wird. Weil der Hash im Dateinamen steckt, können alle Artefakte
+außer dem Manifest dauerhaft gecacht werden; nur ein echter Rebuild ändert die Namen.
+Wer die Datenbank schon lokal hat, holt nach einem Rebuild nur die Patches.
+
+Release-Modus (--release): alle Artefakte als kompaktes JSON (ohne Einrückung und
+Leerzeichen) plus vorkomprimierte Geschwister-Dateien <name>.gz (gzip -9) und
+<name>.br (Brotli, Qualität 11; nur wenn das Paket brotli installiert ist) für
+Server mit gzip_static/brotli_static. Für jedes Artefakt wird die Größe roh
+(indent=2), minifiziert und komprimiert ausgegeben und mit dem letzten Lauf
+verglichen (.build/artifact_sizes.json).
+
+Aufruf:
+    python artifacts.py              # Entwicklungs-Build (lesbares JSON)
+    python artifacts.py --release    # minifiziert + .gz/.br + Größenbericht
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from bank_delta import bank_version, changed_count, compute_delta, extend_chain
+from search_index import build_search_index, serialize_index
+
+DATA_DIR = Path(__file__).parent
+SHARD_DIR = DATA_DIR / "shards"
+PATCH_DIR = DATA_DIR / "patches"
+MANIFEST_PATH = DATA_DIR / "manifest.json"
+SIZE_REPORT_PATH = DATA_DIR / ".build" / "artifact_sizes.json"
+HASH_LENGTH = 10
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+def load_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+
+def hashed_pattern(stem):
+    return re.compile(rf"^{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}\.json(\.gz|\.br)?$")
+
+def serialize(data, release=False):
+    """Lesbares JSON im Entwicklungs-Build, kompaktes im Release-Build."""
+    if release:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def compress(content):
+    """Gzip- und (falls verfügbar) Brotli-Fassung mit maximaler Kompression."""
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    return variants
+
+def write_file(path, content, build, overwrite=False):
+    """Schreibt ein Artefakt (im Release-Build mit .gz/.br) und merkt sich die Größen."""
+    if overwrite or not path.exists():
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    entry = {"name": str(path.relative_to(DATA_DIR)), "raw": build["raw"].pop(path.name, len(content)),
+             "minified": len(content)}
+    if build["release"]:
+        for suffix, packed in compress(content).items():
+            packed_path = path.with_name(path.name + suffix)
+            if overwrite or not packed_path.exists():
+                with open(packed_path, 'wb') as f:
+                    f.write(packed)
+            entry[suffix[1:]] = len(packed)
+    build["sizes"].append(entry)
+
+def write_hashed(directory, stem, content, build, raw_size=None):
+    """Schreibt content (bytes) als <stem>.<hash>.json und gibt den Dateinamen zurück."""
+    name = f"{stem}.{content_hash(content)}.json"
+    if raw_size is not None:
+        build["raw"][name] = raw_size
+    write_file(directory / name, content, build)
+    return name
+
+def sibling_names(name, build):
+    """Dateiname plus die komprimierten Geschwister, die der Build-Modus behält."""
+    if build["release"]:
+        return {name} | {name + suffix for suffix in COMPRESSED_SUFFIXES}
+    return {name}
+
+def remove_stale(directory, stem, keep, build):
+    """Entfernt ältere Hash-Versionen eines Artefakts (inkl. .gz/.br)."""
+    pattern = hashed_pattern(stem)
+    keep_names = sibling_names(keep, build) if keep else set()
+    for path in directory.glob(f"{stem}.*.json*"):
+        if pattern.match(path.name) and path.name not in keep_names:
+            os.remove(path)
+
+def defer_cleanup(build, func, *args):
+    """Merkt einen Aufräumschritt vor. Alte Dateien werden erst nach dem neuen Manifest
+    entfernt, sonst zeigt das alte Manifest bei einem Abbruch auf gelöschte Dateien."""
+    build["cleanup"].append((func, args))
+
+def run_cleanup(build):
+    for func, args in build["cleanup"]:
+        func(*args)
+
+def write_serialized(directory, stem, data, build):
+    """Serialisiert nach Build-Modus; als Rohgröße zählt immer das lesbare JSON."""
+    raw_size = len(serialize(data)) if build["release"] else None
+    return write_hashed(directory, stem, serialize(data, build["release"]), build, raw_size)
+
+def split_by_topic(data):
+    """Teilt die Fragen nach topicId auf (Reihenfolge innerhalb eines Themas bleibt erhalten)."""
+    shards = {topic["id"]: {"mcQuestions": [], "openQuestions": []} for topic in data["topics"]}
+    for key in ("mcQuestions", "openQuestions"):
+        for q in data[key]:
+            shards.setdefault(q["topicId"], {"mcQuestions": [], "openQuestions": []})[key].append(q)
+    return shards
+
+def referenced_blocks(data, questions):
+    """Die geteilten Erklärungsblöcke, auf die die Fragen verweisen."""
+    blocks = data.get("explanationBlocks", {})
+    keys = {key for q in questions for key in q.get("explanationRefs", [])}
+    return {key: blocks[key] for key in sorted(keys) if key in blocks}
+
+def remove_stale_shards(written, build):
+    """Entfernt Shards, die nicht (mehr) zu den geschriebenen Themen gehören."""
+    expected = set()
+    for info in written.values():
+        expected |= sibling_names(Path(info["shard"]).name, build)
+    for path in SHARD_DIR.glob("topic_*.json*"):
+        if path.name not in expected:
+            os.remove(path)
+
+def write_topic_shards(data, build):
+    """Schreibt einen Shard pro Thema; veraltete Shards werden nach dem Manifest entfernt."""
+    SHARD_DIR.mkdir(exist_ok=True)
+    written = {}
+    for topic_id, questions in split_by_topic(data).items():
+        stem = f"topic_{topic_id:02d}"
+        shard = {"topicId": topic_id, **questions}
+        blocks = referenced_blocks(data, questions["mcQuestions"] + questions["openQuestions"])
+        if blocks:
+            shard["explanationBlocks"] = blocks
+        name = write_serialized(SHARD_DIR, stem, shard, build)
+        written[topic_id] = {
+            "shard": f"shards/{name}",
+            "mcCount": len(questions["mcQuestions"]),
+            "openCount": len(questions["openQuestions"])
+        }
+
+    defer_cleanup(build, remove_stale_shards, written, build)
+    return written
+
+def write_bank_artifacts(data, build):
+    """Schreibt content-adressierte Kopien von questions.json und flashcards.json,
+    den Suchindex und die Prüfungsvarianten."""
+    questions_name = write_serialized(DATA_DIR, "questions", data, build)
+    defer_cleanup(build, remove_stale, DATA_DIR, "questions", questions_name, build)
+
+    with open(DATA_DIR / "flashcards.json", 'rb') as f:
+        flashcards = f.read()
+    if build["release"]:
+        flashcards_name = write_hashed(DATA_DIR, "flashcards", serialize(json.loads(flashcards), True),
+                                       build, len(flashcards))
+    else:
+        flashcards_name = write_hashed(DATA_DIR, "flashcards", flashcards, build)
+    defer_cleanup(build, remove_stale, DATA_DIR, "flashcards", flashcards_name, build)
+
+    # Suchindex und Varianten sind immer kompakt; Rohgröße = lesbares JSON
+    index = build_search_index(data)
+    index_name = write_hashed(DATA_DIR, "search_index", serialize_index(index), build, len(serialize(index)))
+    defer_cleanup(build, remove_stale, DATA_DIR, "search_index", index_name, build)
+
+    return {"full": questions_name, "flashcards": flashcards_name, "searchIndex": index_name}
+
+def load_previous_variants(manifest):
+    """Prüfungsvarianten aus dem letzten Manifest (oder None)."""
+    name = (manifest or {}).get("examVariants")
+    if not name or not (DATA_DIR / name).exists():
+        return None
+    with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def previous_variants(manifest, version):
+    """Prüfungsvarianten des letzten Builds, wenn sie zur Datenbank-Version gehören (sonst None)."""
+    variants = load_previous_variants(manifest)
+    return variants if variants and variants.get("bankVersion") == version else None
+
+def variants_match_ids(variants, data):
+    """Ob alle Fragen-IDs der Varianten in der Datenbank vorkommen."""
+    return (set(variants["mcIds"]) <= {q["id"] for q in data["mcQuestions"]}
+            and set(variants["openIds"]) <= {q["id"] for q in data["openQuestions"]})
+
+def quick_exam_variants(data, manifest):
+    """Varianten-Datei für den Schnellmodus: die des letzten Builds, solange ihre IDs noch passen.
+
+    Sonst None; das Frontend zieht die Prüfung dann zufällig, bis ein voller Build
+    neue Varianten erzeugt.
+    """
+    variants = load_previous_variants(manifest)
+    return manifest["examVariants"] if variants and variants_match_ids(variants, data) else None
+
+def write_exam_variants(data, build, manifest=None):
+    """Schreibt die Prüfungsvarianten; erzeugt sie nur neu, wenn sich die Datenbank geändert hat.
+
+    Die Erzeugung dauert einige Sekunden und braucht NumPy, deshalb wird exam_variants
+    erst hier importiert und bei unveränderter Datenbank gar nicht. Erfüllt die Datenbank
+    die Quoten nicht, gibt es keine Varianten (None); das Frontend zieht dann zufällig.
+    """
+    version = bank_version(data)
+    variants = previous_variants(manifest, version)
+    if variants is None:
+        from exam_variants import generate_variants
+        try:
+            variants, _ = generate_variants(data)
+        except ValueError as error:
+            print(f"⚠️  Keine Prüfungsvarianten: {error}")
+            defer_cleanup(build, remove_stale, DATA_DIR, "exam_variants", None, build)
+            return None
+        variants["bankVersion"] = version
+    # Immer kompakt (wird nur maschinell gelesen)
+    variants_name = write_hashed(DATA_DIR, "exam_variants", serialize(variants, release=True), build,
+                                 len(serialize(variants)))
+    defer_cleanup(build, remove_stale, DATA_DIR, "exam_variants", variants_name, build)
+    return variants_name
+
+def load_previous_release():
+    """Manifest und Datenbank des zuletzt geschriebenen Stands (oder (None, None))."""
+    if not MANIFEST_PATH.exists():
+        return None, None
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    bank_path = DATA_DIR / manifest.get("full", "")
+    if not manifest.get("full") or not bank_path.exists():
+        return manifest, None
+    with open(bank_path, 'r', encoding='utf-8') as f:
+        return manifest, json.load(f)
+
+def write_patch(patch, build):
+    """Schreibt einen Patch im aktuellen Build-Modus und gibt (Pfad, Größe) zurück."""
+    PATCH_DIR.mkdir(exist_ok=True)
+    content = serialize(patch, build["release"])
+    name = write_hashed(PATCH_DIR, f"patch_{patch['from']}", content, build)
+    return f"patches/{name}", len(content)
+
+def rewrite_chain(chain, build):
+    """Schreibt die vorhandenen Patches neu (z.B. minifiziert im Release-Build).
+
+    Fehlt eine Datei, bricht die Kette dort ab; ältere Stände laden dann alles neu.
+    """
+    rewritten = []
+    for link in chain:
+        path = DATA_DIR / link["file"]
+        if not path.exists():
+            rewritten = []
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            patch = json.load(f)
+        file, size = write_patch(patch, build)
+        rewritten.append({**link, "file": file, "size": size})
+    return rewritten
+
+def write_bank_patches(data, previous, build):
+    """Schreibt den Patch vom vorigen Stand und gibt (Version, Patch-Kette) zurück."""
+    manifest, old = previous
+    version = bank_version(data)
+    # Ohne vorigen Stand lässt sich nichts verketten
+    chain = rewrite_chain(manifest.get("patches", []), build) if old is not None else []
+
+    if old is not None and bank_version(old) != version:
+        delta = compute_delta(old, data)
+        file, size = write_patch(delta, build)
+        entry = {"from": delta["from"], "to": version, "file": file, "size": size,
+                 "changes": changed_count(delta)}
+        chain = extend_chain(chain, entry, len(serialize(data, build["release"])))
+
+    defer_cleanup(build, remove_stale_patches, chain, build)
+    return version, chain
+
+def remove_stale_patches(chain, build):
+    """Entfernt Patch-Dateien, die nicht (mehr) in der Kette stehen."""
+    expected = set()
+    for link in chain:
+        expected |= sibling_names(Path(link["file"]).name, build)
+    for path in PATCH_DIR.glob("patch_*.json*"):
+        if path.name not in expected:
+            os.remove(path)
+
+def build_manifest(data, shards, files):
+    topics = []
+    for topic in data["topics"]:
+        info = shards.get(topic["id"], {"shard": None, "mcCount": 0, "openCount": 0})
+        topics.append({**topic, **info})
+    return {
+        "metadata": data["metadata"],
+        "topics": topics,
+        **files
+    }
+
+def write_manifest(manifest, build):
+    """Das Manifest behält seinen festen Namen (wird immer revalidiert)."""
+    build["raw"][MANIFEST_PATH.name] = len(serialize(manifest))
+    write_file(MANIFEST_PATH, serialize(manifest, build["release"]), build, overwrite=True)
+    if not build["release"]:
+        for suffix in COMPRESSED_SUFFIXES:
+            stale = MANIFEST_PATH.with_name(MANIFEST_PATH.name + suffix)
+            if stale.exists():
+                os.remove(stale)
+
+def write_artifacts(data, release=False, sizes=None, quick=False):
+    """Schreibt Shards und Manifest für die übergebene Fragen-Datenbank.
+
+    Ist sizes eine Liste, wird pro Artefakt ein Eintrag mit den Größen angehängt.
+    Mit quick (Watch-Modus) werden Prüfungsvarianten und Patches nicht neu erzeugt:
+    die Varianten bleiben, solange ihre Fragen-IDs noch existieren, die Patch-Kette
+    wird verworfen (sie führt nur bis zur alten Version, Clients laden einmal alles).
+    """
+    build = {"release": release, "sizes": sizes if sizes is not None else [], "raw": {}, "cleanup": []}
+    # Vor dem Schreiben lesen: das Manifest wird am Ende überschrieben
+    previous = load_previous_release()
+    shards = write_topic_shards(data, build)
+    files = write_bank_artifacts(data, build)
+    if quick:
+        files["examVariants"] = quick_exam_variants(data, previous[0])
+        version, patches = bank_version(data), []
+        defer_cleanup(build, remove_stale_patches, patches, build)
+    else:
+        files["examVariants"] = write_exam_variants(data, build, previous[0])
+        version, patches = write_bank_patches(data, previous, build)
+    manifest = build_manifest(data, shards, {**files, "version": version, "patches": patches})
+    write_manifest(manifest, build)
+    run_cleanup(build)
+    return manifest
+
+def format_size(size):
+    return f"{size / 1024:9.1f} KB" if size is not None else "        -   "
+
+def print_size_report(sizes, previous=None):
+    """Tabelle roh/minifiziert/gzip/brotli pro Artefakt, mit Änderung gegenüber dem letzten Lauf."""
+    previous = {entry["name"].split(".")[0]: entry for entry in previous or []}
+    print(f"\n{'Artefakt':<34} {'roh':>12} {'minifiziert':>12} {'gzip':>12} {'brotli':>12}")
+    totals = {"raw": 0, "minified": 0, "gz": 0, "br": 0}
+    for entry in sizes:
+        line = f"{entry['name']:<34}"
+        for key in totals:
+            line += f" {format_size(entry.get(key))}"
+            totals[key] += entry.get(key) or 0
+        # Vergleich über den Namen ohne Hash (z.B. "questions", "shards/topic_01")
+        before = previous.get(entry["name"].split(".")[0])
+        key = "br" if "br" in entry else "gz" if "gz" in entry else "minified"
+        if before and before.get(key):
+            delta = entry[key] - before[key]
+            if delta:
+                line += f"  {'+' if delta > 0 else ''}{delta / 1024:.1f} KB"
+        print(line)
+    print(f"{'gesamt':<34}" + "".join(f" {format_size(totals[key] or None)}" for key in totals))
+
+def load_size_report():
+    if not SIZE_REPORT_PATH.exists():
+        return None
+    with open(SIZE_REPORT_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_size_report(sizes):
+    SIZE_REPORT_PATH.parent.mkdir(exist_ok=True)
+    with open(SIZE_REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(sizes, f, ensure_ascii=False, indent=2)
+
+def report_sizes(sizes):
+    """Gibt den Größenbericht aus und speichert ihn für den nächsten Vergleich."""
+    print_size_report(sizes, load_size_report())
+    save_size_report(sizes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build-Artefakte für das Frontend schreiben")
+    parser.add_argument("--release", action="store_true",
+                        help="Kompaktes JSON plus .gz/.br und Größenbericht")
+    args = parser.parse_args()
+
+    data = load_questions()
+    sizes = []
+    manifest = write_artifacts(data, release=args.release, sizes=sizes)
+    print(f"Shards geschrieben: {len(manifest['topics'])} Themen")
+    for topic in manifest["topics"]:
+        print(f"  {topic['shard']}: {topic['mcCount']} MC, {topic['openCount']} offen")
+    print(f"Fragen: {manifest['full']}")
+    print(f"Karteikarten: {manifest['flashcards']}")
+    print(f"Suchindex: {manifest['searchIndex']}")
+    print(f"Prüfungsvarianten: {manifest['examVariants'] or 'keine (Frontend zieht zufällig)'}")
+    print(f"Version: {manifest['version']} ({len(manifest['patches'])} Patches in der Kette)")
+    for link in manifest["patches"]:
+        print(f"  {link['from']} -> {link['to']}: {link['changes']} Einträge, {link['size'] / 1024:.1f} KB")
+    print(f"Manifest: {MANIFEST_PATH}")
+    if args.release:
+        if brotli is None:
+            print("Hinweis: Paket 'brotli' nicht installiert, nur .gz geschrieben")
+        report_sizes(sizes)
+
+if __name__ == "__main__":
+    main()
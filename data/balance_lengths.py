@@ -5,66 +5,82 @@ damit die Länge kein Hinweis mehr auf die richtige Antwort ist.
 """
 
 import json
+from collections import deque
 from pathlib import Path
 
+import length_stats
+from length_stats import build_arrays, single_mask
+from instrumentation import count, instrumented
+
 DATA_DIR = Path(__file__).parent
 
 def load_questions():
     with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def balance_lengths(data):
-    """Erweitert kurze falsche Antworten."""
-    
+# Höchstens so viele Erweiterungen pro Frage (früher: 3 Durchläufe über alle Fragen)
+MAX_EXTENSIONS = 3
+
+def correct_length(q):
+    for opt in q["options"]:
+        if opt["correct"]:
+            return len(opt["text"])
+    return 0
+
+def extend_text(old_text):
+    """Hängt eine plausible Erweiterung an, abhängig vom Inhalt."""
+    if "nicht" in old_text.lower() or "kein" in old_text.lower():
+        return old_text + ", was jedoch nicht den empirischen Befunden entspricht"
+    elif "immer" in old_text.lower() or "nur" in old_text.lower():
+        return old_text + " - dies ist allerdings eine Vereinfachung"
+    elif len(old_text) < 30:
+        return old_text + ", was jedoch die Komplexität des Konzepts unterschätzt"
+    return old_text + " gemäß dieser Interpretation"
+
+@instrumented()
+def balance_lengths(data, max_extensions=MAX_EXTENSIONS):
+    """Erweitert kurze falsche Antworten über eine Worklist.
+
+    Nur Fragen mit zu kurzen falschen Antworten werden bearbeitet; eine Frage
+    bleibt in der Worklist, bis sie balanciert ist oder max_extensions
+    Erweiterungen bekommen hat. Gibt (data, Modifikationen, IDs der nicht
+    balancierbaren Fragen) zurück.
+    """
     modifications = 0
-    
+    unresolved = []
+
+    # Verletzungen einmal bestimmen: falsche Antworten, die mehr als 40 Zeichen
+    # kürzer als die richtige sind
+    worklist = deque()
     for q in data["mcQuestions"]:
         if q.get("isMultiSelect", False):
             continue
-        
-        # Find lengths
-        correct_len = 0
-        for opt in q["options"]:
-            if opt["correct"]:
-                correct_len = len(opt["text"])
-                break
-        
-        # Erweitere kurze falsche Antworten
-        for opt in q["options"]:
-            if not opt["correct"] and len(opt["text"]) < correct_len - 40:
-                # Füge plausible Erweiterungen hinzu
-                old_text = opt["text"]
-                
-                # Verschiedene Erweiterungsstrategien basierend auf Inhalt
-                if "nicht" in old_text.lower() or "kein" in old_text.lower():
-                    opt["text"] = old_text + ", was jedoch nicht den empirischen Befunden entspricht"
-                elif "immer" in old_text.lower() or "nur" in old_text.lower():
-                    opt["text"] = old_text + " - dies ist allerdings eine Vereinfachung"
-                elif len(old_text) < 30:
-                    opt["text"] = old_text + ", was jedoch die Komplexität des Konzepts unterschätzt"
-                else:
-                    opt["text"] = old_text + " gemäß dieser Interpretation"
-                
-                modifications += 1
-    
-    return data, modifications
+        min_len = correct_length(q) - 40
+        short = [opt for opt in q["options"] if not opt["correct"] and len(opt["text"]) < min_len]
+        if short:
+            worklist.append((q, min_len, short, 1))
+    count("worklist", len(worklist))
+
+    while worklist:
+        q, min_len, short, attempt = worklist.popleft()
+        for opt in short:
+            opt["text"] = extend_text(opt["text"])
+            modifications += 1
+
+        short = [opt for opt in short if len(opt["text"]) < min_len]
+        if not short:
+            continue
+        if attempt < max_extensions:
+            worklist.append((q, min_len, short, attempt + 1))
+        else:
+            unresolved.append(q["id"])
+
+    return data, modifications, unresolved
 
 def verify_balance(data):
     """Überprüft die neue Längenverteilung."""
-    longest_is_correct = 0
-    total_single = 0
-    
-    for q in data["mcQuestions"]:
-        if q.get("isMultiSelect", False):
-            continue
-        
-        total_single += 1
-        
-        max_len = max(len(opt["text"]) for opt in q["options"])
-        correct_len = [len(opt["text"]) for opt in q["options"] if opt["correct"]][0]
-        
-        if correct_len == max_len:
-            longest_is_correct += 1
+    arrays = build_arrays(data["mcQuestions"])
+    longest_is_correct, total_single = length_stats.longest_is_correct(arrays, single_mask(arrays))
     
     percentage = longest_is_correct / total_single * 100
     print(f"Längste=Richtig: {longest_is_correct}/{total_single} ({percentage:.1f}%)")
@@ -77,13 +93,9 @@ def main():
     print("\nVOR Balancing:")
     before = verify_balance(data)
     
-    # Mehrere Durchläufe für bessere Balance
-    for i in range(3):
-        data, mods = balance_lengths(data)
-        print(f"\nDurchlauf {i+1}: {mods} Modifikationen")
-        perc = verify_balance(data)
-        if perc < 40:
-            break
+    data, mods, unresolved = balance_lengths(data)
+    print(f"\n{mods} Modifikationen, nicht balancierbar: {len(unresolved)} Fragen")
+    verify_balance(data)
     
     # Save
     output_path = DATA_DIR / "questions.json"
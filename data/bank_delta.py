@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Delta-Patches zwischen zwei Ständen der Fragen-Datenbank.
+
+1. Jeder Stand hat eine Version (Hash über das lesbare JSON, unabhängig vom Release-Modus)
+2. Ein Patch enthält nur, was sich geändert hat, nach ID geschlüsselt:
+   - Listen mit IDs (topics, mcQuestions, openQuestions): geänderte/neue Einträge,
+     entfernte IDs und die neue Reihenfolge nur dann, wenn sie sich nicht von selbst ergibt
+   - Objekte (metadata, explanationBlocks): geänderte und entfernte Schlüssel
+3. Die Patches bilden eine Kette (Version N -> N+1 -> ...), die im Manifest steht.
+   Ist die Kette zu lang oder zusammen größer als ein Teil der vollen Datenbank,
+   wird sie vorne gekürzt - Clients mit älterem Stand laden dann alles neu.
+
+apply_delta() muss mit applyBankPatch() in js/data.js übereinstimmen.
+
+Aufruf:
+    python bank_delta.py alt.json neu.json   # Patch-Statistik zwischen zwei Dateien
+"""
+
+import hashlib
+import json
+import sys
+
+VERSION_LENGTH = 10
+DELTA_VERSION = 1
+
+# Höchstens so viele Patches hintereinander, danach lohnt der volle Download
+MAX_CHAIN_LENGTH = 8
+# Alle Patches der Kette zusammen dürfen höchstens diesen Anteil der vollen Datenbank ausmachen
+MAX_CHAIN_SHARE = 0.5
+
+def bank_version(data):
+    """Version eines Stands (entspricht dem Hash von questions.<hash>.json im Entwicklungs-Build)."""
+    content = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return hashlib.sha256(content).hexdigest()[:VERSION_LENGTH]
+
+def is_id_list(value):
+    return isinstance(value, list) and all(isinstance(item, dict) and "id" in item for item in value)
+
+def diff_list(old, new):
+    """Geänderte/neue Einträge, entfernte IDs und ggf. die neue Reihenfolge."""
+    old_by_id = {item["id"]: item for item in old}
+    new_ids = [item["id"] for item in new]
+    new_id_set = set(new_ids)
+
+    upsert = [item for item in new if old_by_id.get(item["id"]) != item]
+    remove = [item_id for item_id in old_by_id if item_id not in new_id_set]
+    if not upsert and not remove and [item["id"] for item in old] == new_ids:
+        return None
+
+    delta = {"upsert": upsert, "remove": remove}
+    # Ohne Angabe: bestehende Einträge bleiben an ihrem Platz, neue kommen ans Ende
+    added = [item["id"] for item in upsert if item["id"] not in old_by_id]
+    kept = [item["id"] for item in old if item["id"] in new_id_set]
+    if kept + added != new_ids:
+        delta["order"] = new_ids
+    return delta
+
+def diff_object(old, new):
+    changed = {key: value for key, value in new.items() if old.get(key) != value}
+    removed = [key for key in old if key not in new]
+    if not changed and not removed:
+        return None
+    return {"set": changed, "remove": removed}
+
+def compute_delta(old, new):
+    """Patch von old nach new (beide vollständige Fragen-Datenbanken)."""
+    delta = {"version": DELTA_VERSION, "from": bank_version(old), "to": bank_version(new),
+             "lists": {}, "objects": {}, "set": {}, "remove": [key for key in old if key not in new]}
+    for key, value in new.items():
+        previous = old.get(key)
+        if is_id_list(value) and is_id_list(previous):
+            change = diff_list(previous, value)
+            if change:
+                delta["lists"][key] = change
+        elif isinstance(value, dict) and isinstance(previous, dict):
+            change = diff_object(previous, value)
+            if change:
+                delta["objects"][key] = change
+        elif previous != value:
+            delta["set"][key] = value
+    return delta
+
+def apply_list(items, change):
+    by_id = {item["id"]: item for item in items}
+    removed = set(change["remove"])
+    added = []
+    for item in change["upsert"]:
+        if item["id"] not in by_id:
+            added.append(item["id"])
+        by_id[item["id"]] = item
+    order = change.get("order") or [item["id"] for item in items if item["id"] not in removed] + added
+    return [by_id[item_id] for item_id in order]
+
+def apply_delta(data, delta):
+    """Wendet einen Patch an und gibt den neuen Stand zurück (data bleibt unverändert)."""
+    result = {key: value for key, value in data.items() if key not in delta["remove"]}
+    for key, change in delta["lists"].items():
+        result[key] = apply_list(result.get(key, []), change)
+    for key, change in delta["objects"].items():
+        value = {k: v for k, v in result.get(key, {}).items() if k not in change["remove"]}
+        value.update(change["set"])
+        result[key] = value
+    result.update(delta["set"])
+    return result
+
+def changed_count(delta):
+    return sum(len(change["upsert"]) + len(change["remove"]) for change in delta["lists"].values())
+
+def extend_chain(chain, entry, full_size):
+    """Hängt einen Patch an die Kette und kürzt sie vorne, bis sie sich noch lohnt."""
+    chain = chain + [entry]
+    while chain and (len(chain) > MAX_CHAIN_LENGTH
+                     or sum(link["size"] for link in chain) > full_size * MAX_CHAIN_SHARE):
+        chain = chain[1:]
+    return chain
+
+def patches_from(chain, version):
+    """Die Patches, die ein Client mit version der Reihe nach braucht (None = voller Download)."""
+    starts = [link["from"] for link in chain]
+    if version not in starts:
+        return None
+    index = len(starts) - 1 - starts[::-1].index(version)
+    return chain[index:]
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        new = json.load(f)
+
+    delta = compute_delta(old, new)
+    size = len(json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode('utf-8'))
+    full = len(json.dumps(new, ensure_ascii=False, separators=(",", ":")).encode('utf-8'))
+    print(f"{delta['from']} -> {delta['to']}: {changed_count(delta)} geänderte/entfernte Einträge")
+    for key, change in delta["lists"].items():
+        reordered = " (neue Reihenfolge)" if "order" in change else ""
+        print(f"  {key}: {len(change['upsert'])} geändert/neu, {len(change['remove'])} entfernt{reordered}")
+    for key, change in delta["objects"].items():
+        print(f"  {key}: {len(change['set'])} Schlüssel geändert, {len(change['remove'])} entfernt")
+    print(f"Patch: {size / 1024:.1f} KB, volle Datenbank: {full / 1024:.1f} KB")
+
+    if apply_delta(old, delta) != new:
+        print("FEHLER: Patch ergibt nicht den neuen Stand")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
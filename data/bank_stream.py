@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Streaming-Lesen und -Schreiben der Fragen-Datenbank.
+
+Statt questions.json komplett mit json.load zu laden, werden die Einträge von
+mcQuestions/openQuestions einzeln von der Platte gelesen. Kleine Top-Level-Werte
+(metadata, topics, ...) werden separat als Ganzes geliefert.
+
+Der Reader erzeugt Events (kind, key, value):
+- ("value", key, value)  kleiner Top-Level-Wert, komplett geparst
+- ("array", key, None)   Beginn eines gestreamten Arrays
+- ("item", key, item)    ein Eintrag eines gestreamten Arrays
+
+Der Writer nimmt (ggf. transformierte) Events entgegen, schreibt die Einträge
+direkt in Zwischendateien und setzt daraus am Ende die Ausgabe im gleichen
+Format wie json.dump(indent=2) zusammen. Der Speicherbedarf hängt damit nur von
+der Größe einer einzelnen Frage ab, nicht von der Größe der Datenbank.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from combine_questions import indent_block
+
+DATA_DIR = Path(__file__).parent
+STREAM_KEYS = ("mcQuestions", "openQuestions")
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+
+def iter_bank(path=None, stream_keys=STREAM_KEYS, chunk_size=CHUNK_SIZE):
+    """Liest questions.json als Event-Strom (siehe Modul-Docstring)."""
+    path = path or DATA_DIR / "questions.json"
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def peek():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in WHITESPACE:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    return ""
+
+        def expect(char):
+            nonlocal pos
+            if peek() != char:
+                raise ValueError(f"Ungültiges JSON in {path}: '{char}' erwartet")
+            pos += 1
+
+        def decode():
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise
+                    continue
+                # Eine Zahl am Pufferende könnte abgeschnitten sein
+                if end == len(buf) and not eof and fill():
+                    continue
+                pos = end
+                return value
+
+        expect("{")
+        if peek() == "}":
+            return
+        while True:
+            key = decode()
+            expect(":")
+            if key in stream_keys and peek() == "[":
+                pos += 1
+                yield ("array", key, None)
+                if peek() == "]":
+                    pos += 1
+                else:
+                    while True:
+                        yield ("item", key, decode())
+                        if peek() == ",":
+                            pos += 1
+                            continue
+                        expect("]")
+                        break
+            else:
+                yield ("value", key, decode())
+
+            if peek() == ",":
+                pos += 1
+                continue
+            expect("}")
+            break
+
+def iter_items(key, path=None):
+    """Liefert nur die Einträge eines gestreamten Arrays (z.B. mcQuestions)."""
+    for kind, event_key, value in iter_bank(path, stream_keys=(key,)):
+        if kind == "item" and event_key == key:
+            yield value
+
+def write_bank(events, path=None, finalize=None):
+    """Schreibt einen Event-Strom als questions.json.
+
+    finalize(values) darf die kleinen Top-Level-Werte (z.B. metadata) anpassen,
+    nachdem alle Einträge verarbeitet wurden. Die Zieldatei wird erst am Ende
+    atomar ersetzt, daher darf sie gleichzeitig die Quelle des Event-Stroms sein.
+    """
+    path = Path(path or DATA_DIR / "questions.json")
+    order = []
+    values = {}
+    spools = {}
+    counts = {}
+
+    try:
+        for kind, key, value in events:
+            if key not in order:
+                order.append(key)
+            if kind == "value":
+                values[key] = value
+            elif kind == "array":
+                spools[key] = tempfile.TemporaryFile('w+', encoding='utf-8', dir=path.parent)
+                counts[key] = 0
+            else:
+                spool = spools[key]
+                if counts[key]:
+                    spool.write(",\n")
+                spool.write(indent_block(json.dumps(value, ensure_ascii=False, indent=2), 4))
+                counts[key] += 1
+
+        if finalize:
+            finalize(values)
+            order.extend(k for k in values if k not in order)
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            out.write("{")
+            for i, key in enumerate(order):
+                out.write(",\n" if i else "\n")
+                out.write(f"  {json.dumps(key, ensure_ascii=False)}: ")
+                if key in spools:
+                    if counts[key]:
+                        out.write("[\n")
+                        spools[key].seek(0)
+                        shutil.copyfileobj(spools[key], out)
+                        out.write("\n  ]")
+                    else:
+                        out.write("[]")
+                else:
+                    block = json.dumps(values[key], ensure_ascii=False, indent=2)
+                    out.write(block.replace("\n", "\n  "))
+            out.write("\n}" if order else "}")
+        os.replace(tmp_path, path)
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+    return counts
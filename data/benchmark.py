@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Benchmark für alle Skripte im data/-Verzeichnis.
+
+1. Erzeugt synthetische Fragen-Datenbanken im Schema von questions.json
+   (topics, mcQuestions mit options/correct/isMultiSelect, openQuestions)
+2. Misst Laufzeit und Speicherspitze (tracemalloc) der Hauptfunktion jedes Skripts
+3. Schreibt die Ergebnisse als JSON, damit man sie zwischen Commits vergleichen kann
+
+Aufruf:
+    python benchmark.py                                   # 10^3, 10^4, 10^5 Fragen
+    python benchmark.py --sizes 1000,1000000 --only combine,improve
+    python benchmark.py --output neu.json --compare alt.json
+    python benchmark.py --rule-counts 10,100,1000         # Regel-Engine vs. Schleife über Regeln
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import re
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+import analyze_length
+import analyze_questions
+import balance_lengths
+import combine_questions
+import deep_quality_check
+import enhance_explanations
+import final_balance
+import fix_patterns
+import improve_questions
+import rule_engine
+
+DATA_DIR = Path(__file__).parent
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+# Fragen für die Messung der Regel-Engine (dort wächst die Anzahl der Regeln, nicht der Fragen)
+RULE_BANK_SIZE = 1_000
+
+WORDS = [
+    "Macht", "Führung", "Vertrauen", "Team", "Identität", "Prototypikalität", "Legitimität",
+    "Engagement", "Motivation", "Gruppe", "Verantwortung", "Chance", "Kompetenz", "Aggression",
+    "Selbstaffirmation", "Wertschätzung", "Struktur", "Virtualität", "Persönlichkeit", "Emergenz",
+    "beeinflusst", "erhöht", "verringert", "fördert", "hemmt", "zeigt", "führt", "zu", "durch",
+    "mehr", "weniger", "stark", "kaum", "bei", "mit", "ohne", "die", "der", "das", "eine",
+]
+
+# Phrasen, die die Regeln der Qualitäts-Skripte auslösen
+STEM_EXTRAS = ["", "", "", "", "in Studie 2", "welche Methode", "mit Cronbach alpha", "als Online-Umfrage"]
+OPTION_EXTRAS = ["", "", "", " nach gängiger Auffassung", " unter bestimmten Bedingungen",
+                 ", was häufig übersehen wird"]
+
+def sentence(rng, min_words, max_words):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+def generate_mc_question(rng, qid, topic_id):
+    multi = rng.random() < 0.12
+    correct_positions = set(rng.sample(range(4), 2 if multi else 1))
+    options = []
+    for i in range(4):
+        # Richtige Antworten etwas länger, damit die Balancing-Skripte Arbeit haben
+        length = (6, 16) if i in correct_positions else (2, 12)
+        options.append({
+            "text": sentence(rng, *length) + rng.choice(OPTION_EXTRAS),
+            "correct": i in correct_positions
+        })
+    return {
+        "id": qid,
+        "stem": f"{sentence(rng, 6, 14)} {rng.choice(STEM_EXTRAS)}?".replace(" ?", "?"),
+        "options": options,
+        "explanation": sentence(rng, 5, 40),
+        "difficulty": rng.choice(["easy", "medium", "medium", "hard"])
+    }
+
+def generate_open_question(rng, qid):
+    return {
+        "id": qid,
+        "stem": sentence(rng, 8, 16) + "?",
+        "modelAnswer": sentence(rng, 20, 60),
+        "keyPoints": [sentence(rng, 1, 3) for _ in range(3)],
+        "difficulty": rng.choice(["easy", "medium", "hard"])
+    }
+
+def generate_topic_files(n_mc, n_open=None, n_topics=9, seed=42):
+    """Erzeugt Topic-Dateien im Format von topic_NN_*.json."""
+    rng = random.Random(seed)
+    n_open = n_mc // 5 if n_open is None else n_open
+    topics = []
+    for t in range(n_topics):
+        topic_id = t + 1
+        mc = [generate_mc_question(rng, f"syn_{topic_id}_mc_{i}", topic_id)
+              for i in range(t, n_mc, n_topics)]
+        opn = [generate_open_question(rng, f"syn_{topic_id}_open_{i}")
+               for i in range(t, n_open, n_topics)]
+        half_mc = len(mc) // 2
+        half_open = len(opn) // 2
+        topics.append({
+            "topic": {
+                "id": topic_id,
+                "name": f"Synthetisches Thema {topic_id}",
+                "keyPapers": [],
+                "keyConcepts": [sentence(rng, 3, 6)]
+            },
+            "questions": {
+                "mc_existing": mc[:half_mc],
+                "mc_generated": mc[half_mc:],
+                "open_existing": opn[:half_open],
+                "open_generated": opn[half_open:]
+            }
+        })
+    return topics
+
+def generate_bank(n_mc, n_open=None, n_topics=9, seed=42):
+    """Erzeugt eine synthetische Datenbank im Schema von questions.json."""
+    data = combine_questions.combine_questions(generate_topic_files(n_mc, n_open, n_topics, seed))
+    fix_patterns.fix_questions(data)  # setzt isMultiSelect
+    return data
+
+def run_analyze(data):
+    analyze_questions.collect_pattern_stats(data["mcQuestions"])
+    analyze_length.analyze_length_pattern(data)
+
+# Name -> (Eingabe, Funktion); Eingabe ist "topics" oder "bank"
+BENCHMARKS = {
+    "combine": ("topics", combine_questions.combine_questions),
+    "improve": ("bank", improve_questions.improve_questions),
+    "deep_quality_check": ("bank", deep_quality_check.deep_quality_check),
+    "enhance": ("bank", enhance_explanations.enhance_all_explanations),
+    "fix_patterns": ("bank", fix_patterns.fix_questions),
+    "balance": ("bank", balance_lengths.balance_lengths),
+    "final_balance": ("bank", final_balance.aggressive_balance),
+    "analyze": ("bank", run_analyze),
+}
+
+def measure(func, make_input, memory=True):
+    """Misst Laufzeit (ohne Tracing) und optional die Speicherspitze (mit tracemalloc)."""
+    sink = io.StringIO()
+
+    data = make_input()
+    with contextlib.redirect_stdout(sink):
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        func(data)
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - start_cpu
+
+    peak = None
+    if memory:
+        data = make_input()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(sink):
+                func(data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return wall, cpu, peak
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=DATA_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes, names, memory=True, seed=42):
+    results = []
+    for size in sizes:
+        topics_json = json.dumps(generate_topic_files(size, seed=seed), ensure_ascii=False)
+        bank_json = json.dumps(generate_bank(size, seed=seed), ensure_ascii=False)
+        # Jede Messung bekommt eine frische Kopie (Kopierzeit wird nicht mitgemessen)
+        inputs = {"topics": lambda: json.loads(topics_json), "bank": lambda: json.loads(bank_json)}
+
+        for name in names:
+            kind, func = BENCHMARKS[name]
+            wall, cpu, peak = measure(func, inputs[kind], memory)
+            results.append({
+                "benchmark": name,
+                "size": size,
+                "wallSeconds": round(wall, 6),
+                "cpuSeconds": round(cpu, 6),
+                "peakBytes": peak,
+                "questionsPerSecond": round(size / wall) if wall else None
+            })
+            peak_text = f"{peak / 1024 / 1024:8.1f} MB" if peak is not None else "       -"
+            print(f"  {name:<20} n={size:>9,}  {wall * 1000:>10.1f} ms  {peak_text}")
+    return results
+
+def synthetic_rules(rng, n):
+    """n Regeln im Stil der Regel-Tabellen; die meisten treffen (wie echte Regeln) selten."""
+    rules = []
+    for i in range(n):
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyzäöü") for _ in range(rng.randint(5, 10)))
+        if i % 10 == 0:
+            # Einige Regeln mit echten Wörtern, damit es Treffer gibt
+            word = rng.choice(WORDS).lower()
+        rules.append(rf"{word}\s+{rng.choice(WORDS).lower()}" if i % 3 else rf"\b{word}\b")
+    return rules
+
+def rule_texts(data):
+    return [q["stem"] for q in data["mcQuestions"]] + \
+           [o["text"] for q in data["mcQuestions"] for o in q["options"]]
+
+def loop_hits(patterns, text):
+    """Referenz: jede Regel einzeln über den Text (Aufwand Text x Regeln)."""
+    return [i for i, pattern in enumerate(patterns) if pattern.search(text)]
+
+def run_rule_scaling(counts, seed=42):
+    """Laufzeit der Regel-Engine gegen die Schleife über alle Regeln bei wachsender Regelzahl."""
+    texts = rule_texts(generate_bank(RULE_BANK_SIZE, seed=seed))
+    rng = random.Random(seed)
+    results = []
+    for count in counts:
+        rules = synthetic_rules(rng, count)
+        engine = rule_engine.compile_matcher(rules)
+        patterns = [re.compile(rule, re.IGNORECASE) for rule in rules]
+
+        start = time.perf_counter()
+        engine_hits = [rule_engine.fired_rules(engine, text) for text in texts]
+        engine_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        reference = [loop_hits(patterns, text) for text in texts]
+        loop_seconds = time.perf_counter() - start
+
+        results.append({
+            "rules": count,
+            "texts": len(texts),
+            "engineSeconds": round(engine_seconds, 6),
+            "loopSeconds": round(loop_seconds, 6),
+            "sameHits": engine_hits == reference,
+        })
+        same = "" if engine_hits == reference else "  ⚠️ abweichende Treffer"
+        print(f"  {count:>6} Regeln  Engine {engine_seconds * 1000:>9.1f} ms  "
+              f"Schleife {loop_seconds * 1000:>9.1f} ms{same}")
+    return results
+
+def compare(results, baseline_path):
+    """Vergleicht die Laufzeiten mit einer früheren Ergebnisdatei."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+
+    print(f"\nVergleich mit {baseline_path} ({baseline.get('revision')}):")
+    for r in results:
+        before = old.get((r["benchmark"], r["size"]))
+        if not before or not before["wallSeconds"]:
+            continue
+        ratio = r["wallSeconds"] / before["wallSeconds"]
+        marker = "  ⚠️" if ratio > 1.2 else ""
+        print(f"  {r['benchmark']:<20} n={r['size']:>9,}  {ratio:>6.2f}x{marker}")
+
+def parse_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der data/-Skripte mit synthetischen Daten")
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in parse_list(v)], default=DEFAULT_SIZES,
+                        help="Kommagetrennte Anzahl MC-Fragen, z.B. 1000,1000000")
+    parser.add_argument("--only", type=parse_list, default=list(BENCHMARKS),
+                        help=f"Auswahl aus: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--rule-counts", type=lambda v: [int(x) for x in parse_list(v)],
+                        help="Regel-Engine mit so vielen Regeln messen, z.B. 10,100,1000")
+    parser.add_argument("--no-memory", action="store_true", help="Keine tracemalloc-Messung (schneller)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json", help="Ergebnisdatei (JSON)")
+    parser.add_argument("--compare", help="Frühere Ergebnisdatei zum Vergleich")
+    args = parser.parse_args()
+
+    unknown = [n for n in args.only if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unbekannte Benchmarks: {', '.join(unknown)}")
+
+    print("Benchmark:")
+    results = run_benchmarks(args.sizes, args.only, memory=not args.no_memory, seed=args.seed)
+
+    report = {
+        "revision": git_revision(),
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results
+    }
+    if args.rule_counts:
+        print(f"\nRegel-Engine ({RULE_BANK_SIZE:,} Fragen):")
+        report["ruleScaling"] = run_rule_scaling(args.rule_counts, seed=args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nGespeichert: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
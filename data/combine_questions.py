@@ -1,117 +1,357 @@
 #!/usr/bin/env python3
 """
 Kombiniert alle Topic-JSON-Dateien zu einer finalen questions.json für die Klausur-Trainer App.
+
+Die Topic-Dateien (topic_<Nr>_*.json, beliebig viele) werden mit einem
+Verzeichnis-Scan gefunden, parallel geladen und nach Topic-ID zusammengeführt.
+
+Der Build ist inkrementell: Für jede Topic-Datei wird ein Content-Hash im
+Build-Manifest (.build/combine_manifest.json) gespeichert und der fertig
+serialisierte Teil der Ausgabe zwischengespeichert. Nur geänderte Topics
+werden neu zusammengeführt, unveränderte Teile werden direkt übernommen.
+Zusätzlich werden die Topic-Shards und das Manifest (siehe artifacts.py) geschrieben.
+Vorher werden alle Topic-Dateien gegen das Schema geprüft (siehe schema_validation.py).
+
+Aufruf:
+    python combine_questions.py            # inkrementell
+    python combine_questions.py --force    # Cache ignorieren, alles neu
+    python combine_questions.py --workers 1   # Topic-Dateien seriell laden
+    python combine_questions.py --release  # Artefakte minifiziert + .gz/.br
 """
 
+import argparse
+import hashlib
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from artifacts import report_sizes, write_artifacts
+from instrumentation import instrumented
+from schema_validation import (collect_topic_results, ensure_valid, topic_validation_cache,
+                               validate_topic_content)
+
 DATA_DIR = Path(__file__).parent
+BUILD_DIR = DATA_DIR / ".build"
+TOPIC_CACHE_DIR = BUILD_DIR / "topics"
+MANIFEST_PATH = BUILD_DIR / "combine_manifest.json"
+MANIFEST_VERSION = 2
+TOPIC_FILE_PATTERN = re.compile(r"^topic_(\d+)_.*\.json$")
+MAX_WORKERS = 16
+
+def find_topic_files(directory=None):
+    """Findet alle Topic-Dateien (topic_<Nr>_*.json) mit einem einzigen Verzeichnis-Scan.
+
+    Sortiert nach Nummer (numerisch, beliebig viele Themen); gibt es mehrere
+    Dateien mit derselben Nummer, gewinnt die alphabetisch erste.
+    """
+    directory = Path(directory or DATA_DIR)
+    found = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = TOPIC_FILE_PATTERN.match(entry.name)
+            if match and entry.is_file():
+                found.setdefault(int(match.group(1)), []).append(entry.name)
+
+    paths = []
+    for number in sorted(found):
+        names = sorted(found[number])
+        if len(names) > 1:
+            print(f"Warnung: mehrere Topic-Dateien mit Nummer {number}, verwende {names[0]}")
+        paths.append(directory / names[0])
+    return paths
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def parallel_map(func, items, workers=None):
+    """Wendet func in einem Thread-Pool an; Ergebnisse in Eingabereihenfolge."""
+    items = list(items)
+    workers = min(workers or MAX_WORKERS, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+def read_valid_topic_files(paths, force=False, workers=None):
+    """Liest jede Topic-Datei genau einmal (parallel) und prüft sie dabei gegen das Schema.
+
+    Gibt pro Datei (Inhalt als bytes, Content-Hash) zurück; ungültige Dateien brechen
+    den Build ab (ValueError), bevor etwas geschrieben wird.
+    """
+    fingerprint, cached = topic_validation_cache(force)
+
+    def read(path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        return content, validate_topic_content(content, cached)
+
+    results = parallel_map(read, paths, workers)
+    errors, _ = collect_topic_results(fingerprint, [path.name for path in paths],
+                                      [result for _, result in results])
+    ensure_valid(errors, "Topic-Dateien")
+    return [(content, result[0]) for content, result in results]
+
+def load_topic_files(directory=None, workers=None):
+    """Lädt alle Topic-Dateien (nach der Schema-Prüfung) parallel, sortiert nach Topic-ID."""
+    contents = read_valid_topic_files(find_topic_files(directory), workers=workers)
+    topics = [json.loads(content) for content, _ in contents]
+    return sorted(topics, key=lambda topic: topic["topic"]["id"])
+
+def tag_questions(questions, topic_id, topic_name, question_type, is_original):
+    """Ergänzt die Topic- und Typ-Felder einer Fragenliste."""
+    for q in questions:
+        q["topicId"] = topic_id
+        q["topicName"] = topic_name
+        q["questionType"] = question_type
+        q["isOriginal"] = is_original
+        if "difficulty" not in q:
+            q["difficulty"] = "medium"
+    return questions
+
+def merge_topic(topic_data):
+    """Führt eine Topic-Datei zusammen: (Topic-Metadaten, MC-Fragen, offene Fragen)."""
+    topic = topic_data["topic"]
+    questions = topic_data["questions"]
 
-def load_topic_files():
-    """Lädt alle Topic-JSON-Dateien."""
-    topics = []
-    for i in range(1, 10):
-        pattern = f"topic_{i:02d}_*.json"
-        files = list(DATA_DIR.glob(pattern))
-        if files:
-            with open(files[0], 'r', encoding='utf-8') as f:
-                topics.append(json.load(f))
-    return topics
+    topic_id = topic["id"]
+    topic_name = topic["name"]
 
+    metadata = {
+        "id": topic_id,
+        "name": topic_name,
+        "keyPapers": topic.get("keyPapers", []),
+        "keyConcepts": topic.get("keyConcepts", []),
+        "focusFromImpulse": topic.get("focusFromImpulse", "")
+    }
+
+    # MC Fragen (existing + generated)
+    mc_questions = (
+        tag_questions(questions.get("mc_existing", []), topic_id, topic_name, "mc", True)
+        + tag_questions(questions.get("mc_generated", []), topic_id, topic_name, "mc", False)
+    )
+
+    # Offene Fragen
+    open_questions = (
+        tag_questions(questions.get("open_existing", []), topic_id, topic_name, "open", True)
+        + tag_questions(questions.get("open_generated", []), topic_id, topic_name, "open", False)
+    )
+
+    return metadata, mc_questions, open_questions
+
+def count_difficulties(mc_questions):
+    return {
+        "easy": len([q for q in mc_questions if q.get("difficulty") == "easy"]),
+        "medium": len([q for q in mc_questions if q.get("difficulty") == "medium"]),
+        "hard": len([q for q in mc_questions if q.get("difficulty") == "hard"])
+    }
+
+def build_metadata(total_topics, total_mc, total_open, difficulty_distribution):
+    return {
+        "course": "Sozialpsychologie: Was Macht mit uns macht",
+        "examDate": "2026-02-04",
+        "generatedAt": "2026-01-18",
+        "totalTopics": total_topics,
+        "totalMcQuestions": total_mc,
+        "totalOpenQuestions": total_open,
+        "difficultyDistribution": difficulty_distribution
+    }
+
+@instrumented()
 def combine_questions(topics):
     """Kombiniert alle Fragen in ein einheitliches Format."""
     all_mc_questions = []
     all_open_questions = []
     topic_metadata = []
-    
+
     for topic_data in topics:
-        topic = topic_data["topic"]
-        questions = topic_data["questions"]
-        
-        topic_id = topic["id"]
-        topic_name = topic["name"]
-        
-        topic_metadata.append({
-            "id": topic_id,
-            "name": topic_name,
-            "keyPapers": topic.get("keyPapers", []),
-            "keyConcepts": topic.get("keyConcepts", []),
-            "focusFromImpulse": topic.get("focusFromImpulse", "")
-        })
-        
-        # MC Fragen (existing + generated)
-        for q in questions.get("mc_existing", []):
-            q["topicId"] = topic_id
-            q["topicName"] = topic_name
-            q["questionType"] = "mc"
-            q["isOriginal"] = True
-            if "difficulty" not in q:
-                q["difficulty"] = "medium"
-            all_mc_questions.append(q)
-        
-        for q in questions.get("mc_generated", []):
-            q["topicId"] = topic_id
-            q["topicName"] = topic_name
-            q["questionType"] = "mc"
-            q["isOriginal"] = False
-            if "difficulty" not in q:
-                q["difficulty"] = "medium"
-            all_mc_questions.append(q)
-        
-        # Offene Fragen
-        for q in questions.get("open_existing", []):
-            q["topicId"] = topic_id
-            q["topicName"] = topic_name
-            q["questionType"] = "open"
-            q["isOriginal"] = True
-            if "difficulty" not in q:
-                q["difficulty"] = "medium"
-            all_open_questions.append(q)
-        
-        for q in questions.get("open_generated", []):
-            q["topicId"] = topic_id
-            q["topicName"] = topic_name
-            q["questionType"] = "open"
-            q["isOriginal"] = False
-            if "difficulty" not in q:
-                q["difficulty"] = "medium"
-            all_open_questions.append(q)
-    
+        metadata, mc_questions, open_questions = merge_topic(topic_data)
+        topic_metadata.append(metadata)
+        all_mc_questions.extend(mc_questions)
+        all_open_questions.extend(open_questions)
+
     return {
-        "metadata": {
-            "course": "Sozialpsychologie: Was Macht mit uns macht",
-            "examDate": "2026-02-04",
-            "generatedAt": "2026-01-18",
-            "totalTopics": len(topics),
-            "totalMcQuestions": len(all_mc_questions),
-            "totalOpenQuestions": len(all_open_questions),
-            "difficultyDistribution": {
-                "easy": len([q for q in all_mc_questions if q.get("difficulty") == "easy"]),
-                "medium": len([q for q in all_mc_questions if q.get("difficulty") == "medium"]),
-                "hard": len([q for q in all_mc_questions if q.get("difficulty") == "hard"])
-            }
-        },
+        "metadata": build_metadata(
+            len(topics),
+            len(all_mc_questions),
+            len(all_open_questions),
+            count_difficulties(all_mc_questions)
+        ),
         "topics": topic_metadata,
         "mcQuestions": all_mc_questions,
         "openQuestions": all_open_questions
     }
 
+# ---------------------------------------------------------------------------
+# Inkrementeller Build
+# ---------------------------------------------------------------------------
+
+def file_hash(path):
+    """SHA-256 über den Dateiinhalt."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def indent_block(text, spaces):
+    """Rückt alle Zeilen eines JSON-Blocks ein."""
+    prefix = " " * spaces
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+def serialize_items(items):
+    """Serialisiert Listeneinträge so, wie json.dump(indent=2) sie in questions.json schreibt."""
+    return ",\n".join(
+        indent_block(json.dumps(item, ensure_ascii=False, indent=2), 4) for item in items
+    )
+
+def serialize_list(fragments):
+    parts = [f for f in fragments if f]
+    if not parts:
+        return "[]"
+    return "[\n" + ",\n".join(parts) + "\n  ]"
+
+def build_topic_cache(content):
+    """Führt eine Topic-Datei (Inhalt als bytes) zusammen und gibt den serialisierten Cache-Eintrag zurück."""
+    metadata, mc_questions, open_questions = merge_topic(json.loads(content))
+    return {
+        "topicId": metadata["id"],
+        "topic": serialize_items([metadata]),
+        "mc": serialize_items(mc_questions),
+        "open": serialize_items(open_questions),
+        "mcCount": len(mc_questions),
+        "openCount": len(open_questions),
+        "difficulty": count_difficulties(mc_questions)
+    }
+
+def load_manifest():
+    if not MANIFEST_PATH.exists():
+        return {"version": MANIFEST_VERSION, "topics": {}}
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "topics": {}}
+    return manifest
+
+def save_manifest(manifest):
+    BUILD_DIR.mkdir(exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+def load_topic_cache(path, entry, content, digest, force=False):
+    """Cache-Eintrag einer Topic-Datei: (cache, Manifest-Eintrag, neu gebaut?).
+
+    content und digest stammen aus der Schema-Prüfung; die Datei wird nicht erneut gelesen.
+    """
+    stat = path.stat()
+    cache_path = TOPIC_CACHE_DIR / path.name
+
+    unchanged = False
+    if entry and not force and cache_path.exists():
+        unchanged = entry["hash"] == digest
+        if unchanged and (entry["size"], entry["mtimeNs"]) != (stat.st_size, stat.st_mtime_ns):
+            entry = {**entry, "size": stat.st_size, "mtimeNs": stat.st_mtime_ns}
+
+    if unchanged:
+        return read_json(cache_path), entry, False
+
+    cache = build_topic_cache(content)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+    entry = {
+        "hash": digest,
+        "size": stat.st_size,
+        "mtimeNs": stat.st_mtime_ns
+    }
+    return cache, entry, True
+
+def load_cached_topics(force=False, directory=None, workers=None):
+    """Liefert die Cache-Einträge aller Topics (sortiert nach Topic-ID).
+
+    Nur geänderte Dateien werden neu zusammengeführt; Lesen und Zusammenführen
+    laufen parallel in einem Thread-Pool.
+    """
+    manifest = load_manifest()
+    old_entries = manifest["topics"]
+
+    TOPIC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    paths = find_topic_files(directory)
+    # Lesen, Hashen und Schema-Prüfung in einem Durchgang pro Datei;
+    # ungültige Topic-Dateien brechen den Build ab, bevor etwas geschrieben wird
+    contents = read_valid_topic_files(paths, force, workers)
+
+    results = parallel_map(
+        lambda item: load_topic_cache(item[0], old_entries.get(item[0].name), *item[1], force=force),
+        list(zip(paths, contents)), workers)
+    new_entries = {path.name: entry for path, (_, entry, _) in zip(paths, results)}
+    rebuilt = [path.name for path, (_, _, was_rebuilt) in zip(paths, results) if was_rebuilt]
+    caches = sorted((cache for cache, _, _ in results), key=lambda cache: cache["topicId"])
+
+    # Caches gelöschter Topic-Dateien entfernen
+    for name in set(old_entries) - set(new_entries):
+        stale = TOPIC_CACHE_DIR / name
+        if stale.exists():
+            os.remove(stale)
+
+    manifest["topics"] = new_entries
+    save_manifest(manifest)
+    return caches, rebuilt
+
+def assemble_output(caches):
+    """Setzt questions.json aus den serialisierten Topic-Teilen zusammen."""
+    difficulty = {"easy": 0, "medium": 0, "hard": 0}
+    for cache in caches:
+        for level, count in cache["difficulty"].items():
+            difficulty[level] += count
+
+    metadata = build_metadata(
+        len(caches),
+        sum(c["mcCount"] for c in caches),
+        sum(c["openCount"] for c in caches),
+        difficulty
+    )
+
+    metadata_block = json.dumps(metadata, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    return (
+        "{\n"
+        f'  "metadata": {metadata_block},\n'
+        f'  "topics": {serialize_list(c["topic"] for c in caches)},\n'
+        f'  "mcQuestions": {serialize_list(c["mc"] for c in caches)},\n'
+        f'  "openQuestions": {serialize_list(c["open"] for c in caches)}\n'
+        "}"
+    ), metadata
+
 def main():
-    topics = load_topic_files()
-    print(f"Loaded {len(topics)} topic files")
-    
-    combined = combine_questions(topics)
-    
+    parser = argparse.ArgumentParser(description="Topic-Dateien zu questions.json kombinieren")
+    parser.add_argument("--force", action="store_true", help="Build-Cache ignorieren")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Threads zum Laden der Topic-Dateien (Standard: bis zu {MAX_WORKERS})")
+    parser.add_argument("--release", action="store_true",
+                        help="Artefakte als kompaktes JSON plus .gz/.br schreiben")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    caches, rebuilt = load_cached_topics(force=args.force, workers=args.workers)
+    print(f"Loaded {len(caches)} topic files ({len(rebuilt)} rebuilt, {len(caches) - len(rebuilt)} cached)")
+
+    output, metadata = assemble_output(caches)
+
     output_path = DATA_DIR / "questions.json"
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(combined, f, ensure_ascii=False, indent=2)
+        f.write(output)
     
-    print(f"\nCreated: {output_path}")
-    print(f"Total MC Questions: {combined['metadata']['totalMcQuestions']}")
-    print(f"Total Open Questions: {combined['metadata']['totalOpenQuestions']}")
-    print(f"Difficulty: {combined['metadata']['difficultyDistribution']}")
+    # Shards + Manifest für das Frontend
+    sizes = []
+    write_artifacts(json.loads(output), release=args.release, sizes=sizes)
+
+    elapsed = time.perf_counter() - start
+    print(f"\nCreated: {output_path} ({elapsed * 1000:.1f} ms)")
+    print(f"Total MC Questions: {metadata['totalMcQuestions']}")
+    print(f"Total Open Questions: {metadata['totalOpenQuestions']}")
+    print(f"Difficulty: {metadata['difficultyDistribution']}")
+    if args.release:
+        report_sizes(sizes)
 
 if __name__ == "__main__":
     main()
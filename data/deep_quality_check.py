@@ -2,7 +2,8 @@
 """
 Deep-Dive Fragen-Qualitätsprüfung:
 1. Identifiziert problematische Fragen (irrelevante Details, komische Formulierungen)
-2. Erweitert Erklärungen zu vollständigen Lernkarten
+2. Erweitert Erklärungen zu vollständigen Lernkarten (Kernwissen-Block pro Thema,
+   einmal in explanationBlocks gespeichert und per explanationRefs referenziert)
 3. Ersetzt schlechte Fragen durch relevantere
 
 KRITERIEN für gute Klausurfragen:
@@ -12,9 +13,11 @@ KRITERIEN für gute Klausurfragen:
 """
 
 import json
-import re
 from pathlib import Path
 
+from instrumentation import instrumented
+from rule_engine import compile_matcher, fired_rules
+
 DATA_DIR = Path(__file__).parent
 
 # Problematische Muster in Fragen
@@ -35,6 +38,9 @@ PROBLEM_PATTERNS = [
     (r'fragebogen', 'methodology'),
 ]
 
+# Einmal kompiliert: alle Muster in einem Durchlauf pro Fragestamm
+PROBLEM_MATCHER = compile_matcher([pattern for pattern, _ in PROBLEM_PATTERNS], name="deep_quality")
+
 # Erweiterte Erklärungen mit vollständigem Kontext
 TOPIC_FULL_EXPLANATIONS = {
     1: """PSYCHOLOGICAL SAFETY - Kernwissen:
@@ -107,7 +113,7 @@ Macht + wahrgenommene eigene Inkompetenz → Ego-Bedrohung → AGGRESSION
 3. Fähigkeit/Ability - Kompetenz
 
 🔗 Verantwortungsorientierte FK werden als wohlwollender und integrer wahrgenommen → mehr Vertrauen
-(Chancenorientierte FK werden als MÄCHTIGER aber weniger vertrauenswürdig gesehen)
+(Chancenorientierte FK werden als GLEICH mächtig und fähig, aber weniger vertrauenswürdig gesehen)
 
 📊 Power Granting: Benevolenz + hohe Integrität → höchste Bereitschaft, Macht zu übertragen""",
 
@@ -154,42 +160,69 @@ def load_questions():
 def analyze_question(q):
     """Analysiert eine Frage auf Probleme."""
     stem = q.get('stem', '').lower()
-    issues = []
-    
-    for pattern, issue_type in PROBLEM_PATTERNS:
-        if re.search(pattern, stem, re.IGNORECASE):
-            issues.append(issue_type)
+    return [PROBLEM_PATTERNS[i][1] for i in fired_rules(PROBLEM_MATCHER, stem)]
+
+# Trenner zwischen frage-spezifischer Erklärung und geteiltem Block (Frontend nutzt denselben)
+EXPLANATION_SEPARATOR = "\n\n" + "─" * 40 + "\n\n"
+
+def explanation_block_key(topic_id):
+    return f"kernwissen_{topic_id}"
+
+def build_explanation_blocks(topic_explanations):
+    """Topic-Tabelle der geteilten Erklärungsblöcke (jeder Text nur einmal)."""
+    return {explanation_block_key(tid): text for tid, text in topic_explanations.items()}
+
+def strip_inline_block(explanation):
+    """Entfernt einen früher direkt angehängten Kernwissen-Block aus der Erklärung.
     
-    return issues
+    Erkannt wird der Block am Trenner und an der Überschrift "... - Kernwissen:",
+    damit auch ältere Fassungen des Textes entfernt werden.
+    """
+    index = explanation.rfind(EXPLANATION_SEPARATOR)
+    if index < 0:
+        return explanation
+    heading = explanation[index + len(EXPLANATION_SEPARATOR):].split("\n", 1)[0]
+    if heading.endswith("Kernwissen:"):
+        return explanation[:index]
+    return explanation
 
 def enhance_single_explanation(q, topic_explanations):
-    """Erweitert eine Frage-Erklärung mit vollständigem Kontext."""
-    topic_id = q.get('topicId', 0)
-    current = q.get('explanation', '')
+    """Verknüpft eine Frage-Erklärung mit dem Kernwissen-Block ihres Themas.
     
+    Der Block wird nicht mehr in jede Frage kopiert, sondern über explanationRefs
+    referenziert; das Frontend fügt ihn beim Anzeigen an.
+    Gibt True zurück, wenn die Frage geändert wurde.
+    """
+    topic_id = q.get('topicId', 0)
     full_context = topic_explanations.get(topic_id, '')
     
     if not full_context:
-        return current
+        return False
     
-    # Wenn Erklärung kurz ist, erweitern
-    if len(current) < 200:
-        # Füge kurze spezifische Erklärung + vollständigen Kontext hinzu
-        enhanced = current + "\n\n" + "─" * 40 + "\n\n" + full_context
-        return enhanced
+    current = q.get('explanation', '')
+    stripped = strip_inline_block(current)
+    key = explanation_block_key(topic_id)
+    refs = q.get('explanationRefs', [])
     
-    # Wenn Erklärung schon gut ist, nur Kontext ergänzen wenn nicht vorhanden
-    if "Kernwissen" not in current:
-        return current + "\n\n" + "─" * 40 + "\n\n" + full_context
+    if stripped == current and key in refs:
+        return False
     
-    return current
+    q['explanation'] = stripped
+    if key not in refs:
+        q['explanationRefs'] = refs + [key]
+    return True
 
+@instrumented()
 def deep_quality_check(data):
     """Führt Deep Quality Check durch."""
     
     problematic_questions = []
     enhanced_count = 0
     
+    # Geteilte Blöcke einmal pro Thema speichern
+    blocks = data.setdefault('explanationBlocks', {})
+    blocks.update(build_explanation_blocks(TOPIC_FULL_EXPLANATIONS))
+    
     for q in data['mcQuestions']:
         issues = analyze_question(q)
         
@@ -200,15 +233,23 @@ def deep_quality_check(data):
                 'issues': issues
             })
         
-        # Erweitere Erklärung
-        old_explanation = q.get('explanation', '')
-        q['explanation'] = enhance_single_explanation(q, TOPIC_FULL_EXPLANATIONS)
-        
-        if q['explanation'] != old_explanation:
+        # Erweitere Erklärung (Referenz auf Kernwissen-Block)
+        if enhance_single_explanation(q, TOPIC_FULL_EXPLANATIONS):
             enhanced_count += 1
     
     return data, problematic_questions, enhanced_count
 
+def write_quality_report(problems):
+    """Schreibt die problematischen Fragen in quality_report.txt."""
+    with open(DATA_DIR / "quality_report.txt", 'w', encoding='utf-8') as f:
+        f.write("QUALITY REPORT - Fragen die manuell geprüft werden sollten\n")
+        f.write("=" * 60 + "\n\n")
+        
+        for p in problems:
+            f.write(f"ID: {p['id']}\n")
+            f.write(f"Issues: {', '.join(p['issues'])}\n")
+            f.write(f"Frage: {p['stem']}...\n\n")
+
 def main():
     print("Lade Fragen...")
     data = load_questions()
@@ -233,14 +274,7 @@ def main():
     print(f"\nGespeichert!")
     
     # Log für manuelle Review
-    with open(DATA_DIR / "quality_report.txt", 'w', encoding='utf-8') as f:
-        f.write("QUALITY REPORT - Fragen die manuell geprüft werden sollten\n")
-        f.write("=" * 60 + "\n\n")
-        
-        for p in problems:
-            f.write(f"ID: {p['id']}\n")
-            f.write(f"Issues: {', '.join(p['issues'])}\n")
-            f.write(f"Frage: {p['stem']}...\n\n")
+    write_quality_report(problems)
     
     print(f"Quality Report gespeichert: {DATA_DIR}/quality_report.txt")
 
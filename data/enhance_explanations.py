@@ -7,6 +7,8 @@ Fügt Take-Home-Messages und Kontext hinzu.
 import json
 from pathlib import Path
 
+from instrumentation import instrumented
+
 DATA_DIR = Path(__file__).parent
 
 # Take-Home-Messages pro Thema für Kontext
@@ -83,6 +85,7 @@ def enhance_explanation(question):
     
     return enhanced
 
+@instrumented()
 def enhance_all_explanations(data):
     """Erweitert alle Erklärungen."""
     enhanced_count = 0
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Erzeugt viele vorab geprüfte Prüfungsvarianten (MC + offene Fragen) in einem Lauf.
+
+Jede Variante erfüllt:
+- Themenquoten: MC-Fragen pro Thema proportional zur Fragenzahl des Themas
+  (mindestens eine pro Thema, solange genug Plätze da sind)
+- Schwierigkeitsmix: Anteil easy/medium/hard (Standard 25/50/25)
+- Multi-Select-Anteil (Standard 0 wie bisher in getExamQuestions)
+- Begrenzte Überschneidung: zwei Varianten teilen höchstens --max-overlap MC-Fragen
+- Offene Fragen aus verschiedenen Themen
+
+Statt zufällig zu ziehen und zu verwerfen (Rejection Sampling) wird pro Variante
+ein kleines Flussproblem gelöst: Quelle -> Thema (Quote) -> (Schwierigkeit,
+Multi-Select) (verfügbare Fragen) -> Senke (Zielanzahl). Jeder maximale Fluss
+erfüllt alle Quoten gleichzeitig; die Kantenreihenfolge wird pro Variante
+gemischt. Innerhalb einer Zelle werden die bisher am seltensten genutzten
+Fragen gewählt, Verletzungen der Überschneidungsgrenze werden durch Tausch
+innerhalb derselben Zelle repariert (Quoten bleiben dabei erhalten).
+
+Ausgabe (kompaktes JSON): Fragen-IDs einmal als Liste, Varianten als Indexlisten.
+Das Frontend wählt eine Variante per Zufallsindex (O(1)).
+
+Aufruf:
+    python exam_variants.py                          # 2000 Varianten, Statistik
+    python exam_variants.py --variants 5000 --max-overlap 8
+    python exam_variants.py --difficulty 30,50,20 --multi-share 0.1 --output variants.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from instrumentation import count, instrumented
+
+DATA_DIR = Path(__file__).parent
+VARIANTS_VERSION = 1
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+MC_COUNT = 20
+OPEN_COUNT = 3
+VARIANT_COUNT = 2000
+DIFFICULTY_RATIO = [0.25, 0.5, 0.25]
+MULTI_SHARE = 0.0
+MAX_OVERLAP = 10
+SEED = 42
+# Nach so vielen Fehlversuchen in Folge ist die Überschneidungsgrenze ausgeschöpft
+MAX_FAILURES = 50
+
+def shortfall_warning(stats, max_overlap):
+    """Hinweis, wenn weniger Varianten als angefordert entstanden sind (sonst None)."""
+    if stats["variants"] >= stats["requested"]:
+        return None
+    return (f"⚠️ Nur {stats['variants']} von {stats['requested']} Varianten erzeugt "
+            f"({stats['discarded']} verworfen): mit --max-overlap {max_overlap} ist die "
+            f"Fragenbank ausgeschöpft. Grenze erhöhen oder weniger Varianten anfordern")
+
+def load_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def allocate(total, weights, minimum=None):
+    """Verteilt total ganzzahlig nach Gewichten (größter Rest); optional mit Mindestwerten."""
+    weights = np.asarray(weights, dtype=np.float64)
+    counts = np.zeros(len(weights), dtype=np.int64)
+    if minimum is not None and minimum.sum() <= total:
+        counts += minimum
+    remaining = total - int(counts.sum())
+    if remaining <= 0 or weights.sum() <= 0:
+        return counts
+    exact = weights / weights.sum() * (total) - counts
+    exact = np.maximum(exact, 0)
+    exact = exact / exact.sum() * remaining if exact.sum() > 0 else np.full(len(weights), remaining / len(weights))
+    base = np.floor(exact).astype(np.int64)
+    counts += base
+    order = np.argsort(-(exact - base), kind="stable")
+    counts[order[:remaining - int(base.sum())]] += 1
+    return counts
+
+def question_class(q):
+    """Zelle einer MC-Frage: (Schwierigkeit, Multi-Select)."""
+    difficulty = q.get("difficulty", "medium")
+    return (DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else 1, bool(q.get("isMultiSelect")))
+
+def build_pool(questions):
+    """Fragen gruppiert nach Thema und Zelle."""
+    topics = sorted({q.get("topicId") for q in questions}, key=str)
+    classes = [(d, m) for d in range(len(DIFFICULTIES)) for m in (False, True)]
+    cells = {}
+    for i, q in enumerate(questions):
+        key = (topics.index(q.get("topicId")), classes.index(question_class(q)))
+        cells.setdefault(key, []).append(i)
+    cell_of = {i: cell for cell, members in cells.items() for i in members}
+    return {"questions": questions, "topics": topics, "classes": classes, "cells": cells, "cell_of": cell_of}
+
+def class_targets(pool, mc_count, difficulty_ratio, multi_share):
+    """Zielanzahl pro Zelle (Schwierigkeit × Multi-Select).
+
+    Die Multi-Select-Fragen werden nach Verfügbarkeit auf die Schwierigkeiten verteilt.
+    """
+    available = np.zeros(len(pool["classes"]), dtype=np.int64)
+    for (_, c), members in pool["cells"].items():
+        available[c] += len(members)
+
+    per_difficulty = allocate(mc_count, difficulty_ratio)
+    multi_total = int(round(mc_count * multi_share))
+    targets = np.zeros(len(pool["classes"]), dtype=np.int64)
+    multi = np.zeros(len(DIFFICULTIES), dtype=np.int64)
+    for _ in range(multi_total):
+        room = [available[pool["classes"].index((d, True))] - multi[d]
+                if multi[d] < per_difficulty[d] else 0 for d in range(len(DIFFICULTIES))]
+        best = int(np.argmax(room))
+        if room[best] <= 0:
+            raise ValueError(f"Zu wenige Multi-Select-Fragen für Anteil {multi_share}")
+        multi[best] += 1
+
+    for d in range(len(DIFFICULTIES)):
+        targets[pool["classes"].index((d, True))] = multi[d]
+        targets[pool["classes"].index((d, False))] = per_difficulty[d] - multi[d]
+    return targets
+
+def topic_quotas(pool, mc_count):
+    """MC-Plätze pro Thema proportional zur Themengröße, mindestens einer pro Thema."""
+    sizes = np.zeros(len(pool["topics"]), dtype=np.int64)
+    for (t, _), members in pool["cells"].items():
+        sizes[t] += len(members)
+    return allocate(mc_count, sizes, minimum=np.minimum(sizes, 1))
+
+def shortest_path(cells, by_topic, by_class, topic_left, class_left, flow):
+    """SPFA im Restgraphen Quelle -> Thema -> Zelle -> Schwierigkeitsklasse -> Senke.
+
+    Knoten: 0..T-1 Themen, T..T+C-1 Klassen, T+C Senke (die Quelle ist implizit).
+    Eine Zelle ist eine Kante Thema -> Klasse mit konvexen Kosten: die nächste
+    Einheit kostet so viel wie die nächstbilligste noch freie Frage, die
+    Rückkante gibt die teuerste bereits gewählte wieder frei.
+    """
+    n_topics = len(by_topic)
+    sink = n_topics + len(by_class)
+    distance = [float("inf")] * (sink + 1)
+    parent = [None] * (sink + 1)
+    queue = deque()
+    for t in range(n_topics):
+        if topic_left[t] > 0:
+            distance[t] = 0.0
+            queue.append(t)
+    in_queue = [False] * (sink + 1)
+    for t in queue:
+        in_queue[t] = True
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = False
+        if u < n_topics:
+            edges = [(n_topics + cells[k][1], cells[k][3][flow[k]], k)
+                     for k in by_topic[u] if flow[k] < len(cells[k][2])]
+        elif u < sink:
+            c = u - n_topics
+            edges = [(cells[k][0], -cells[k][3][flow[k] - 1], k) for k in by_class[c] if flow[k] > 0]
+            if class_left[c] > 0:
+                edges.append((sink, 0.0, None))
+        else:
+            continue
+        for v, cost, k in edges:
+            if distance[u] + cost < distance[v] - 1e-9:
+                distance[v] = distance[u] + cost
+                parent[v] = (u, k)
+                if not in_queue[v] and v != sink:
+                    in_queue[v] = True
+                    queue.append(v)
+    return parent
+
+def select_questions(pool, quotas, targets, usage, rng):
+    """Wählt die MC-Fragen einer Variante über einen Min-Cost-Flow.
+
+    Quelle -> Thema (Quote) -> (Thema, Zelle) -> Zelle (Zielanzahl) -> Senke;
+    jeder volle Fluss erfüllt alle Quoten gleichzeitig. Kosten einer Frage sind
+    ihre bisherige Nutzung plus Zufallsrauschen, daher werden selten genutzte
+    Fragen bevorzugt und die Varianten unterscheiden sich.
+    """
+    n_topics, n_classes = len(pool["topics"]), len(pool["classes"])
+    cells, by_topic, by_class = [], [[] for _ in range(n_topics)], [[] for _ in range(n_classes)]
+    for (t, c), members in pool["cells"].items():
+        ranked = sorted((usage[i] + rng.random(), i) for i in members)
+        by_topic[t].append(len(cells))
+        by_class[c].append(len(cells))
+        cells.append((t, c, [i for _, i in ranked], [cost for cost, _ in ranked]))
+
+    topic_left, class_left = quotas.tolist(), targets.tolist()
+    flow = [0] * len(cells)
+    sink = n_topics + n_classes
+    for _ in range(int(quotas.sum())):
+        parent = shortest_path(cells, by_topic, by_class, topic_left, class_left, flow)
+        if parent[sink] is None:
+            raise ValueError("Quoten nicht erfüllbar: Themenquoten und Schwierigkeitsmix passen nicht zur Fragenbank")
+        class_left[parent[sink][0] - n_topics] -= 1
+        v = parent[sink][0]
+        while parent[v] is not None:
+            u, k = parent[v]
+            flow[k] += 1 if u < n_topics else -1
+            v = u
+        topic_left[v] -= 1
+    return [i for k, cell in enumerate(cells) for i in cell[2][:flow[k]]]
+
+def repair_overlap(pool, chosen, used, n_used, max_overlap):
+    """Tauscht Fragen innerhalb ihrer Zelle (Quoten bleiben erhalten), bis die
+    Überschneidung mit allen bisherigen Varianten höchstens max_overlap beträgt.
+
+    Jeder Tausch senkt (größte Überschneidung, Anzahl Varianten mit diesem Wert);
+    gibt None zurück, wenn kein Tausch mehr hilft.
+    """
+    matrix = used[:n_used]
+    overlap = matrix[:, chosen].sum(axis=1, dtype=np.int64)
+    chosen = list(chosen)
+    chosen_set = set(chosen)
+
+    def badness(values):
+        peak = values.max(axis=0, initial=0)
+        return peak, (values == peak).sum(axis=0)
+
+    while n_used and overlap.max() > max_overlap:
+        best = badness(overlap)
+        swap = None
+        for position, a in enumerate(chosen):
+            alternatives = [b for b in pool["cells"][pool["cell_of"][a]] if b not in chosen_set]
+            if not alternatives:
+                continue
+            candidates = (overlap - matrix[:, a])[:, None] + matrix[:, alternatives]
+            peaks, ties = badness(candidates)
+            k = int(np.lexsort((ties, peaks))[0])
+            if (peaks[k], ties[k]) < best:
+                best = (peaks[k], ties[k])
+                swap = (position, alternatives[k], candidates[:, k])
+        if swap is None:
+            return None
+        position, b, overlap = swap
+        chosen_set.discard(chosen[position])
+        chosen_set.add(b)
+        chosen[position] = b
+        count("getauscht")
+    return chosen
+
+def valid_variant(pool, chosen, quotas, targets):
+    """Prüft Themenquoten und Zellziele einer fertigen Variante."""
+    topics = np.zeros(len(pool["topics"]), dtype=np.int64)
+    classes = np.zeros(len(pool["classes"]), dtype=np.int64)
+    for i in chosen:
+        q = pool["questions"][i]
+        topics[pool["topics"].index(q.get("topicId"))] += 1
+        classes[pool["classes"].index(question_class(q))] += 1
+    return len(set(chosen)) == len(chosen) and (topics == quotas).all() and (classes == targets).all()
+
+def least_used(members, usage, k, rng):
+    """Die k am seltensten genutzten Einträge (zufällig bei Gleichstand)."""
+    jitter = [rng.random() for _ in members]
+    ranked = sorted(range(len(members)), key=lambda i: (usage[members[i]], jitter[i]))
+    return [members[i] for i in ranked[:k]]
+
+def pick_open(open_questions, usage, topic_usage, k, rng):
+    """k offene Fragen aus verschiedenen, bisher selten genutzten Themen."""
+    by_topic = {}
+    for i, q in enumerate(open_questions):
+        by_topic.setdefault(q.get("topicId"), []).append(i)
+    topics = least_used(list(by_topic), topic_usage, min(k, len(by_topic)), rng)
+    chosen = [least_used(by_topic[t], usage, 1, rng)[0] for t in topics]
+    for t in topics:
+        topic_usage[t] += 1
+    return chosen
+
+@instrumented()
+def generate_variants(data, n_variants=VARIANT_COUNT, mc_count=MC_COUNT, open_count=OPEN_COUNT,
+                      difficulty_ratio=DIFFICULTY_RATIO, multi_share=MULTI_SHARE,
+                      max_overlap=MAX_OVERLAP, seed=SEED):
+    """Erzeugt bis zu n_variants Prüfungsvarianten; gibt (Varianten-Datei, Statistik) zurück.
+
+    Lässt die Überschneidungsgrenze nicht genug Varianten zu, bricht die Erzeugung nach
+    MAX_FAILURES Fehlversuchen in Folge ab; stats["variants"] ist dann kleiner als
+    stats["requested"] und es wird eine Warnung ausgegeben.
+    """
+    rng = random.Random(seed)
+    mc_questions = data["mcQuestions"]
+    if multi_share <= 0:
+        mc_questions = [q for q in mc_questions if not q.get("isMultiSelect")]
+    open_questions = data["openQuestions"]
+    mc_count = min(mc_count, len(mc_questions))
+
+    pool = build_pool(mc_questions)
+    quotas = topic_quotas(pool, mc_count)
+    targets = class_targets(pool, mc_count, difficulty_ratio, multi_share)
+
+    used = np.zeros((n_variants, len(mc_questions)), dtype=np.uint8)
+    usage = np.zeros(len(mc_questions), dtype=np.int64)
+    open_usage = np.zeros(len(open_questions), dtype=np.int64)
+    topic_usage = {q.get("topicId"): 0 for q in open_questions}
+    mc_variants, open_variants = [], []
+    discarded = 0
+
+    failures = 0
+    while len(mc_variants) < n_variants and failures < MAX_FAILURES:
+        chosen = select_questions(pool, quotas, targets, usage, rng)
+        chosen = repair_overlap(pool, chosen, used, len(mc_variants), max_overlap)
+        if chosen is None or not valid_variant(pool, chosen, quotas, targets):
+            discarded += 1
+            failures += 1
+            count("verworfen")
+            continue
+        failures = 0
+
+        used[len(mc_variants), chosen] = 1
+        usage[chosen] += 1
+        opens = pick_open(open_questions, open_usage, topic_usage, open_count, rng)
+        open_usage[opens] += 1
+        mc_variants.append(sorted(chosen))
+        open_variants.append(opens)
+        count("varianten")
+
+    variants = {
+        "version": VARIANTS_VERSION,
+        "mcCount": mc_count,
+        "openCount": min(open_count, len(open_variants[0]) if open_variants else 0),
+        "constraints": {
+            "topicQuotas": {str(t): int(k) for t, k in zip(pool["topics"], quotas)},
+            "difficultyRatio": list(difficulty_ratio),
+            "multiSelectShare": multi_share,
+            "maxOverlap": max_overlap
+        },
+        "mcIds": [q["id"] for q in mc_questions],
+        "openIds": [q["id"] for q in open_questions],
+        "mc": mc_variants,
+        "open": open_variants
+    }
+    used = used[:len(mc_variants)].astype(np.int32)
+    overlaps = used @ used.T
+    np.fill_diagonal(overlaps, 0)
+    stats = {
+        "requested": n_variants,
+        "variants": len(mc_variants),
+        "discarded": discarded,
+        "maxOverlap": int(overlaps.max(initial=0)),
+        "meanOverlap": float(overlaps.sum() / max(len(mc_variants) * (len(mc_variants) - 1), 1)),
+        "usageMin": int(usage.min()) if len(usage) else 0,
+        "usageMax": int(usage.max()) if len(usage) else 0
+    }
+    warning = shortfall_warning(stats, max_overlap)
+    if warning:
+        print(warning)
+    return variants, stats
+
+def serialize_variants(variants):
+    """Kompaktes JSON (ohne Einrückung) – die Datei wird nur maschinell gelesen."""
+    return json.dumps(variants, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+def parse_ratio(value):
+    parts = [float(v) for v in value.split(",")]
+    if len(parts) != len(DIFFICULTIES):
+        raise argparse.ArgumentTypeError("Drei Werte für easy,medium,hard erwartet")
+    return [p / sum(parts) for p in parts]
+
+def main():
+    parser = argparse.ArgumentParser(description="Prüfungsvarianten mit Quoten erzeugen")
+    parser.add_argument("--variants", type=int, default=VARIANT_COUNT)
+    parser.add_argument("--mc", type=int, default=MC_COUNT, help="MC-Fragen pro Prüfung")
+    parser.add_argument("--open", type=int, default=OPEN_COUNT, help="Offene Fragen pro Prüfung")
+    parser.add_argument("--difficulty", type=parse_ratio, default=DIFFICULTY_RATIO,
+                        help="Anteile easy,medium,hard, z.B. 25,50,25")
+    parser.add_argument("--multi-share", type=float, default=MULTI_SHARE,
+                        help="Anteil Multi-Select-Fragen (0 = nur Single Choice)")
+    parser.add_argument("--max-overlap", type=int, default=MAX_OVERLAP,
+                        help="Höchstens so viele gemeinsame MC-Fragen zwischen zwei Varianten")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="Varianten als JSON speichern")
+    args = parser.parse_args()
+
+    data = load_questions()
+    start = time.perf_counter()
+    variants, stats = generate_variants(data, args.variants, args.mc, args.open, args.difficulty,
+                                        args.multi_share, args.max_overlap, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Varianten: {stats['variants']} ({stats['discarded']} verworfen) in {elapsed:.1f} s")
+    print(f"Themenquoten: {variants['constraints']['topicQuotas']}")
+    print(f"Überschneidung: max. {stats['maxOverlap']}, Mittel {stats['meanOverlap']:.1f} MC-Fragen")
+    print(f"Nutzung pro Frage: {stats['usageMin']}-{stats['usageMax']} Varianten")
+    print(f"Größe: {len(serialize_variants(variants)) / 1024:.1f} KB")
+
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(serialize_variants(variants))
+        print(f"Gespeichert: {args.output}")
+    if stats["variants"] < stats["requested"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,14 @@ Macht falsche Antworten elaborierter und plausibler.
 """
 
 import json
-import random
+from collections import deque
 from pathlib import Path
 
+import length_stats
+from length_stats import build_arrays, position_histogram, single_mask
+from instrumentation import count, instrumented
+from stable_shuffle import question_rng, shuffle_options
+
 DATA_DIR = Path(__file__).parent
 
 # Erweiterungen die die falschen Antworten plausibler machen
@@ -23,104 +28,128 @@ EXTENSIONS = [
     " bei näherer Betrachtung",
     " unter bestimmten Bedingungen",
 ]
+EXTRA_EXTENSION = " in diesem Zusammenhang"
 
 def load_questions():
     with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def correct_length(q):
+    for opt in q["options"]:
+        if opt["correct"]:
+            return len(opt["text"])
+    return 0
+
+def target_window(q):
+    """Ziel-Länge der falschen Antworten (leicht unter der richtigen)."""
+    correct_len = correct_length(q)
+    return max(30, correct_len - 30), correct_len + 20
+
+def short_options(q, target_min):
+    return [opt for opt in q["options"] if not opt["correct"] and len(opt["text"]) < target_min]
+
+def extend_option(opt, target_min, rng):
+    """Erweitert eine zu kurze falsche Antwort. Gibt die Anzahl Änderungen zurück."""
+    modifications = 0
+
+    # Wähle passende Erweiterung
+    extension = rng.choice(EXTENSIONS)
+
+    # Vermeide doppelte Erweiterungen
+    if not any(ext in opt["text"] for ext in EXTENSIONS):
+        opt["text"] = opt["text"].rstrip('.') + extension
+        modifications += 1
+
+    # Wenn immer noch zu kurz, füge mehr hinzu
+    if len(opt["text"]) < target_min - 20 and EXTRA_EXTENSION not in opt["text"]:
+        opt["text"] += EXTRA_EXTENSION
+        modifications += 1
+
+    return modifications
+
+@instrumented()
 def aggressive_balance(data):
-    """Aggressiveres Balancing aller Optionen."""
-    
-    random.seed(123)
+    """Aggressiveres Balancing über eine Worklist.
+
+    Die Verletzungen werden einmal bestimmt; danach werden nur noch Fragen mit
+    zu kurzen falschen Antworten bearbeitet. Jede Erweiterung greift höchstens
+    einmal pro Option – ist eine Frage danach immer noch zu kurz, kann sie nicht
+    balanciert werden (frühere Runden 2-5 haben nichts mehr geändert).
+    Die Erweiterungen werden pro Frage aus deren eigenem Zufallsgenerator
+    gewählt, damit andere Fragen das Ergebnis nicht beeinflussen.
+    Gibt (data, Änderungen, IDs der nicht balancierbaren Fragen) zurück.
+    """
     modifications = 0
-    
+    unresolved = []
+
+    # Verletzungen einmal bestimmen: (Frage, Mindestlänge, zu kurze Optionen)
+    worklist = deque()
     for q in data["mcQuestions"]:
         if q.get("isMultiSelect", False):
             continue
-        
-        # Find correct answer length
-        correct_len = 0
-        for opt in q["options"]:
-            if opt["correct"]:
-                correct_len = len(opt["text"])
-                break
-        
-        # Berechne Ziel-Länge (leicht unter correct_len)
-        target_min = max(30, correct_len - 30)
-        target_max = correct_len + 20
-        
-        for opt in q["options"]:
-            if not opt["correct"]:
-                current_len = len(opt["text"])
-                
-                # Wenn zu kurz, erweitern
-                if current_len < target_min:
-                    # Wähle passende Erweiterung
-                    extension = random.choice(EXTENSIONS)
-                    
-                    # Vermeide doppelte Erweiterungen
-                    if not any(ext in opt["text"] for ext in EXTENSIONS):
-                        opt["text"] = opt["text"].rstrip('.') + extension
-                        modifications += 1
-                
-                # Wenn immer noch zu kurz, füge mehr hinzu
-                if len(opt["text"]) < target_min - 20:
-                    extra = " in diesem Zusammenhang"
-                    if extra not in opt["text"]:
-                        opt["text"] += extra
-                        modifications += 1
-    
-    return data, modifications
+        target_min, _ = target_window(q)
+        short = short_options(q, target_min)
+        if short:
+            worklist.append((q, target_min, short))
+    count("worklist", len(worklist))
+
+    while worklist:
+        q, target_min, short = worklist.popleft()
+        rng = question_rng(q, "extensions")
+        for opt in short:
+            modifications += extend_option(opt, target_min, rng)
+
+        # Texte werden nur länger, also reicht es, die bisher zu kurzen zu prüfen
+        if any(len(opt["text"]) < target_min for opt in short):
+            unresolved.append(q["id"])
+
+    return data, modifications, unresolved
 
 def final_verify(data):
     """Finale Verifikation."""
     
     mc = data["mcQuestions"]
-    single = [q for q in mc if not q.get("isMultiSelect", False)]
+    arrays = build_arrays(mc)
+    single = single_mask(arrays)
     
-    longest_correct = 0
-    for q in single:
-        max_len = max(len(opt["text"]) for opt in q["options"])
-        for opt in q["options"]:
-            if opt["correct"] and len(opt["text"]) == max_len:
-                longest_correct += 1
-                break
+    longest_correct, single_count = length_stats.longest_is_correct(arrays, single)
     
     # Position check
-    positions = {0: 0, 1: 0, 2: 0, 3: 0}
-    for q in single:
-        for i, opt in enumerate(q["options"]):
-            if opt["correct"]:
-                positions[i] += 1
+    positions = dict(enumerate(position_histogram(arrays, single).tolist()))
     
     print(f"\nFINALE STATISTIK:")
-    print(f"  Single-Choice: {len(single)}")
-    print(f"  Multi-Select: {len(mc) - len(single)}")
-    print(f"  Längste=Richtig: {longest_correct}/{len(single)} ({longest_correct/len(single)*100:.1f}%)")
+    print(f"  Single-Choice: {single_count}")
+    print(f"  Multi-Select: {len(mc) - single_count}")
+    print(f"  Längste=Richtig: {longest_correct}/{single_count} ({longest_correct/single_count*100:.1f}%)")
     print(f"  Positionen: A:{positions[0]} B:{positions[1]} C:{positions[2]} D:{positions[3]}")
     
     # Ideal wäre unter 40%
-    if longest_correct / len(single) < 0.5:
+    if longest_correct / single_count < 0.5:
         print("  ✅ Akzeptables Level erreicht")
     else:
         print("  ⚠️ Hinweis: Einige Muster bleiben, aber weniger offensichtlich")
 
+@instrumented()
+def reshuffle_options(data):
+    """Mischt die Optionen nach dem Balancing erneut (pro Frage deterministisch)."""
+    for q in data["mcQuestions"]:
+        shuffle_options(q)
+    return data
+
 def main():
     data = load_questions()
     
-    # Mehrere Runden aggressives Balancing
-    for i in range(5):
-        data, mods = aggressive_balance(data)
-        print(f"Runde {i+1}: {mods} Änderungen")
-        if mods == 0:
-            break
+    # Aggressives Balancing, bis keine Frage mehr in der Worklist ist
+    data, mods, unresolved = aggressive_balance(data)
+    print(f"Änderungen: {mods}")
+    print(f"Nicht balancierbar: {len(unresolved)} Fragen")
+    for qid in unresolved[:10]:
+        print(f"  - {qid}")
     
     final_verify(data)
     
     # Re-shuffle nach Balancing
-    random.seed(999)
-    for q in data["mcQuestions"]:
-        random.shuffle(q["options"])
+    data = reshuffle_options(data)
     
     # Save
     with open(DATA_DIR / "questions.json", 'w', encoding='utf-8') as f:
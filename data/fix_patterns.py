@@ -5,19 +5,26 @@ Markiert Multi-Select Fragen explizit.
 """
 
 import json
-import random
 from pathlib import Path
 
+import length_stats
+from length_stats import build_arrays, position_histogram, single_mask
+from instrumentation import instrumented
+from stable_shuffle import shuffle_options
+
 DATA_DIR = Path(__file__).parent
 
 def load_questions():
     with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@instrumented()
 def fix_questions(data):
-    """Shuffelt Optionen und markiert Multi-Select."""
-    
-    random.seed(42)  # Für Reproduzierbarkeit
+    """Shuffelt Optionen und markiert Multi-Select.
+
+    Die Reihenfolge hängt nur von ID und Inhalt der jeweiligen Frage ab
+    (siehe stable_shuffle), nicht von ihrer Position in der Liste.
+    """
     
     mc_questions = data["mcQuestions"]
     multi_select_count = 0
@@ -35,7 +42,7 @@ def fix_questions(data):
             q["isMultiSelect"] = False
         
         # Shuffle die Optionen
-        random.shuffle(q["options"])
+        shuffle_options(q)
         shuffled_count += 1
     
     # Update metadata
@@ -46,29 +53,14 @@ def fix_questions(data):
 
 def verify_fix(data):
     """Verifiziert, dass die Fixes funktioniert haben."""
-    mc_questions = data["mcQuestions"]
+    arrays = build_arrays(data["mcQuestions"])
+    single = single_mask(arrays)
     
     # Check position distribution
-    position_counts = {0: 0, 1: 0, 2: 0, 3: 0}
-    longest_is_correct = 0
-    total_single = 0
+    position_counts = dict(enumerate(position_histogram(arrays, single).tolist()))
     
-    for q in mc_questions:
-        if q["isMultiSelect"]:
-            continue
-        
-        total_single += 1
-        
-        # Position check
-        for i, opt in enumerate(q["options"]):
-            if opt["correct"]:
-                position_counts[i] += 1
-        
-        # Longest check
-        max_len = max(len(opt["text"]) for opt in q["options"])
-        correct_len = [len(opt["text"]) for opt in q["options"] if opt["correct"]][0]
-        if correct_len == max_len:
-            longest_is_correct += 1
+    # Longest check
+    longest_is_correct, total_single = length_stats.longest_is_correct(arrays, single)
     
     print("NACH FIX:")
     print(f"  Positions-Verteilung: A:{position_counts[0]} B:{position_counts[1]} C:{position_counts[2]} D:{position_counts[3]}")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Simuliert den Karteikarten-Lernmodus (js/flashcards.js) für viele Lernende
+gleichzeitig, um Änderungen am Scheduler offline zu testen.
+
+Nachgebildet wird:
+- sortCardsByPriority: fällige Karten zuerst, dann niedrigstes Vertrauen,
+  bei Gleichstand die Reihenfolge aus flashcards.json
+- handleConfidenceRating: Bewertung 1-5 setzt nextReview = jetzt + Intervall
+  (Standard wie im Frontend: 1 Min, 10 Min, 1 Tag, 3 Tage, 7 Tage)
+
+Der Zustand liegt in NumPy-Arrays (Karten × Lernende). Pro Lernsitzung
+bewertet jeder Lernende die ersten `budget` Karten seiner Prioritätsliste.
+
+Vergessensmodell (konfigurierbar): Abrufwahrscheinlichkeit R = exp(-t / S).
+Die Stabilität S startet bei --stability Tagen (skaliert mit Lernenden-
+Fähigkeit und Kartenschwierigkeit, lange Rückseiten sind schwerer), wächst
+bei erfolgreichem Abruf um den Faktor --growth und fällt beim Vergessen
+zurück. Die Bewertung ergibt sich aus R: vergessen -> 1, sonst 2-5 je nach
+R (Schwellen --thresholds).
+
+Aufruf:
+    python flashcard_sim.py                                  # 100k Lernende, 30 Tage
+    python flashcard_sim.py --intervals 1m,10m,1d,4d,10d --budget 15
+    python flashcard_sim.py --learners 20000 --days 60 --json sim.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent
+
+MINUTE = 1 / (24 * 60)
+# Wie intervals in handleConfidenceRating (in Tagen)
+DEFAULT_INTERVALS = [1 * MINUTE, 10 * MINUTE, 1.0, 3.0, 7.0]
+DEFAULT_THRESHOLDS = [0.5, 0.75, 0.9]
+UNIT_DAYS = {"m": MINUTE, "h": 1 / 24, "d": 1.0}
+
+def load_flashcards():
+    with open(DATA_DIR / "flashcards.json", 'r', encoding='utf-8') as f:
+        return json.load(f)["flashcards"]
+
+def card_difficulty(cards):
+    """Schwierigkeitsfaktor pro Karte: längere Rückseiten werden schneller vergessen."""
+    lengths = np.array([max(len(card["back"]), 1) for card in cards], dtype=np.float32)
+    return np.sqrt(np.median(lengths) / lengths)
+
+def init_state(n_cards, n_learners):
+    """Lernfortschritt wie flashcardProgress, für alle Lernenden (Karten × Lernende)."""
+    shape = (n_cards, n_learners)
+    return {
+        "confidence": np.zeros(shape, dtype=np.int8),       # 0 = noch nie bewertet
+        "next_review": np.zeros(shape, dtype=np.float32),   # Tage seit Start
+        "last_review": np.full(shape, -np.inf, dtype=np.float32),
+        "stability": np.zeros(shape, dtype=np.float32),     # Tage
+        "review_count": np.zeros(shape, dtype=np.int32),
+    }
+
+def recall_probability(state, now):
+    """R = exp(-t / S); noch nie gesehene Karten haben R = 0."""
+    elapsed = now - state["last_review"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.exp(-elapsed / state["stability"])
+    return np.where(state["review_count"] > 0, r, 0.0).astype(np.float32)
+
+def select_cards(state, now, budget):
+    """Wie sortCardsByPriority: Indizes der ersten `budget` Karten pro Lernendem.
+
+    Sortierschlüssel: nicht fällig (0/1), dann Vertrauen, dann Kartenindex.
+    Innerhalb einer Sitzung ist die Reihenfolge egal, daher reicht argpartition.
+    """
+    n_cards = state["confidence"].shape[0]
+    if budget >= n_cards:
+        return np.broadcast_to(np.arange(n_cards)[:, None], state["confidence"].shape)
+
+    not_due = (state["next_review"] > now).astype(np.int32)
+    key = (not_due * 8 + state["confidence"]) * n_cards + np.arange(n_cards, dtype=np.int32)[:, None]
+    return np.argpartition(key, budget - 1, axis=0)[:budget]
+
+def review(state, cards, now, params, rng, ability, difficulty):
+    """Bewertet die ausgewählten Karten (wie handleConfidenceRating) und aktualisiert das Gedächtnis."""
+    n_learners = cards.shape[1]
+    learners = np.arange(n_learners)
+    # Flacher Index in die (Karten × Lernende)-Arrays: ein Gather/Scatter pro Array
+    flat = (cards * n_learners + learners).ravel()
+    card_of = cards.ravel()
+    learner_of = np.broadcast_to(learners, cards.shape).ravel()
+
+    count = state["review_count"].reshape(-1)
+    stability = state["stability"].reshape(-1)
+    last_review = state["last_review"].reshape(-1)
+
+    seen = count[flat] > 0
+    old_stability = stability[flat]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        r = np.where(seen, np.exp((last_review[flat] - now) / old_stability), np.float32(0))
+    recalled = rng.random(r.shape, dtype=np.float32) < r
+
+    # Bewertung: vergessen -> 1, sonst 2-5 nach Abrufstärke
+    level = np.where(recalled, 2 + np.searchsorted(params["thresholds"], r), 1).astype(np.int8)
+
+    base = params["stability"] * ability[learner_of] * difficulty[card_of]
+    stability[flat] = np.where(recalled, old_stability * params["growth"], base)
+    state["confidence"].reshape(-1)[flat] = level
+    last_review[flat] = now
+    state["next_review"].reshape(-1)[flat] = now + params["intervals"][level - 1]
+    count[flat] += 1
+    return level
+
+def simulate(cards, n_learners=100_000, days=30, sessions_per_day=1, budget=20,
+             intervals=DEFAULT_INTERVALS, stability=1.0, growth=2.5,
+             thresholds=DEFAULT_THRESHOLDS, ability_spread=0.3, seed=42):
+    """Spielt `days` Tage Lernen durch und gibt Tageswerte zurück."""
+    rng = np.random.default_rng(seed)
+    n_cards = len(cards)
+    state = init_state(n_cards, n_learners)
+    params = {
+        "intervals": np.asarray(intervals, dtype=np.float32),
+        "thresholds": np.asarray(thresholds, dtype=np.float32),
+        "stability": np.float32(stability),
+        "growth": np.float32(growth),
+    }
+    ability = rng.lognormal(0.0, ability_spread, n_learners).astype(np.float32)
+    difficulty = card_difficulty(cards)
+
+    daily = []
+    for day in range(days):
+        due_total = 0.0
+        reviews = 0
+        levels = np.zeros(5, dtype=np.int64)
+        for session in range(sessions_per_day):
+            now = np.float32(day + session / sessions_per_day)
+            due_total += float((state["next_review"] <= now).sum()) / n_learners
+            selected = select_cards(state, now, budget)
+            level = review(state, selected, now, params, rng, ability, difficulty)
+            reviews += selected.shape[0]
+            levels += np.bincount(level.ravel() - 1, minlength=5)
+
+        # Behalten am Ende des Tages (kurz vor der nächsten Sitzung)
+        r = recall_probability(state, np.float32(day + 1))
+        seen = state["review_count"] > 0
+        daily.append({
+            "day": day + 1,
+            "retention": round(float(r.mean()), 4),
+            "retentionSeen": round(float(r[seen].mean()) if seen.any() else 0.0, 4),
+            "coverage": round(float(seen.mean()), 4),
+            "dueCards": round(due_total / sessions_per_day, 2),
+            "reviewsPerLearner": reviews,
+            "ratingShare": [round(float(x), 4) for x in levels / max(levels.sum(), 1)],
+        })
+    return daily
+
+def parse_interval(value):
+    """'10m', '1d', '6h' -> Tage."""
+    value = value.strip()
+    return float(value[:-1]) * UNIT_DAYS[value[-1]] if value[-1] in UNIT_DAYS else float(value)
+
+def parse_list(value, convert=float):
+    return [convert(v) for v in value.split(",") if v.strip()]
+
+def print_report(daily):
+    print(f"{'Tag':>4} {'Behalten':>9} {'(gesehen)':>10} {'Abdeckung':>10} {'fällig':>8}  Bewertungen 1-5")
+    for d in daily:
+        shares = " ".join(f"{s * 100:4.0f}%" for s in d["ratingShare"])
+        print(f"{d['day']:>4} {d['retention'] * 100:>8.1f}% {d['retentionSeen'] * 100:>9.1f}% "
+              f"{d['coverage'] * 100:>9.1f}% {d['dueCards']:>8.1f}  {shares}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Spaced-Repetition-Simulation des Karteikarten-Schedulers")
+    parser.add_argument("--learners", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--sessions-per-day", type=int, default=1)
+    parser.add_argument("--budget", type=int, default=20, help="Bewertete Karten pro Sitzung")
+    parser.add_argument("--intervals", type=lambda v: parse_list(v, parse_interval),
+                        default=DEFAULT_INTERVALS, help="Intervalle für Stufe 1-5, z.B. 1m,10m,1d,3d,7d")
+    parser.add_argument("--stability", type=float, default=1.0, help="Anfangsstabilität in Tagen")
+    parser.add_argument("--growth", type=float, default=2.5, help="Stabilitätszuwachs pro Abruf")
+    parser.add_argument("--thresholds", type=parse_list, default=DEFAULT_THRESHOLDS,
+                        help="R-Schwellen für Bewertung 3, 4, 5")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Tageswerte als JSON speichern")
+    args = parser.parse_args()
+
+    if len(args.intervals) != 5:
+        parser.error("--intervals braucht genau 5 Werte (Stufe 1-5)")
+    if len(args.thresholds) != 3:
+        parser.error("--thresholds braucht genau 3 Werte")
+
+    cards = load_flashcards()
+    print(f"Simuliere {args.learners:,} Lernende × {len(cards)} Karten über {args.days} Tage...")
+    start = time.perf_counter()
+    daily = simulate(cards, args.learners, args.days, args.sessions_per_day, args.budget,
+                     args.intervals, args.stability, args.growth, args.thresholds, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print_report(daily)
+    total_reviews = sum(d["reviewsPerLearner"] for d in daily)
+    print(f"\nWiederholungen pro Lernendem: {total_reviews} ({total_reviews / args.days:.1f} pro Tag)")
+    print(f"Behalten nach {args.days} Tagen: {daily[-1]['retention'] * 100:.1f}%")
+    print(f"Laufzeit: {elapsed:.1f} s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"config": vars(args), "daily": daily}, f, ensure_ascii=False, indent=2)
+        print(f"Gespeichert: {args.json}")
+
+if __name__ == "__main__":
+    main()
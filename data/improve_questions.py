@@ -5,12 +5,18 @@ Verbessert die Fragen-Qualität:
 2. Behebt komische Antwortoptionen ("gemäß dieser Interpretation" etc.)
 3. Erweitert Erklärungen um lehrreicher zu sein
 4. Fügt sourceType Feld hinzu (student_created vs ai_generated)
+
+Mit --stream wird questions.json Frage für Frage gelesen und geschrieben.
 """
 
 import json
-import re
+import sys
 from pathlib import Path
 
+from bank_stream import iter_bank, write_bank
+from instrumentation import instrumented
+from rule_engine import compile_matcher, compile_replacer, matches_any, replace_all
+
 DATA_DIR = Path(__file__).parent
 
 # Phrasen die auf irrelevante Detail-Fragen hinweisen
@@ -51,6 +57,10 @@ AWKWARD_PHRASES = [
     (r',\s*was jedoch die Komplexität des Konzepts unterschätzt', ''),
 ]
 
+# Einmal kompiliert: ein Durchlauf pro Text statt einem re.search/re.sub pro Regel
+IRRELEVANT_MATCHER = compile_matcher(IRRELEVANT_PATTERNS, name="irrelevant")
+AWKWARD_REPLACER = compile_replacer(AWKWARD_PHRASES, name="awkward")
+
 def load_questions():
     with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
         return json.load(f)
@@ -58,11 +68,7 @@ def load_questions():
 def is_irrelevant_question(question):
     """Prüft ob eine Frage irrelevant für die Klausur ist."""
     stem = question.get('stem', '').lower()
-    
-    for pattern in IRRELEVANT_PATTERNS:
-        if re.search(pattern, stem, re.IGNORECASE):
-            return True
-    return False
+    return matches_any(IRRELEVANT_MATCHER, stem)
 
 def fix_awkward_options(options):
     """Entfernt awkward Phrasen aus den Antwortoptionen."""
@@ -70,11 +76,8 @@ def fix_awkward_options(options):
     changes = 0
     
     for opt in options:
-        text = opt['text']
-        original = text
-        
-        for pattern, replacement in AWKWARD_PHRASES:
-            text = re.sub(pattern, replacement, text)
+        original = opt['text']
+        text, _ = replace_all(AWKWARD_REPLACER, original)
         
         if text != original:
             changes += 1
@@ -109,33 +112,38 @@ def add_source_type(question):
         question['sourceLabel'] = '🤖 KI-generiert'
     return question
 
+def improve_mc_question(q):
+    """Verbessert eine MC-Frage. Gibt (Frage oder None, Entfernungs-Info, Fixes) zurück."""
+    # 1. Prüfe auf Irrelevanz
+    if is_irrelevant_question(q):
+        return None, {
+            'id': q['id'],
+            'stem': q['stem'][:80],
+            'reason': 'Irrelevante Methodik-Frage'
+        }, 0
+    
+    # 2. Fixe awkward Optionen
+    q['options'], fixes = fix_awkward_options(q['options'])
+    
+    # 3. Füge sourceType hinzu
+    q = add_source_type(q)
+    return q, None, fixes
+
+@instrumented()
 def improve_questions(data):
     """Hauptfunktion zur Fragenverbesserung."""
     
     removed_questions = []
     awkward_fixes = 0
-    source_added = 0
     
     # MC Fragen verbessern
     improved_mc = []
     for q in data['mcQuestions']:
-        # 1. Prüfe auf Irrelevanz
-        if is_irrelevant_question(q):
-            removed_questions.append({
-                'id': q['id'],
-                'stem': q['stem'][:80],
-                'reason': 'Irrelevante Methodik-Frage'
-            })
+        q, removed, fixes = improve_mc_question(q)
+        if removed:
+            removed_questions.append(removed)
             continue
-        
-        # 2. Fixe awkward Optionen
-        q['options'], fixes = fix_awkward_options(q['options'])
         awkward_fixes += fixes
-        
-        # 3. Füge sourceType hinzu
-        q = add_source_type(q)
-        source_added += 1
-        
         improved_mc.append(q)
     
     data['mcQuestions'] = improved_mc
@@ -150,6 +158,56 @@ def improve_questions(data):
     
     return data, removed_questions, awkward_fixes
 
+def improve_questions_stream(events, stats):
+    """Streaming-Variante von improve_questions über bank_stream-Events.
+    
+    stats sammelt die Zähler; von den entfernten Fragen werden nur die ersten 5 behalten.
+    """
+    stats.update({'original': 0, 'kept': 0, 'removed': 0, 'removed_examples': [], 'fixes': 0})
+    for kind, key, value in events:
+        if kind == 'item' and key == 'mcQuestions':
+            stats['original'] += 1
+            q, removed, fixes = improve_mc_question(value)
+            if removed:
+                stats['removed'] += 1
+                if len(stats['removed_examples']) < 5:
+                    stats['removed_examples'].append(removed)
+                continue
+            stats['fixes'] += fixes
+            stats['kept'] += 1
+            value = q
+        elif kind == 'item' and key == 'openQuestions':
+            value = add_source_type(value)
+        yield kind, key, value
+
+def finalize_metadata(stats):
+    """Setzt die Metadaten nach einem Streaming-Durchlauf."""
+    def finalize(values):
+        values['metadata']['totalMcQuestions'] = stats['kept']
+        values['metadata']['removedQuestions'] = stats['removed']
+    return finalize
+
+def main_stream():
+    """Verarbeitet questions.json Frage für Frage mit konstantem Speicherbedarf."""
+    print("Verbessere Fragen (Streaming)...")
+    stats = {}
+    output_path = DATA_DIR / "questions.json"
+    write_bank(improve_questions_stream(iter_bank(output_path), stats), output_path,
+               finalize=finalize_metadata(stats))
+    
+    print(f"\nErgebnisse:")
+    print(f"  - Ursprünglich: {stats['original']} MC-Fragen")
+    print(f"  - Entfernte irrelevante Fragen: {stats['removed']}")
+    print(f"  - Behobene awkward Phrasen: {stats['fixes']}")
+    print(f"  - Verbleibende MC-Fragen: {stats['kept']}")
+    
+    if stats['removed_examples']:
+        print(f"\n  Entfernte Fragen:")
+        for r in stats['removed_examples']:
+            print(f"    - {r['id']}: {r['stem'][:60]}...")
+    
+    print(f"\nGespeichert: {output_path}")
+
 def main():
     print("Lade Fragen...")
     data = load_questions()
@@ -177,4 +235,7 @@ def main():
     print(f"\nGespeichert: {output_path}")
 
 if __name__ == "__main__":
-    main()
+    if "--stream" in sys.argv:
+        main_stream()
+    else:
+        main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Gemeinsame Messschicht für Pipeline-Passes und Funktionen.
+
+Jeder Abschnitt (span) erfasst:
+- Wall-Zeit und CPU-Zeit
+- Speicherspitze (tracemalloc), nur wenn mit memory=True aktiviert
+- Zähler, z.B. verarbeitete Fragen oder Änderungen pro Runde
+- Regel-Treffer der Regel-Engine (welche Regel wie oft gefeuert hat)
+
+Abschnitte können verschachtelt werden (Pass -> Funktion -> Runde). Am Ende lässt
+sich alles als Chrome-Trace (chrome://tracing, Perfetto, speedscope) oder als
+"folded stacks" für flamegraph.pl / speedscope schreiben.
+
+Solange die Messung nicht aktiviert ist, messen Abschnitte nur die Zeit und
+Zähler werden ignoriert.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+
+TRACE = {
+    "enabled": False,
+    "memory": False,
+    "origin": 0.0,
+    "spans": [],
+    "stack": [],
+}
+
+def enable(memory=False):
+    """Startet eine neue Messung (verwirft vorherige Abschnitte)."""
+    TRACE.update(enabled=True, memory=memory, origin=time.perf_counter(), spans=[], stack=[])
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable():
+    if TRACE["memory"] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    TRACE.update(enabled=False, memory=False, stack=[])
+
+def is_enabled():
+    return TRACE["enabled"]
+
+@contextlib.contextmanager
+def span(name, **args):
+    """Misst einen Abschnitt. Gibt den Datensatz zurück (wall/cpu in Sekunden)."""
+    stack = TRACE["stack"]
+    record = {
+        "name": name,
+        "args": args,
+        "depth": len(stack),
+        "path": [r["name"] for r in stack] + [name],
+        "counts": {},
+        "rules": {},
+        "peak": None,
+    }
+    enabled = TRACE["enabled"]
+    memory = enabled and TRACE["memory"]
+    if enabled:
+        if memory:
+            # Bisherige Spitze dem umgebenden Abschnitt gutschreiben, dann neu messen
+            if stack:
+                parent = stack[-1]
+                parent["peak"] = max(parent["peak"] or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            record["peak"] = 0
+        stack.append(record)
+
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall"] = time.perf_counter() - start
+        record["cpu"] = time.process_time() - start_cpu
+        record["start"] = start - TRACE["origin"]
+        if enabled:
+            stack.pop()
+            if memory:
+                record["peak"] = max(record["peak"], tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"] or 0, record["peak"])
+            TRACE["spans"].append(record)
+
+def count(key, amount=1):
+    """Erhöht einen Zähler im aktuellen Abschnitt."""
+    if TRACE["enabled"] and TRACE["stack"]:
+        counts = TRACE["stack"][-1]["counts"]
+        counts[key] = counts.get(key, 0) + amount
+
+def rule_hit(engine_name, pattern):
+    """Zählt einen Treffer einer Regel im aktuellen Abschnitt."""
+    if TRACE["enabled"] and TRACE["stack"]:
+        rules = TRACE["stack"][-1]["rules"]
+        key = f"{engine_name}: {pattern}"
+        rules[key] = rules.get(key, 0) + 1
+
+def instrumented(name=None):
+    """Dekorator: misst jeden Aufruf als Abschnitt.
+
+    Ist das erste Argument eine Fragen-Datenbank, wird die Anzahl der
+    MC-Fragen als Zähler "fragen" erfasst.
+    """
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                if args and isinstance(args[0], dict) and "mcQuestions" in args[0]:
+                    count("fragen", len(args[0]["mcQuestions"]))
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def rule_totals():
+    """Regel-Treffer über alle Abschnitte (ohne Doppelzählung verschachtelter Abschnitte)."""
+    totals = {}
+    for record in TRACE["spans"]:
+        for key, hits in record["rules"].items():
+            totals[key] = totals.get(key, 0) + hits
+    return dict(sorted(totals.items(), key=lambda item: (-item[1], item[0])))
+
+def trace_events():
+    """Abschnitte im Chrome-Trace-Format (Complete Events, Zeiten in µs)."""
+    pid = os.getpid()
+    events = []
+    for record in sorted(TRACE["spans"], key=lambda r: (r["start"], r["depth"])):
+        args = {**record["args"], "cpuMs": round(record["cpu"] * 1000, 3)}
+        if record["peak"] is not None:
+            args["peakBytes"] = record["peak"]
+        if record["counts"]:
+            args["counts"] = record["counts"]
+        if record["rules"]:
+            args["ruleHits"] = record["rules"]
+        events.append({
+            "name": record["name"],
+            "cat": "pipeline",
+            "ph": "X",
+            "ts": round(record["start"] * 1e6, 1),
+            "dur": round(record["wall"] * 1e6, 1),
+            "pid": pid,
+            "tid": 0,
+            "args": args,
+        })
+    return events
+
+def write_trace(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": trace_events(), "displayTimeUnit": "ms",
+                   "otherData": {"ruleHits": rule_totals()}}, f, ensure_ascii=False, indent=2)
+
+def folded_stacks():
+    """Eigenzeit pro Aufrufpfad in µs ("a;b;c 1234"), wie flamegraph.pl sie erwartet."""
+    child_time = {}
+    for record in TRACE["spans"]:
+        if record["depth"]:
+            parent = tuple(record["path"][:-1])
+            child_time[parent] = child_time.get(parent, 0.0) + record["wall"]
+
+    totals = {}
+    for record in TRACE["spans"]:
+        path = tuple(record["path"])
+        totals[path] = totals.get(path, 0.0) + record["wall"]
+
+    lines = []
+    for path, wall in totals.items():
+        own = max(wall - child_time.get(path, 0.0), 0.0)
+        micros = round(own * 1e6)
+        if micros:
+            lines.append(f"{';'.join(p.replace(';', ',') for p in path)} {micros}")
+    return lines
+
+def write_folded(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(folded_stacks()) + "\n")
+
+def print_summary(top_rules=10):
+    """Gibt Abschnitte als eingerückte Tabelle und die häufigsten Regel-Treffer aus."""
+    print(f"\n{'Abschnitt':<40} {'Wall':>10} {'CPU':>10} {'Spitze':>10}  Zähler")
+    for record in sorted(TRACE["spans"], key=lambda r: (r["start"], r["depth"])):
+        label = "  " * record["depth"] + record["name"]
+        peak = f"{record['peak'] / 1024 / 1024:.1f} MB" if record["peak"] is not None else "-"
+        counts = ", ".join(f"{k}: {v}" for k, v in record["counts"].items())
+        print(f"{label[:40]:<40} {record['wall'] * 1000:>7.1f} ms {record['cpu'] * 1000:>7.1f} ms "
+              f"{peak:>10}  {counts}")
+
+    totals = rule_totals()
+    if totals:
+        print("\nHäufigste Regel-Treffer:")
+        for key, hits in list(totals.items())[:top_rules]:
+            print(f"  {hits:>6}x  {key}")
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Itemanalyse über exportierte Lernstände (js/storage.js -> exportProgress).
+
+1. Liest die Export-Dateien eines Verzeichnisses nacheinander (nie alle auf
+   einmal) und sammelt pro Block von Lernenden eine Matrix Versuche/Richtige
+   (Lernende × Fragen) aus questionHistory
+2. Pro Block werden nur Summen fortgeschrieben (NumPy, vektorisiert):
+   - p-Wert: Anteil richtiger Versuche pro Frage
+   - Trennschärfe: punktbiseriale Korrelation zwischen Fragenergebnis (Anteil
+     richtiger Versuche) und Restscore des Lernenden (alle anderen Fragen)
+3. Optional (--irt 1pl/2pl): Rasch- bzw. 2PL-Modell über alle Antworten,
+   geschätzt mit alternierenden Newton-Schritten (Normal-Prior auf den
+   Fähigkeiten). Dafür werden nur die Antworten als kompakte Int-Arrays
+   gehalten, nicht die JSON-Dateien, und blockweise ausgewertet.
+   Grenze: die Antworten bleiben im Speicher, 16 Bytes pro beantworteter
+   (Lernende, Frage)-Kombination (10^8 Antworten ≈ 1,6 GB), dazu θ pro Lernendem.
+   Ohne --irt hängt der Speicher nur von --chunk und der Fragenzahl ab
+4. Schreibt item_statistics.json; der Pipeline-Pass "item_statistics" übernimmt
+   daraus die empirische Schwierigkeit in questions.json
+
+Empirische Schwierigkeit (nur bei mindestens MIN_LEARNERS Lernenden):
+- mit IRT: b < -0.5 easy, b > 0.5 hard, sonst medium
+- ohne IRT: p >= 0.8 easy, p < 0.5 hard, sonst medium
+
+Aufruf:
+    python item_analysis.py exports/                 # p-Werte + Trennschärfe
+    python item_analysis.py exports/ --irt 2pl
+    python item_analysis.py --simulate 20000 exports/   # Testdaten erzeugen
+    python pipeline.py --only item_statistics        # Schwierigkeit übernehmen
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from combine_questions import count_difficulties
+from instrumentation import count, instrumented
+
+DATA_DIR = Path(__file__).parent
+STATS_PATH = DATA_DIR / "item_statistics.json"
+STATS_VERSION = 1
+STORAGE_KEY = "klausurTrainer_progress"
+
+CHUNK_LEARNERS = 2048
+MIN_LEARNERS = 30
+EASY_P = 0.8
+HARD_P = 0.5
+EASY_B = -0.5
+HARD_B = 0.5
+IRT_ITERATIONS = 200
+IRT_TOLERANCE = 1e-3
+PRIOR_B = 3.0
+PRIOR_A = 1.0
+
+def load_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def iter_exports(directory):
+    """Liefert questionHistory jeder Export-Datei, eine Datei nach der anderen."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    progress = json.load(f)
+                # Auch ein roher localStorage-Dump ({STORAGE_KEY: "<json>"}) ist erlaubt
+                if isinstance(progress, dict) and isinstance(progress.get(STORAGE_KEY), str):
+                    progress = json.loads(progress[STORAGE_KEY])
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+                count("ungültige dateien")
+                continue
+            # Eine kaputte Datei überspringen statt den ganzen Lauf abzubrechen
+            history = progress.get("questionHistory", {}) if isinstance(progress, dict) else None
+            if not isinstance(history, dict):
+                count("ungültige dateien")
+                continue
+            yield history
+
+def iter_chunks(histories, columns, chunk_size=CHUNK_LEARNERS):
+    """Fasst Lernende blockweise zu Matrizen (Versuche, Richtige) zusammen."""
+    attempts = np.zeros((chunk_size, len(columns)), dtype=np.int32)
+    correct = np.zeros((chunk_size, len(columns)), dtype=np.int32)
+    row = 0
+    for history in histories:
+        for qid, entry in history.items():
+            column = columns.get(qid)
+            if column is None:
+                continue
+            attempts[row, column] = entry.get("attempts", 0)
+            correct[row, column] = min(entry.get("correct", 0), entry.get("attempts", 0))
+        row += 1
+        if row == chunk_size:
+            yield attempts, correct
+            attempts = np.zeros_like(attempts)
+            correct = np.zeros_like(correct)
+            row = 0
+    if row:
+        yield attempts[:row], correct[:row]
+
+def new_accumulator(n_items):
+    keys = ("attempts", "correct", "learners", "n", "sx", "sxx", "sy", "syy", "sxy")
+    return {key: np.zeros(n_items, dtype=np.float64) for key in keys}
+
+def accumulate(acc, attempts, correct):
+    """Schreibt die Summen für p-Wert und Trennschärfe mit einem Block fort."""
+    acc["attempts"] += attempts.sum(axis=0)
+    acc["correct"] += correct.sum(axis=0)
+    answered = attempts > 0
+    acc["learners"] += answered.sum(axis=0)
+
+    total_attempts = attempts.sum(axis=1, keepdims=True)
+    total_correct = correct.sum(axis=1, keepdims=True)
+    rest_attempts = total_attempts - attempts
+    valid = answered & (rest_attempts > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.where(valid, correct / attempts, 0.0)
+        y = np.where(valid, (total_correct - correct) / rest_attempts, 0.0)
+    acc["n"] += valid.sum(axis=0)
+    acc["sx"] += x.sum(axis=0)
+    acc["sxx"] += (x * x).sum(axis=0)
+    acc["sy"] += y.sum(axis=0)
+    acc["syy"] += (y * y).sum(axis=0)
+    acc["sxy"] += (x * y).sum(axis=0)
+
+def point_biserial(acc):
+    """Korrelation Fragenergebnis/Restscore aus den Summen (NaN bei zu wenig Streuung)."""
+    n = acc["n"]
+    cov = n * acc["sxy"] - acc["sx"] * acc["sy"]
+    var_x = n * acc["sxx"] - acc["sx"] ** 2
+    var_y = n * acc["syy"] - acc["sy"] ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = cov / np.sqrt(var_x * var_y)
+    return np.where((n >= 2) & (var_x > 1e-12) & (var_y > 1e-12), r, np.nan)
+
+def fit_irt(responses, n_learners, n_items, model="2pl", iterations=IRT_ITERATIONS, tolerance=IRT_TOLERANCE):
+    """Schätzt Fähigkeit θ, Schwierigkeit b und (2PL) Trennschärfe a.
+
+    responses sind Blöcke (Lernende, Fragen, Versuche, Richtige) als Int-Arrays,
+    einer pro Block von Lernenden. Binomiales Modell: correct ~ Bin(attempts,
+    σ(a·(θ - b))). Abwechselnd ein Newton-Schritt für alle θ, alle b und alle a;
+    die Summen werden Block für Block per np.bincount gebildet, Zwischenergebnisse
+    brauchen deshalb nur Speicher für einen Block.
+    Die Skala wird über standardisierte θ festgelegt; die Priors θ ~ N(0, 1),
+    b ~ N(0, PRIOR_B²), a ~ N(1, PRIOR_A²) halten Extremfälle (alles richtig) endlich.
+    """
+    def sums(by_learner, terms, with_residuals=True):
+        """Summe von terms(...) pro Lernendem bzw. Frage über alle Blöcke."""
+        size = n_learners if by_learner else n_items
+        totals = None
+        for learner, item, attempts, correct in responses:
+            n = attempts.astype(np.float64)
+            c = correct.astype(np.float64)
+            if with_residuals:
+                p = 1 / (1 + np.exp(-a[item] * (theta[learner] - b[item])))
+                values = terms(learner, item, c - n * p, n * p * (1 - p))
+            else:
+                values = terms(n, c)
+            index = learner if by_learner else item
+            block = [np.bincount(index, v, size) for v in values]
+            totals = block if totals is None else [t + v for t, v in zip(totals, block)]
+        return totals
+
+    theta = np.zeros(n_learners)
+    a = np.ones(n_items)
+    item_correct, item_attempts = sums(False, lambda n, c: (c, n), with_residuals=False)
+    p_item = (item_correct + 0.5) / (item_attempts + 1.0)
+    b = -np.log(p_item / (1 - p_item))
+
+    for iteration in range(iterations):
+        previous = np.concatenate([theta, b, a])
+        grad, curv = sums(True, lambda learner, item, r, w: (a[item] * r, a[item] ** 2 * w))
+        theta = theta + (grad - theta) / (curv + 1)
+        # Skala festhalten: θ standardisieren, a und b so umrechnen, dass a·(θ - b) gleich bleibt
+        # (beim 1PL ist a = 1 fest, dort wird θ nur zentriert)
+        mean = theta.mean()
+        std = (theta.std() or 1.0) if model == "2pl" else 1.0
+        theta = (theta - mean) / std
+        b = (b - mean) / std
+        a = a * std
+
+        grad, curv = sums(False, lambda learner, item, r, w: (a[item] * r, a[item] ** 2 * w))
+        b = b + (-grad - b / PRIOR_B ** 2) / (curv + 1 / PRIOR_B ** 2)
+
+        if model == "2pl":
+            def slope_terms(learner, item, r, w):
+                d = theta[learner] - b[item]
+                return d * r, d ** 2 * w
+            grad, curv = sums(False, slope_terms)
+            a = np.clip(a + (grad - (a - 1) / PRIOR_A ** 2) / (curv + 1 / PRIOR_A ** 2), 0.05, 5.0)
+        if np.abs(np.concatenate([theta, b, a]) - previous).max() < tolerance:
+            break
+    count("irt iterationen", iteration + 1)
+    return {"theta": theta, "b": b, "a": a}
+
+def empirical_difficulty(p_value, irt_b=None):
+    if irt_b is not None:
+        return "easy" if irt_b < EASY_B else "hard" if irt_b > HARD_B else "medium"
+    return "easy" if p_value >= EASY_P else "hard" if p_value < HARD_P else "medium"
+
+@instrumented()
+def analyze_exports(directory, data, irt=None, chunk_size=CHUNK_LEARNERS):
+    """Streamt alle Exporte und berechnet die Itemstatistik."""
+    ids = [q["id"] for q in data["mcQuestions"]]
+    columns = {qid: i for i, qid in enumerate(ids)}
+    acc = new_accumulator(len(ids))
+    responses = []
+    n_learners = 0
+
+    for attempts, correct in iter_chunks(iter_exports(directory), columns, chunk_size):
+        accumulate(acc, attempts, correct)
+        if irt:
+            rows, cols = np.nonzero(attempts)
+            responses.append((rows.astype(np.int32) + n_learners, cols.astype(np.int32),
+                              attempts[rows, cols], correct[rows, cols]))
+        n_learners += len(attempts)
+        count("lernende", len(attempts))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_values = acc["correct"] / acc["attempts"]
+    discrimination = point_biserial(acc)
+
+    fit = None
+    if irt and responses:
+        fit = fit_irt(responses, n_learners, len(ids), irt)
+
+    items = {}
+    for i, qid in enumerate(ids):
+        if not acc["attempts"][i]:
+            continue
+        stats = {
+            "attempts": int(acc["attempts"][i]),
+            "learners": int(acc["learners"][i]),
+            "pValue": round(float(p_values[i]), 4),
+            "discrimination": None if np.isnan(discrimination[i]) else round(float(discrimination[i]), 4)
+        }
+        if fit is not None:
+            stats["irtDifficulty"] = round(float(fit["b"][i]), 4)
+            if irt == "2pl":
+                stats["irtDiscrimination"] = round(float(fit["a"][i]), 4)
+        if stats["learners"] >= MIN_LEARNERS:
+            stats["difficulty"] = empirical_difficulty(stats["pValue"], stats.get("irtDifficulty"))
+        items[qid] = stats
+
+    return {
+        "version": STATS_VERSION,
+        "learners": n_learners,
+        "model": irt,
+        "items": items
+    }
+
+def apply_item_statistics(data, path=STATS_PATH):
+    """Übernimmt die empirische Schwierigkeit in die Fragen (für den Pipeline-Pass).
+
+    Die handvergebene Schwierigkeit bleibt als authoredDifficulty erhalten.
+    """
+    if not path.exists():
+        return data, 0, 0
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)["items"]
+
+    annotated = changed = 0
+    for q in data["mcQuestions"]:
+        stats = items.get(q["id"])
+        if not stats:
+            continue
+        q["itemStats"] = {key: stats[key] for key in ("learners", "pValue", "discrimination") if key in stats}
+        annotated += 1
+        label = stats.get("difficulty")
+        if label and label != q.get("difficulty"):
+            q.setdefault("authoredDifficulty", q.get("difficulty"))
+            q["difficulty"] = label
+            changed += 1
+    data["metadata"]["difficultyDistribution"] = count_difficulties(data["mcQuestions"])
+    return data, annotated, changed
+
+def write_synthetic_exports(directory, data, n_learners, seed=42):
+    """Erzeugt Test-Exporte nach einem 2PL-Modell (Schwierigkeit aus dem Feld "difficulty")."""
+    rng = np.random.default_rng(seed)
+    ids = [q["id"] for q in data["mcQuestions"]]
+    offsets = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+    b = np.array([offsets.get(q.get("difficulty"), 0.0) for q in data["mcQuestions"]]) + rng.normal(0, 0.5, len(ids))
+    a = rng.lognormal(0, 0.3, len(ids))
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for learner in range(n_learners):
+        theta = rng.normal()
+        answered = np.flatnonzero(rng.random(len(ids)) < rng.uniform(0.1, 0.9))
+        attempts = rng.integers(1, 4, len(answered))
+        p = 1 / (1 + np.exp(-a[answered] * (theta - b[answered])))
+        correct = rng.binomial(attempts, p)
+        history = {ids[j]: {"attempts": int(n), "correct": int(k)}
+                   for j, n, k in zip(answered.tolist(), attempts.tolist(), correct.tolist())}
+        with open(directory / f"learner_{learner:06d}.json", 'w', encoding='utf-8') as f:
+            json.dump({"questionHistory": history}, f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Itemanalyse über exportierte Lernstände")
+    parser.add_argument("directory", type=Path, help="Verzeichnis mit Export-Dateien (*.json)")
+    parser.add_argument("--irt", choices=["1pl", "2pl"], help="Zusätzlich ein IRT-Modell schätzen (hält alle Antworten im Speicher, "
+                             "16 Bytes pro Antwort)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_LEARNERS, help="Lernende pro Block")
+    parser.add_argument("--output", type=Path, default=STATS_PATH)
+    parser.add_argument("--simulate", type=int, metavar="N",
+                        help="Stattdessen N synthetische Exporte in das Verzeichnis schreiben")
+    args = parser.parse_args()
+
+    data = load_questions()
+    if args.simulate:
+        write_synthetic_exports(args.directory, data, args.simulate)
+        print(f"{args.simulate} Test-Exporte geschrieben: {args.directory}")
+        return
+
+    start = time.perf_counter()
+    stats = analyze_exports(args.directory, data, args.irt, args.chunk)
+    elapsed = time.perf_counter() - start
+
+    items = stats["items"]
+    labelled = [s for s in items.values() if "difficulty" in s]
+    print(f"Lernende: {stats['learners']:,}, Fragen mit Daten: {len(items)} ({elapsed:.1f} s)")
+    print(f"Empirische Schwierigkeit für {len(labelled)} Fragen (mind. {MIN_LEARNERS} Lernende)")
+    weak = sorted((s["discrimination"], qid) for qid, s in items.items() if s["discrimination"] is not None)[:5]
+    for r, qid in weak:
+        print(f"  Geringe Trennschärfe: {qid} (r = {r:.2f}, p = {items[qid]['pValue']:.2f})")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    print(f"Gespeichert: {args.output}")
+
+if __name__ == "__main__":
+    main()
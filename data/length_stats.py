@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Vektorisierte Statistiken über Antwortlängen und Antwortpositionen.
+
+Baut einmal NumPy-Arrays aus den MC-Fragen auf:
+- lengths:  Optionslängen (Fragen × max. Optionen), -1 für fehlende Optionen
+- correct:  Maske der richtigen Optionen (Fragen × max. Optionen)
+- multi:    isMultiSelect-Flag pro Frage
+
+Darauf laufen die Auswertungen (Längste=Richtig, Positions-Histogramm,
+Ranking nach Längen-Differenz) als reine Array-Operationen.
+"""
+
+import numpy as np
+
+def build_arrays(mc_questions):
+    """Erzeugt die Arrays für eine Liste von MC-Fragen."""
+    n = len(mc_questions)
+    counts = np.fromiter((len(q["options"]) for q in mc_questions), dtype=np.int64, count=n)
+    width = int(counts.max()) if n else 0
+    total = int(counts.sum())
+
+    flat_lengths = np.fromiter(
+        (len(opt["text"]) for q in mc_questions for opt in q["options"]), dtype=np.int64, count=total
+    )
+    flat_correct = np.fromiter(
+        (bool(opt["correct"]) for q in mc_questions for opt in q["options"]), dtype=bool, count=total
+    )
+
+    # Flache Optionen in die (Fragen × Optionen)-Matrix einsortieren
+    rows = np.repeat(np.arange(n), counts)
+    starts = np.cumsum(counts) - counts
+    cols = np.arange(total) - np.repeat(starts, counts)
+
+    lengths = np.full((n, width), -1, dtype=np.int64)
+    correct = np.zeros((n, width), dtype=bool)
+    lengths[rows, cols] = flat_lengths
+    correct[rows, cols] = flat_correct
+
+    multi = np.fromiter((bool(q.get("isMultiSelect", False)) for q in mc_questions), dtype=bool, count=n)
+
+    return {
+        "lengths": lengths,
+        "correct": correct,
+        "multi": multi,
+        "correct_count": correct.sum(axis=1),
+        "option_count": counts
+    }
+
+def single_mask(stats, by_flag=True):
+    """Single-Choice-Fragen: über isMultiSelect-Flag oder über genau eine richtige Option."""
+    if by_flag:
+        return ~stats["multi"]
+    return stats["correct_count"] == 1
+
+def longest_is_correct(stats, mask, first_only=False):
+    """Zählt Fragen (in mask), bei denen eine richtige Antwort die längste ist.
+
+    first_only=True zählt nur, wenn die erste längste Option richtig ist
+    (Gleichstände gehen an die vordere Option). Gibt (Anzahl, Gesamt) zurück.
+    """
+    lengths = stats["lengths"][mask]
+    correct = stats["correct"][mask]
+    if not len(lengths):
+        return 0, 0
+    max_len = lengths.max(axis=1)
+    if first_only:
+        hits = correct[np.arange(len(lengths)), lengths.argmax(axis=1)]
+    else:
+        hits = (correct & (lengths == max_len[:, None])).any(axis=1)
+    return int(hits.sum()), int(len(lengths))
+
+def position_histogram(stats, mask, size=4):
+    """Histogramm der Positionen richtiger Antworten (für Fragen in mask)."""
+    correct = stats["correct"][mask]
+    positions = np.nonzero(correct)[1]
+    return np.bincount(positions, minlength=size)
+
+def length_diff_ranking(stats, mask, min_diff=20):
+    """Fragen, deren richtige Antwort die längste ist und die längste falsche um mehr
+    als min_diff Zeichen übertrifft.
+
+    Gibt (Indizes, Differenzen, Länge richtig, Länge längste falsche) zurück,
+    absteigend nach Differenz sortiert (stabil bei Gleichstand).
+    """
+    lengths = stats["lengths"]
+    correct = stats["correct"]
+    valid = lengths >= 0
+
+    max_len = lengths.max(axis=1)
+    # Wie analyze_length: die letzte richtige Option zählt
+    last_correct = correct.shape[1] - 1 - np.argmax(correct[:, ::-1], axis=1)
+    has_correct = correct.any(axis=1)
+    correct_len = lengths[np.arange(len(lengths)), last_correct]
+
+    wrong = np.where(valid & ~correct, lengths, -1)
+    max_wrong = np.maximum(wrong.max(axis=1, initial=-1), 0)
+    diff = correct_len - max_wrong
+
+    candidates = mask & has_correct & (correct_len == max_len) & (diff > min_diff)
+    indices = np.nonzero(candidates)[0]
+    order = np.argsort(-diff[indices], kind="stable")
+    return indices[order], diff[indices][order], correct_len[indices][order], max_wrong[indices][order]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Findet fast identische Fragen (auch themenübergreifend) mit MinHash und LSH.
+
+1. Normalisiert Stamm + Antwortoptionen (Kleinschreibung, ohne Satzzeichen;
+   Optionen sortiert, damit die Reihenfolge keine Rolle spielt)
+2. Zerlegt den Text in Wort-Shingles (Wortpaare) und berechnet eine MinHash-Signatur
+3. Teilt die Signaturen in Bänder; Fragen, die in mindestens einem Band
+   übereinstimmen, landen im selben Bucket und werden Kandidaten
+4. Nur Kandidatenpaare werden über die geschätzte Jaccard-Ähnlichkeit geprüft
+   und zu Clustern zusammengefasst
+
+Statt alle Paare zu vergleichen (quadratisch), wächst der Aufwand so nahezu
+linear mit der Anzahl der Fragen.
+
+Aufruf:
+    python near_duplicates.py                    # questions.json prüfen
+    python near_duplicates.py --from-topics      # Topic-Dateien vor dem Kombinieren prüfen
+    python near_duplicates.py --threshold 0.8 --json duplicates.json
+"""
+
+import argparse
+import json
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+import combine_questions
+from instrumentation import instrumented
+
+DATA_DIR = Path(__file__).parent
+REPORT_PATH = DATA_DIR / "near_duplicates_report.txt"
+
+SHINGLE_SIZE = 2
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7
+SEED = 1
+# Größere Buckets werden nicht paarweise verglichen, sondern nach Signatur sortiert;
+# jede Frage wird dann nur mit ihren NEIGHBOR_WINDOW nächsten Nachbarn verglichen
+MAX_BUCKET_PAIRS = 20
+NEIGHBOR_WINDOW = 8
+
+def load_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def normalize(text):
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+def question_text(q):
+    """Vergleichstext: Stamm plus sortierte Optionen (bei offenen Fragen nur der Stamm)."""
+    options = sorted(normalize(opt["text"]) for opt in q.get("options", []))
+    return " | ".join([normalize(q["stem"])] + options)
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Menge der Wort-Shingles als 32-Bit-Hashes."""
+    words = text.split()
+    if len(words) <= size:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(" ".join(words[i:i + size]).encode('utf-8'))
+            for i in range(len(words) - size + 1)}
+
+def make_permutations(num_perm=NUM_PERM, seed=SEED):
+    """Koeffizienten a (ungerade), b der Multiply-Shift-Hashes h(x) = (a*x + b) >> 32."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+    b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False)
+    return a, b
+
+def minhash_signatures(texts, permutations, batch_shingles=1 << 12):
+    """MinHash-Signaturen (Fragen × Permutationen).
+
+    Die Shingles aller Fragen liegen in einem flachen Array; gehasht wird in
+    Blöcken von ganzen Fragen, das Minimum pro Frage liefert minimum.reduceat.
+    """
+    a, b = permutations
+    sets = [shingles(text) for text in texts]
+    counts = np.fromiter((len(s) for s in sets), dtype=np.int64, count=len(sets))
+    values = np.fromiter((x for s in sets for x in s), dtype=np.uint64, count=int(counts.sum()))
+    ends = np.cumsum(counts)
+    starts = ends - counts
+
+    signatures = np.empty((len(texts), len(a)), dtype=np.uint32)
+    first = 0
+    while first < len(texts):
+        # So viele Fragen wie in einen Block passen (mindestens eine)
+        last = max(int(np.searchsorted(ends, starts[first] + batch_shingles, side="right")), first + 1)
+        block = values[starts[first]:ends[last - 1]]
+        # Überlauf in uint64 ist gewollt (Rechnung modulo 2^64), keine Division nötig
+        hashed = ((block[:, None] * a + b) >> np.uint64(32)).astype(np.uint32)
+        signatures[first:last] = np.minimum.reduceat(hashed, starts[first:last] - starts[first], axis=0)
+        first = last
+    return signatures
+
+def neighbor_pairs(signatures, members, start_column, window=NEIGHBOR_WINDOW):
+    """Kandidaten in einem großen Bucket (Sorted Neighbourhood).
+
+    Sortiert die Mitglieder lexikographisch nach ihrer Signatur ab start_column
+    (zyklisch, das gemeinsame Band zuletzt); ähnliche Fragen stimmen in den meisten
+    Spalten überein und liegen deshalb nah beieinander.
+    """
+    rotated = np.roll(signatures[members], -start_column, axis=1)
+    # lexsort sortiert nach dem letzten Schlüssel zuerst
+    ranked = [members[k] for k in np.lexsort(rotated.T[::-1])]
+    for x, i in enumerate(ranked):
+        for j in ranked[x + 1:x + 1 + window]:
+            yield (i, j) if i < j else (j, i)
+
+def lsh_candidates(signatures, bands=BANDS, rows=ROWS):
+    """Kandidatenpaare (i < j), die in mindestens einem Band identisch sind."""
+    pairs = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        if counts.max(initial=0) < 2:
+            continue
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.cumsum(counts)[:-1]
+        for bucket in np.split(order, boundaries):
+            if len(bucket) < 2:
+                continue
+            members = sorted(bucket.tolist())
+            if len(members) > MAX_BUCKET_PAIRS:
+                pairs.update(neighbor_pairs(signatures, members, (band + 1) * rows))
+                continue
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+def find_root(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def cluster_pairs(n, pairs):
+    """Union-Find über die bestätigten Paare.
+
+    Gibt Wurzel -> sortierte Indexliste (nur Cluster mit mehr als einer Frage) und
+    die Eltern-Liste zurück, über die sich jedes Paar seinem Cluster zuordnen lässt.
+    """
+    parent = list(range(n))
+    for i, j in pairs:
+        root_i, root_j = find_root(parent, i), find_root(parent, j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find_root(parent, i), []).append(i)
+    return {root: members for root, members in groups.items() if len(members) > 1}, parent
+
+def find_near_duplicates(questions, threshold=THRESHOLD, seed=SEED):
+    """Gibt Cluster fast identischer Fragen zurück (größte zuerst)."""
+    if len(questions) < 2:
+        return []
+
+    signatures = minhash_signatures([question_text(q) for q in questions], make_permutations(seed=seed))
+    candidates = sorted(lsh_candidates(signatures))
+    if not candidates:
+        return []
+
+    left = np.array([i for i, _ in candidates])
+    right = np.array([j for _, j in candidates])
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    confirmed = similarity >= threshold
+
+    pair_similarity = {}
+    for i, j, s in zip(left[confirmed].tolist(), right[confirmed].tolist(), similarity[confirmed].tolist()):
+        pair_similarity[(i, j)] = s
+
+    groups, parent = cluster_pairs(len(questions), pair_similarity)
+    # Kleinste Ähnlichkeit pro Cluster in einem Durchlauf über die Paare
+    min_similarity = {}
+    for (i, _), s in pair_similarity.items():
+        root = find_root(parent, i)
+        min_similarity[root] = min(s, min_similarity.get(root, s))
+
+    clusters = []
+    for root, members in groups.items():
+        topics = sorted({questions[i].get("topicId") for i in members}, key=str)
+        clusters.append({
+            "size": len(members),
+            "crossTopic": len(topics) > 1,
+            "topicIds": topics,
+            "minSimilarity": round(min_similarity[root], 3),
+            "questions": [
+                {"id": questions[i]["id"], "topicId": questions[i].get("topicId"), "stem": questions[i]["stem"][:80]}
+                for i in members
+            ]
+        })
+    clusters.sort(key=lambda c: -c["size"])
+    return clusters
+
+@instrumented()
+def near_duplicate_report(data, threshold=THRESHOLD):
+    """Sucht Dubletten getrennt in MC- und offenen Fragen."""
+    return {
+        "mcQuestions": find_near_duplicates(data["mcQuestions"], threshold),
+        "openQuestions": find_near_duplicates(data["openQuestions"], threshold)
+    }
+
+def write_duplicate_report(report, threshold=THRESHOLD):
+    """Schreibt die Dubletten-Cluster in near_duplicates_report.txt."""
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        f.write("NEAR-DUPLICATE REPORT - Fast identische Fragen\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"Schwelle (geschätzte Jaccard-Ähnlichkeit): {threshold}\n\n")
+
+        for key, label in (("mcQuestions", "MC-Fragen"), ("openQuestions", "Offene Fragen")):
+            f.write(f"{label}: {len(report[key])} Cluster\n\n")
+            for cluster in report[key]:
+                scope = "themenübergreifend" if cluster["crossTopic"] else f"Thema {cluster['topicIds'][0]}"
+                f.write(f"Cluster ({cluster['size']} Fragen, {scope}, min. Ähnlichkeit "
+                        f"{cluster['minSimilarity']}):\n")
+                for q in cluster["questions"]:
+                    f.write(f"  - {q['id']} (Thema {q['topicId']}): {q['stem']}...\n")
+                f.write("\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast identische Fragen mit MinHash/LSH finden")
+    parser.add_argument("--from-topics", action="store_true",
+                        help="Topic-Dateien direkt prüfen (vor combine_questions)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Mindest-Ähnlichkeit (geschätzte Jaccard-Ähnlichkeit, 0-1)")
+    parser.add_argument("--json", help="Cluster zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    if args.from_topics:
+        data = combine_questions.combine_questions(combine_questions.load_topic_files())
+    else:
+        data = load_questions()
+
+    report = near_duplicate_report(data, args.threshold)
+    write_duplicate_report(report, args.threshold)
+
+    for key, label in (("mcQuestions", "MC-Fragen"), ("openQuestions", "Offene Fragen")):
+        clusters = report[key]
+        cross = sum(1 for c in clusters if c["crossTopic"])
+        print(f"{label}: {len(clusters)} Cluster ({cross} themenübergreifend)")
+        for cluster in clusters[:5]:
+            ids = ", ".join(q["id"] for q in cluster["questions"])
+            print(f"  - {ids} (min. Ähnlichkeit {cluster['minSimilarity']})")
+
+    print(f"\nReport gespeichert: {REPORT_PATH}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Gespeichert: {args.json}")
+
+if __name__ == "__main__":
+    main()
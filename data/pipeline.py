@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Führt alle Bearbeitungsschritte für questions.json in einem Prozess aus:
+1. Lädt die Fragen-Datenbank genau einmal
+2. Wendet alle registrierten Passes in fester Reihenfolge auf die Daten im Speicher an
+3. Speichert das Ergebnis einmal am Ende (inkl. Topic-Shards und Manifest)
+4. Gibt die Laufzeit pro Pass aus und schreibt auf Wunsch einen Trace
+   (Wall-/CPU-Zeit, Speicherspitze, verarbeitete Fragen, Regel-Treffer)
+
+Aufruf:
+    python pipeline.py                      # alle Passes auf questions.json
+    python pipeline.py --from-topics        # vorher combine_questions aus den Topic-Dateien
+    python pipeline.py --only fix_patterns,final_balance
+    python pipeline.py --dry-run            # nichts speichern
+    python pipeline.py --release            # Artefakte minifiziert + .gz/.br, mit Größenbericht
+    python pipeline.py --trace trace.json   # Chrome-Trace (chrome://tracing, Perfetto)
+    python pipeline.py --flamegraph out.folded --memory
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import balance_lengths
+import combine_questions
+import deep_quality_check
+import enhance_explanations
+import final_balance
+import fix_patterns
+import improve_questions
+import instrumentation
+import item_analysis
+import near_duplicates
+import schema_validation
+import source_grounding
+from artifacts import report_sizes, write_artifacts
+from instrumentation import count, span
+
+DATA_DIR = Path(__file__).parent
+
+# Registry: Pass-Name -> Funktion(data, options) -> (data, stats)
+PASSES = {}
+
+# Reihenfolge, in der die Passes bei einem vollen Rebuild laufen
+PASS_ORDER = [
+    "enhance_explanations",
+    "deep_quality_check",
+    "near_duplicates",
+    "fix_patterns",
+    "balance_lengths",
+    "final_balance",
+    # Nach den Balancern: deren Erweiterungen stehen alle in AWKWARD_PHRASES und
+    # werden hier wieder gestrichen, wo sie die Option nur aufblähen
+    "improve_questions",
+    "source_grounding",
+    "item_statistics",
+]
+
+def register_pass(name):
+    """Registriert eine Funktion als Pipeline-Pass."""
+    def decorator(func):
+        PASSES[name] = func
+        return func
+    return decorator
+
+@register_pass("enhance_explanations")
+def run_enhance_explanations(data, options):
+    data, count = enhance_explanations.enhance_all_explanations(data)
+    return data, {"Erweiterte Erklärungen": count}
+
+@register_pass("deep_quality_check")
+def run_deep_quality_check(data, options):
+    data, problems, enhanced = deep_quality_check.deep_quality_check(data)
+    if not options.get("dry_run"):
+        deep_quality_check.write_quality_report(problems)
+    return data, {"Problematische Fragen": len(problems), "Erweiterte Erklärungen": enhanced}
+
+@register_pass("near_duplicates")
+def run_near_duplicates(data, options):
+    report = near_duplicates.near_duplicate_report(data)
+    if not options.get("dry_run"):
+        near_duplicates.write_duplicate_report(report)
+    clusters = report["mcQuestions"] + report["openQuestions"]
+    return data, {"Dubletten-Cluster": len(clusters),
+                  "Themenübergreifend": sum(1 for c in clusters if c["crossTopic"])}
+
+@register_pass("fix_patterns")
+def run_fix_patterns(data, options):
+    data, shuffled, multi = fix_patterns.fix_questions(data)
+    return data, {"Geshuffelt": shuffled, "Multi-Select": multi}
+
+@register_pass("balance_lengths")
+def run_balance_lengths(data, options):
+    data, mods, unresolved = balance_lengths.balance_lengths(data)
+    balance_lengths.verify_balance(data)
+    return data, {"Modifikationen": mods, "Nicht balancierbar": len(unresolved)}
+
+@register_pass("final_balance")
+def run_final_balance(data, options):
+    data, mods, unresolved = final_balance.aggressive_balance(data)
+    data = final_balance.reshuffle_options(data)
+    return data, {"Änderungen": mods, "Nicht balancierbar": len(unresolved)}
+
+@register_pass("improve_questions")
+def run_improve_questions(data, options):
+    data, removed, fixes = improve_questions.improve_questions(data)
+    return data, {"Entfernte Fragen": len(removed), "Awkward Phrasen": fixes}
+
+@register_pass("source_grounding")
+def run_source_grounding(data, options):
+    data, grounded = source_grounding.ground_questions(data)
+    return data, {"Fragen mit Quelle": grounded}
+
+@register_pass("item_statistics")
+def run_item_statistics(data, options):
+    data, annotated, changed = item_analysis.apply_item_statistics(data)
+    return data, {"Fragen mit Itemstatistik": annotated, "Schwierigkeit geändert": changed}
+
+def load_bank(from_topics=False):
+    """Lädt die Fragen-Datenbank (oder kombiniert sie aus den Topic-Dateien)."""
+    if from_topics:
+        return combine_questions.combine_questions(combine_questions.load_topic_files())
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_bank(data):
+    with open(DATA_DIR / "questions.json", 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def run_pipeline(data, pass_names=None, options=None):
+    """Führt die Passes nacheinander auf denselben Daten aus."""
+    options = options or {}
+    timings = []
+    for name in pass_names or PASS_ORDER:
+        with span(name) as record:
+            count("fragen", len(data["mcQuestions"]))
+            count("offene fragen", len(data["openQuestions"]))
+            data, stats = PASSES[name](data, options)
+            for key, value in stats.items():
+                count(key, value)
+        timings.append((name, record["wall"], stats))
+        summary = ", ".join(f"{k}: {v}" for k, v in stats.items())
+        print(f"  [{name}] {record['wall'] * 1000:.1f} ms - {summary}")
+    return data, timings
+
+def parse_pass_list(value):
+    names = [n.strip() for n in value.split(",") if n.strip()]
+    unknown = [n for n in names if n not in PASSES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unbekannte Passes: {', '.join(unknown)}")
+    return names
+
+def main():
+    parser = argparse.ArgumentParser(description="Fragen-Pipeline in einem Prozess ausführen")
+    parser.add_argument("--from-topics", action="store_true",
+                        help="Startet mit combine_questions statt mit questions.json")
+    parser.add_argument("--only", type=parse_pass_list,
+                        help="Kommagetrennte Liste von Passes (Reihenfolge bleibt wie angegeben)")
+    parser.add_argument("--dry-run", action="store_true", help="Ergebnis nicht speichern")
+    parser.add_argument("--release", action="store_true",
+                        help="Artefakte als kompaktes JSON plus .gz/.br schreiben")
+    parser.add_argument("--trace", help="Trace im Chrome-Trace-Format (JSON) speichern")
+    parser.add_argument("--flamegraph", help="Folded Stacks für flamegraph.pl/speedscope speichern")
+    parser.add_argument("--memory", action="store_true", help="Speicherspitze pro Abschnitt messen (tracemalloc)")
+    args = parser.parse_args()
+
+    instrumentation.enable(memory=args.memory)
+
+    with span("laden") as record:
+        data = load_bank(args.from_topics)
+    load_time = record["wall"]
+    print(f"Geladen: {len(data['mcQuestions'])} MC-Fragen, {len(data['openQuestions'])} offene Fragen "
+          f"({load_time * 1000:.1f} ms)")
+
+    print("\nPasses:")
+    data, timings = run_pipeline(data, args.only, {"dry_run": args.dry_run})
+
+    # Nur eine gültige Datenbank wird gespeichert
+    with span("validierung"):
+        schema_validation.ensure_valid(schema_validation.validate_bank(data), "Fragen-Datenbank")
+
+    save_time = 0.0
+    sizes = []
+    if not args.dry_run:
+        with span("speichern") as record:
+            save_bank(data)
+            write_artifacts(data, release=args.release, sizes=sizes)
+        save_time = record["wall"]
+
+    print("\nLaufzeit pro Pass:")
+    print(f"  {'laden':<22} {load_time * 1000:>9.1f} ms")
+    for name, elapsed, _ in timings:
+        print(f"  {name:<22} {elapsed * 1000:>9.1f} ms")
+    if not args.dry_run:
+        print(f"  {'speichern + shards':<22} {save_time * 1000:>9.1f} ms")
+    total = load_time + save_time + sum(t for _, t, _ in timings)
+    print(f"  {'gesamt':<22} {total * 1000:>9.1f} ms")
+
+    if args.trace or args.flamegraph or args.memory:
+        instrumentation.print_summary()
+    if args.trace:
+        instrumentation.write_trace(args.trace)
+        print(f"\nTrace: {args.trace}")
+    if args.flamegraph:
+        instrumentation.write_folded(args.flamegraph)
+        print(f"Flamegraph: {args.flamegraph}")
+    instrumentation.disable()
+
+    if not args.dry_run:
+        print(f"\nGespeichert: {DATA_DIR / 'questions.json'}")
+        if args.release:
+            report_sizes(sizes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Parallele Qualitätsanalyse über alle MC-Fragen.
+
+Führt die Analysen aus analyze_questions, analyze_length, deep_quality_check und
+improve_questions in einem Process-Pool aus. Die Fragen werden nach topicId oder
+in Blöcke fester Größe aufgeteilt; die Teilergebnisse werden danach in der
+ursprünglichen Fragenreihenfolge zusammengeführt, sodass die Ausgabe unabhängig
+von Worker-Anzahl und Aufteilung identisch ist.
+
+Aufruf:
+    python quality_parallel.py                     # alle Kerne, Blöcke à 5000 Fragen
+    python quality_parallel.py --by-topic          # ein Teilauftrag pro Thema
+    python quality_parallel.py --workers 1         # seriell (zum Vergleich)
+    python quality_parallel.py --json report.json  # Ergebnis maschinenlesbar speichern
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from analyze_length import find_length_problem
+from analyze_questions import collect_pattern_stats, print_pattern_report
+from deep_quality_check import analyze_question
+from improve_questions import is_irrelevant_question
+
+DATA_DIR = Path(__file__).parent
+DEFAULT_CHUNK_SIZE = 5000
+
+def load_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def partition_by_topic(mc_questions):
+    """Teilt (Index, Frage)-Paare nach topicId auf, sortiert nach topicId."""
+    groups = {}
+    for index, q in enumerate(mc_questions):
+        groups.setdefault(q.get("topicId", 0), []).append((index, q))
+    return [groups[topic_id] for topic_id in sorted(groups)]
+
+def partition_chunks(mc_questions, chunk_size):
+    """Teilt (Index, Frage)-Paare in Blöcke fester Größe auf."""
+    indexed = list(enumerate(mc_questions))
+    return [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+
+def analyze_chunk(items):
+    """Analysiert einen Teil der Fragen. Läuft im Worker-Prozess."""
+    questions = [q for _, q in items]
+    stats = collect_pattern_stats(questions)
+
+    # Multi-Select-Liste mit Index für die deterministische Zusammenführung
+    multi_indices = [i for i, q in items if sum(1 for opt in q["options"] if opt["correct"]) > 1]
+    multi_select = list(zip(multi_indices, stats["multi_select"]))
+
+    length_problems = []
+    quality_problems = []
+    irrelevant = []
+    for index, q in items:
+        problem = find_length_problem(q)
+        if problem:
+            length_problems.append((index, problem))
+
+        issues = analyze_question(q)
+        if issues:
+            quality_problems.append((index, {
+                "id": q["id"],
+                "stem": q["stem"][:80],
+                "issues": issues
+            }))
+
+        if is_irrelevant_question(q):
+            irrelevant.append((index, {"id": q["id"], "stem": q["stem"][:80]}))
+
+    return {
+        "first_index": items[0][0] if items else 0,
+        "total_single_correct": stats["total_single_correct"],
+        "longest_is_correct": stats["longest_is_correct"],
+        "position_counts": dict(stats["position_counts"]),
+        "multi_select": multi_select,
+        "topic_difficulty": stats["topic_difficulty"],
+        "length_problems": length_problems,
+        "quality_problems": quality_problems,
+        "irrelevant": irrelevant
+    }
+
+def merge_results(results):
+    """Führt Teilergebnisse deterministisch zusammen (Reihenfolge wie im Original)."""
+    merged = {
+        "total_single_correct": 0,
+        "longest_is_correct": 0,
+        "position_counts": Counter(),
+        "topic_difficulty": {}
+    }
+    lists = {"multi_select": [], "length_problems": [], "quality_problems": [], "irrelevant": []}
+
+    for result in sorted(results, key=lambda r: r["first_index"]):
+        merged["total_single_correct"] += result["total_single_correct"]
+        merged["longest_is_correct"] += result["longest_is_correct"]
+        merged["position_counts"].update(result["position_counts"])
+        for key in lists:
+            lists[key].extend(result[key])
+        for topic, counts in result["topic_difficulty"].items():
+            target = merged["topic_difficulty"].setdefault(topic, {"easy": 0, "medium": 0, "hard": 0})
+            for level, count in counts.items():
+                target[level] = target.get(level, 0) + count
+
+    for key, items in lists.items():
+        merged[key] = [item for _, item in sorted(items, key=lambda x: x[0])]
+
+    # Wie analyze_length: größte Längen-Differenz zuerst
+    merged["length_problems"].sort(key=lambda x: x["diff"], reverse=True)
+    return merged
+
+def run_parallel(mc_questions, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, by_topic=False):
+    """Analysiert alle MC-Fragen, bei workers > 1 in einem Process-Pool."""
+    if by_topic:
+        partitions = partition_by_topic(mc_questions)
+    else:
+        partitions = partition_chunks(mc_questions, chunk_size)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(partitions) <= 1:
+        results = [analyze_chunk(p) for p in partitions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(analyze_chunk, partitions))
+
+    return merge_results(results)
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallele Qualitätsanalyse der MC-Fragen")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Fragen pro Teilauftrag")
+    parser.add_argument("--by-topic", action="store_true", help="Nach topicId statt in Blöcken aufteilen")
+    parser.add_argument("--json", help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    data = load_questions()
+    report = run_parallel(data["mcQuestions"], args.workers, args.chunk_size, args.by_topic)
+
+    print_pattern_report(report)
+
+    print(f"\nFragen mit signifikant längerer richtiger Antwort: {len(report['length_problems'])}")
+    print(f"Problematische Fragen (Deep Quality Check): {len(report['quality_problems'])}")
+    for p in report["quality_problems"][:10]:
+        print(f"  - {p['id']}: {p['issues']}")
+    print(f"Irrelevante Methodik-Fragen: {len(report['irrelevant'])}")
+    for p in report["irrelevant"][:5]:
+        print(f"  - {p['id']}: {p['stem'][:60]}...")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({**report, "position_counts": dict(report["position_counts"])},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\nGespeichert: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Kompaktes Speichermodell für die Fragen-Datenbank (Topic, Question, Option, Source).
+
+1. Feste Felder liegen in __slots__ statt in einem Dict pro Frage/Option
+2. Oft wiederholte Werte (topicName, difficulty, sourceLabel, ...) werden mit
+   sys.intern nur einmal gespeichert; die Schlüsselreihenfolge eines Eintrags ist
+   ein Tupel, das sich alle Einträge mit gleicher Reihenfolge teilen
+3. Lange Texte (stem, explanation, modelAnswer, Optionstexte, keyPoints) liegen als
+   UTF-8-Bytes vor und werden beim Zugriff dekodiert. Ein einziges Emoji (💡 in den
+   Erklärungen) lässt Python sonst 4 Bytes pro Zeichen für den ganzen Text belegen
+4. Listen werden als Tupel gehalten, Listen von Objekten (options, sources) als
+   Tupel von Option/Source
+5. Verlustfrei: to_dict() liefert dieselben Schlüssel in derselben Reihenfolge
+   und dieselben Werte wie die JSON-Datei; unbekannte Schlüssel landen in extra
+
+Fehlende Felder sind ungesetzte Slots und lesen sich als None. Die Pipeline-Passes
+arbeiten weiter auf Dicts; das Modell ist für große Datenbanken gedacht, die
+gelesen und ausgewertet, aber nicht als Dict-Baum gehalten werden sollen.
+
+Aufruf:
+    python question_model.py               # Speicher Dict vs. Modell für questions.json
+    python question_model.py --scale 200   # dasselbe für eine 200-fach vergrößerte Datenbank
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from bank_stream import iter_bank
+
+DATA_DIR = Path(__file__).parent
+
+# Marker für ungesetzte Slots (None ist ein gültiger JSON-Wert)
+MISSING = object()
+
+# Geteilte Schlüsselreihenfolgen: Tupel -> dasselbe Tupel
+KEY_ORDERS = {}
+
+def shared_keys(keys):
+    keys = tuple(sys.intern(key) for key in keys)
+    return KEY_ORDERS.setdefault(keys, keys)
+
+def slot_names(fields, packed=()):
+    """Slots zu FIELDS; UTF-8-Felder bekommen einen _-Slot hinter einer Property."""
+    return tuple(f"_{attr}" if key in packed else attr for key, attr in fields.items())
+
+def pack(value):
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    if isinstance(value, tuple) and all(isinstance(item, str) for item in value):
+        return tuple(item.encode('utf-8') for item in value)
+    return value
+
+def unpack(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    if isinstance(value, tuple) and value and all(isinstance(item, bytes) for item in value):
+        return tuple(item.decode('utf-8') for item in value)
+    return value
+
+def packed_property(descriptor):
+    """Property über einem UTF-8-Slot: liest und schreibt str, speichert bytes."""
+    return property(lambda self: unpack(descriptor.__get__(self)),
+                    lambda self, value: descriptor.__set__(self, pack(value)),
+                    descriptor.__delete__)
+
+def slot_value(record, attr):
+    """Wert eines Slots oder MISSING (ohne den None-Fallback von __getattr__)."""
+    try:
+        return getattr(type(record), attr).__get__(record)
+    except AttributeError:
+        return MISSING
+
+class Record:
+    """Basis: JSON-Objekt mit festen Feldern in Slots."""
+    __slots__ = ("_keys", "_extra")
+
+    # JSON-Schlüssel -> Attribut
+    FIELDS = {}
+    # JSON-Schlüssel -> Record-Klasse für Listen von Objekten
+    NESTED = {}
+    # JSON-Schlüssel, deren Texte (bzw. Listen von Texten) interniert werden
+    INTERNED = frozenset()
+    # JSON-Schlüssel, deren Texte als UTF-8 gehalten werden
+    PACKED = frozenset()
+    ATTRS = frozenset()
+
+    def __init_subclass__(cls):
+        cls.ATTRS = frozenset(cls.FIELDS.values())
+        for key in cls.PACKED:
+            attr = cls.FIELDS[key]
+            setattr(cls, attr, packed_property(cls.__dict__[f"_{attr}"]))
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            attr = cls.FIELDS.get(key)
+            if attr is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                setattr(record, attr, cls.load_value(key, value))
+        record._keys = shared_keys(data)
+        record._extra = extra
+        return record
+
+    @classmethod
+    def load_value(cls, key, value):
+        if isinstance(value, str):
+            return sys.intern(value) if key in cls.INTERNED else value
+        if not isinstance(value, list):
+            return value
+        if key in cls.NESTED and all(isinstance(item, dict) for item in value):
+            return tuple(cls.NESTED[key].from_dict(item) for item in value)
+        if all(isinstance(item, (str, int, float, bool)) or item is None for item in value):
+            if key in cls.INTERNED:
+                return tuple(sys.intern(item) if isinstance(item, str) else item for item in value)
+            return tuple(value)
+        return value
+
+    def to_dict(self):
+        """Das JSON-Objekt (gleiche Schlüssel und Reihenfolge wie beim Laden)."""
+        result = {}
+        for key in self._keys:
+            attr = self.FIELDS.get(key)
+            value = self._extra[key] if attr is None else slot_value(self, attr)
+            if value is not MISSING:
+                result[key] = dump_value(value)
+        # Nachträglich gesetzte Felder hinten anhängen
+        for key, attr in self.FIELDS.items():
+            if key not in result and key not in self._keys:
+                value = slot_value(self, attr)
+                if value is not MISSING:
+                    result[key] = dump_value(value)
+        return result
+
+    def __getattr__(self, name):
+        # Wird nur für ungesetzte Slots bzw. unbekannte Namen aufgerufen
+        if name in type(self).ATTRS:
+            return None
+        raise AttributeError(name)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        name = slot_value(self, "id")
+        if name is MISSING:
+            name = slot_value(self, "text")
+        return f"{type(self).__name__}({name!r})"
+
+def dump_value(value):
+    if isinstance(value, (tuple, list)):
+        return [item.to_dict() if isinstance(item, Record) else item for item in value]
+    return value
+
+class Option(Record):
+    FIELDS = {"text": "text", "correct": "correct"}
+    PACKED = frozenset({"text"})
+    __slots__ = slot_names(FIELDS, PACKED)
+
+class Source(Record):
+    FIELDS = {"handout": "handout", "page": "page", "score": "score"}
+    INTERNED = frozenset({"handout"})
+    __slots__ = slot_names(FIELDS)
+
+class Topic(Record):
+    FIELDS = {
+        "id": "id",
+        "name": "name",
+        "keyPapers": "key_papers",
+        "keyConcepts": "key_concepts",
+        "focusFromImpulse": "focus_from_impulse",
+    }
+    INTERNED = frozenset({"name", "keyPapers"})
+    __slots__ = slot_names(FIELDS)
+
+class Question(Record):
+    """MC- oder offene Frage (offene Fragen haben modelAnswer/keyPoints statt options)."""
+    FIELDS = {
+        "id": "id",
+        "difficulty": "difficulty",
+        "stem": "stem",
+        "options": "options",
+        "modelAnswer": "model_answer",
+        "keyPoints": "key_points",
+        "note": "note",
+        "source": "source",
+        "explanation": "explanation",
+        "topicId": "topic_id",
+        "topicName": "topic_name",
+        "questionType": "question_type",
+        "isOriginal": "is_original",
+        "isMultiSelect": "is_multi_select",
+        "sourceType": "source_type",
+        "sourceLabel": "source_label",
+        "explanationRefs": "explanation_refs",
+        "sources": "sources",
+        "itemStats": "item_stats",
+        "authoredDifficulty": "authored_difficulty",
+    }
+    NESTED = {"options": Option, "sources": Source}
+    INTERNED = frozenset({"difficulty", "source", "topicName", "questionType", "sourceType",
+                          "sourceLabel", "explanationRefs", "authoredDifficulty"})
+    PACKED = frozenset({"stem", "modelAnswer", "keyPoints", "note", "explanation"})
+    __slots__ = slot_names(FIELDS, PACKED)
+
+# Top-Level-Listen der Datenbank, die als Modell gehalten werden
+RECORD_TYPES = {"topics": Topic, "mcQuestions": Question, "openQuestions": Question}
+
+def bank_from_dict(data):
+    """Datenbank-Dict -> Dict mit Topic-/Question-Listen (metadata usw. bleiben Dicts)."""
+    return {key: [RECORD_TYPES[key].from_dict(item) for item in value] if key in RECORD_TYPES else value
+            for key, value in data.items()}
+
+def bank_to_dict(bank):
+    return {key: [item.to_dict() for item in value] if key in RECORD_TYPES else value
+            for key, value in bank.items()}
+
+def load_bank_model(path=None):
+    """Liest questions.json Frage für Frage (bank_stream) direkt ins Modell."""
+    bank = {}
+    for kind, key, value in iter_bank(path):
+        if kind == "array":
+            bank[key] = []
+        elif kind == "item":
+            bank[key].append(RECORD_TYPES[key].from_dict(value) if key in RECORD_TYPES else value)
+        else:
+            bank[key] = bank_from_dict({key: value})[key]
+    return bank
+
+def scaled_bank(data, factor):
+    """Vervielfacht die Fragen (mit eindeutigen IDs) für Speichermessungen."""
+    scaled = dict(data)
+    for key in ("mcQuestions", "openQuestions"):
+        scaled[key] = [{**q, "id": f"{q['id']}_{i}"} for i in range(factor) for q in data[key]]
+    return scaled
+
+def measure(load):
+    """Belegter Speicher (Bytes) nach load(), solange das Ergebnis lebt."""
+    tracemalloc.start()
+    result = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    parser = argparse.ArgumentParser(description="Speicherbedarf Dict vs. Slots-Modell")
+    parser.add_argument("--scale", type=int, default=1, help="Fragen so oft vervielfachen")
+    args = parser.parse_args()
+
+    path = DATA_DIR / "questions.json"
+    temp = None
+    if args.scale > 1:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = scaled_bank(json.load(f), args.scale)
+        fd, temp = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        path = Path(temp)
+        del data
+
+    try:
+        def load_dict():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        data, dict_size = measure(load_dict)
+        bank, model_size = measure(lambda: load_bank_model(path))
+    finally:
+        if temp:
+            os.remove(temp)
+
+    n = len(data["mcQuestions"]) + len(data["openQuestions"])
+    print(f"Fragen: {n}")
+    print(f"  Dicts:  {dict_size / 1024 / 1024:8.1f} MB ({dict_size / n:,.0f} Bytes pro Frage)")
+    print(f"  Modell: {model_size / 1024 / 1024:8.1f} MB ({model_size / n:,.0f} Bytes pro Frage)")
+    print(f"  Ersparnis: {1 - model_size / dict_size:.0%}")
+
+    roundtrip = bank_to_dict(bank)
+    same = json.dumps(roundtrip, ensure_ascii=False, indent=2) == json.dumps(data, ensure_ascii=False, indent=2)
+    print(f"Verlustfrei (gleiches JSON): {'ja' if same else 'NEIN'}")
+    if not same:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Kompiliert Regel-Tabellen (PROBLEM_PATTERNS, IRRELEVANT_PATTERNS, AWKWARD_PHRASES)
+einmalig zu einer Regel-Engine.
+
+Aus jeder Regel wird ein Literal ("Anker") extrahiert, das jeder Treffer der
+Regel enthalten muss, z.B. "laborexperiment" aus r'laborexperiment.*verwendet'.
+Alle Anker zusammen bilden einen einzigen Ausdruck (Alternation). Pro Text wird
+der klein geschriebene Text damit genau einmal von links nach rechts durchsucht;
+nur an Trefferstellen wird nachgesehen, welche Anker dort beginnen. Regeln ohne
+brauchbaren Anker stecken gemeinsam in einem zweiten kombinierten Ausdruck.
+Der Aufwand pro Text hängt damit nicht mehr von der Anzahl der Regeln ab.
+
+Nur die Kandidaten-Regeln laufen danach mit ihrem eigenen Ausdruck – bei fast
+allen Texten also keine. Die Ergebnisse sind identisch mit einer Schleife über
+alle Regeln (siehe tests/test_rule_engine.py).
+"""
+
+import re
+
+from instrumentation import is_enabled, rule_hit
+
+QUANTIFIERS = "*?{"
+LITERAL_ESCAPES = set(" -,.:;!\"'/#&%<>=_@~`")
+MIN_ANCHOR_LENGTH = 3
+
+def literal_anchor(pattern):
+    """Längstes Literal-Stück, das jeder Treffer enthalten muss ('' wenn unbekannt)."""
+    if any(c in pattern for c in "|()[]"):
+        return ""
+
+    runs = []
+    current = ""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped in LITERAL_ESCAPES or escaped == "\\":
+                char = escaped
+            else:
+                # Zeichenklasse wie \s oder \d beendet das Literal
+                runs.append(current)
+                current = ""
+                if i < len(pattern) and pattern[i] in QUANTIFIERS + "+":
+                    i += 1
+                continue
+        elif c in ".^$":
+            runs.append(current)
+            current = ""
+            i += 1
+            if i < len(pattern) and pattern[i] in QUANTIFIERS + "+":
+                i += 1
+            continue
+        elif c in QUANTIFIERS + "+":
+            # Quantor bezieht sich auf das letzte Zeichen: bei * ? {..} ist es optional
+            if c != "+":
+                current = current[:-1]
+            runs.append(current)
+            current = ""
+            i += 1
+            if c == "{":
+                while i < len(pattern) and pattern[i] != "}":
+                    i += 1
+                i += 1
+            continue
+        else:
+            char = c
+            i += 1
+        current += char
+    runs.append(current)
+
+    anchor = max(runs, key=len)
+    return anchor.lower() if len(anchor) >= MIN_ANCHOR_LENGTH else ""
+
+def build_trie(words):
+    """Trie der Literale; "" markiert das Ende eines Literals."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = word
+    return trie
+
+def trie_pattern(node):
+    """Regex für die Literale eines Tries (gemeinsame Präfixe nur einmal).
+
+    Eine flache Alternation probiert an jeder Textstelle jedes Literal einzeln;
+    als Trie hängt der Aufwand pro Stelle nur von Alphabet und Ankerlänge ab.
+    """
+    if "" in node:
+        # Hier endet ein Literal: längere beginnen an derselben Stelle und
+        # werden beim Ablaufen des Tries gefunden
+        return ""
+    branches = [re.escape(char) + trie_pattern(child) for char, child in sorted(node.items())]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+def anchors_at(trie, text, start):
+    """Alle Literale des Tries, die in text an Position start beginnen."""
+    node = trie
+    for char in text[start:]:
+        node = node.get(char)
+        if node is None:
+            return
+        if "" in node:
+            yield node[""]
+
+def group_name(index):
+    return f"r{index}"
+
+def compile_matcher(patterns, flags=re.IGNORECASE, name="regeln"):
+    """Kompiliert Regeln zu einer Engine mit Ein-Durchlauf-Vorfilter."""
+    patterns = list(patterns)
+    anchors = [literal_anchor(p) for p in patterns]
+
+    # Anker -> Regeln; der Trie liefert an einer Trefferstelle alle dort beginnenden Anker
+    by_anchor = {}
+    for index, anchor in enumerate(anchors):
+        if anchor:
+            by_anchor.setdefault(anchor, []).append(index)
+    trie = build_trie(by_anchor)
+    prefilter = re.compile(trie_pattern(trie)) if by_anchor else None
+
+    # Regeln ohne Anker: ein gemeinsamer Ausdruck, Lookahead erlaubt überlappende Treffer
+    unanchored = [i for i, anchor in enumerate(anchors) if not anchor]
+    fallback = None
+    if unanchored:
+        combined = "|".join(f"(?P<{group_name(i)}>{patterns[i]})" for i in unanchored)
+        fallback = re.compile(f"(?=(?:{combined}))", flags)
+
+    return {
+        "name": name,
+        "patterns": patterns,
+        "anchors": anchors,
+        "rules": [re.compile(p, flags) for p in patterns],
+        "byAnchor": by_anchor,
+        "trie": trie,
+        "prefilter": prefilter,
+        "unanchored": unanchored,
+        "fallback": fallback,
+    }
+
+def anchored_candidates(engine, text):
+    """Regeln, deren Anker im Text vorkommt – ein Durchlauf über den Text."""
+    prefilter = engine["prefilter"]
+    if prefilter is None:
+        return set()
+    lowered = text.lower()
+    trie = engine["trie"]
+    remaining = len(engine["byAnchor"])
+    found = set()
+    position = 0
+    while remaining:
+        m = prefilter.search(lowered, position)
+        if m is None:
+            break
+        start = m.start()
+        # Alle Anker, die hier beginnen (auch längere als der gefundene)
+        for anchor in anchors_at(trie, lowered, start):
+            if anchor not in found:
+                found.add(anchor)
+                remaining -= 1
+        position = start + 1
+    return {index for anchor in found for index in engine["byAnchor"][anchor]}
+
+def unanchored_candidates(engine, text):
+    """Regeln ohne Anker, die im Text treffen – ein Durchlauf mit dem kombinierten Ausdruck."""
+    fallback = engine["fallback"]
+    if fallback is None:
+        return set()
+    rules = engine["rules"]
+    unanchored = engine["unanchored"]
+    fired = set()
+    for m in fallback.finditer(text):
+        index = int(m.lastgroup[1:])
+        fired.add(index)
+        # Nur an Trefferstellen: spätere Regeln, die an derselben Stelle beginnen
+        for other in unanchored[unanchored.index(index) + 1:]:
+            if other not in fired and rules[other].match(text, m.start()):
+                fired.add(other)
+        if len(fired) == len(unanchored):
+            break
+    return fired
+
+def candidate_rules(engine, text, start=0):
+    """Indizes der Regeln ab start, die im Text treffen können (aufsteigend)."""
+    candidates = anchored_candidates(engine, text) | unanchored_candidates(engine, text)
+    return sorted(i for i in candidates if i >= start)
+
+def find_hits(engine, text):
+    """Gibt alle Treffer als Liste von (Regel-Index, Position, Treffer-Text) zurück."""
+    hits = []
+    for index in candidate_rules(engine, text):
+        for m in engine["rules"][index].finditer(text):
+            hits.append((index, m.start(), m.group(0)))
+    hits.sort(key=lambda hit: (hit[1], hit[0]))
+    return hits
+
+def record_hits(engine, indices):
+    """Meldet gefeuerte Regeln an die Messschicht (nur wenn aktiviert)."""
+    if is_enabled():
+        for index in indices:
+            rule_hit(engine["name"], engine["patterns"][index])
+
+def fired_rules(engine, text):
+    """Indizes aller Regeln, die im Text mindestens einmal treffen (aufsteigend)."""
+    fired = [i for i in candidate_rules(engine, text) if engine["rules"][i].search(text)]
+    record_hits(engine, fired)
+    return fired
+
+def matches_any(engine, text):
+    """True, sobald irgendeine Regel trifft."""
+    for index in candidate_rules(engine, text):
+        if engine["rules"][index].search(text):
+            record_hits(engine, [index])
+            return True
+    return False
+
+def compile_replacer(rules, flags=0, name="ersetzungen"):
+    """Kompiliert (pattern, replacement)-Paare zu einer Engine für replace_all."""
+    engine = compile_matcher([p for p, _ in rules], flags, name)
+    engine["replacements"] = [r for _, r in rules]
+    return engine
+
+def replace_all(engine, text):
+    """Wendet alle Ersetzungen in Regel-Reihenfolge an (wie einzelne re.sub-Aufrufe).
+
+    Gibt (neuer Text, Liste der gefeuerten Regel-Indizes) zurück.
+    """
+    fired = []
+    candidates = candidate_rules(engine, text)
+    position = 0
+    while position < len(candidates):
+        index = candidates[position]
+        position += 1
+        text, count = engine["rules"][index].subn(engine["replacements"][index], text)
+        if count:
+            fired.append(index)
+            # Eine Ersetzung kann neue Treffer für spätere Regeln erzeugen
+            candidates = candidates[:position] + candidate_rules(engine, text, index + 1)
+    record_hits(engine, fired)
+    return text, fired
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Schema-Validierung für die Topic-Dateien und die kombinierte Fragen-Datenbank.
+
+Die Schemas unten sind einfache Dicts. compile_schema() übersetzt ein Schema
+einmal in verschachtelte Prüffunktionen (Closures), damit beim Prüfen nicht für
+jede Frage erneut das Schema interpretiert werden muss; große Banken werden so
+in einem Durchlauf geprüft.
+
+Geprüft wird u.a.:
+- Pflichtfelder und Typen (Topic, Fragen, Optionen)
+- Optionslisten sind nicht leer, jede MC-Frage hat mindestens eine richtige Option
+- isMultiSelect (falls gesetzt) passt zur Anzahl richtiger Optionen
+- Fragen-IDs sind eindeutig (auch über Topic-Dateien hinweg)
+
+Ergebnisse pro Topic-Datei werden unter dem Content-Hash der Datei in
+.build/validation_cache.json gespeichert; Dateien mit bekanntem Inhalt werden
+beim nächsten Lauf übersprungen. Ändert sich ein Schema, wird der Cache verworfen.
+
+Aufruf:
+    python schema_validation.py              # Topic-Dateien + questions.json prüfen
+    python schema_validation.py --force      # Cache ignorieren
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from instrumentation import count, instrumented
+
+DATA_DIR = Path(__file__).parent
+BUILD_DIR = DATA_DIR / ".build"
+CACHE_PATH = BUILD_DIR / "validation_cache.json"
+VALIDATOR_VERSION = 2
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+STRING = {"type": "string"}
+TEXT = {"type": "string", "minLength": 1}
+BOOL = {"type": "bool"}
+INT = {"type": "int"}
+STRING_LIST = {"type": "array", "items": STRING}
+QUESTION_ID = {"type": "string", "minLength": 1, "collect": "ids"}
+
+OPTION = {
+    "type": "object",
+    "required": {"text": TEXT, "correct": BOOL}
+}
+
+MC_QUESTION = {
+    "type": "object",
+    "required": {
+        "id": QUESTION_ID,
+        "stem": TEXT,
+        "options": {"type": "array", "minItems": 1, "items": OPTION}
+    },
+    "optional": {
+        "explanation": STRING,
+        "difficulty": {"enum": DIFFICULTIES},
+        "isMultiSelect": BOOL
+    },
+    "checks": ["correct_option", "multi_select"]
+}
+
+OPEN_QUESTION = {
+    "type": "object",
+    "required": {"id": QUESTION_ID, "stem": TEXT, "modelAnswer": TEXT},
+    "optional": {"keyPoints": STRING_LIST, "difficulty": {"enum": DIFFICULTIES}}
+}
+
+TOPIC_FILE = {
+    "type": "object",
+    "required": {
+        "topic": {
+            "type": "object",
+            "required": {"id": INT, "name": TEXT},
+            "optional": {"keyPapers": STRING_LIST, "keyConcepts": STRING_LIST, "focusFromImpulse": STRING}
+        },
+        "questions": {
+            "type": "object",
+            "optional": {
+                "mc_existing": {"type": "array", "items": MC_QUESTION},
+                "mc_generated": {"type": "array", "items": MC_QUESTION},
+                "open_existing": {"type": "array", "items": OPEN_QUESTION},
+                "open_generated": {"type": "array", "items": OPEN_QUESTION}
+            }
+        }
+    }
+}
+
+def with_topic(schema):
+    """Fragen in der kombinierten Bank tragen zusätzlich topicId."""
+    return {**schema, "required": {**schema["required"], "topicId": INT}}
+
+BANK = {
+    "type": "object",
+    "required": {
+        "metadata": {"type": "object"},
+        "topics": {"type": "array", "items": {"type": "object", "required": {"id": INT, "name": TEXT}}},
+        "mcQuestions": {"type": "array", "items": with_topic(MC_QUESTION)},
+        "openQuestions": {"type": "array", "items": with_topic(OPEN_QUESTION)}
+    },
+    "optional": {"explanationBlocks": {"type": "object"}}
+}
+
+def format_path(path):
+    """Pfade werden als (Eltern-Pfad, Schlüssel) weitergereicht und nur für Fehlermeldungen formatiert."""
+    parts = []
+    while isinstance(path, tuple):
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return path + "".join(reversed(parts))
+
+# Inhaltliche Prüfungen, die über einzelne Felder hinausgehen: (Wert, Pfad, Fehlerliste)
+def check_correct_option(q, path, errors):
+    options = q.get("options")
+    if isinstance(options, list) and options and not any(
+            isinstance(opt, dict) and opt.get("correct") is True for opt in options):
+        errors.append(f"{format_path(path)}: keine richtige Option")
+
+def check_multi_select(q, path, errors):
+    options = q.get("options")
+    if "isMultiSelect" not in q or not isinstance(options, list):
+        return
+    correct = sum(1 for opt in options if isinstance(opt, dict) and opt.get("correct") is True)
+    if bool(q["isMultiSelect"]) != (correct > 1):
+        errors.append(f"{format_path(path)}: isMultiSelect={q['isMultiSelect']}, aber {correct} richtige Option(en)")
+
+CHECKS = {
+    "correct_option": check_correct_option,
+    "multi_select": check_multi_select,
+}
+
+TYPES = {
+    "string": (str, "Text"),
+    "bool": (bool, "true/false"),
+    "int": (int, "Ganzzahl"),
+    "array": (list, "Liste"),
+    "object": (dict, "Objekt"),
+}
+
+def compile_guard(schema):
+    """Typ- und Wertebereichsprüfung eines Knotens: Funktion value -> Fehlertext oder None."""
+    if "enum" in schema:
+        allowed = set(schema["enum"])
+        names = ", ".join(schema["enum"])
+        # Listen/Objekte sind nicht hashbar; sie sind ohnehin nie erlaubt
+        return lambda value: (None if isinstance(value, str) and value in allowed
+                              else f"'{value}' nicht erlaubt ({names})")
+    if "type" not in schema:
+        return None
+
+    expected, label = TYPES[schema["type"]]
+    if schema["type"] == "int":
+        # bool ist in Python ein int, zählt hier aber nicht als Ganzzahl
+        return lambda value: (None if isinstance(value, int) and not isinstance(value, bool)
+                              else f"{label} erwartet, {type(value).__name__} gefunden")
+    return lambda value: None if isinstance(value, expected) else f"{label} erwartet, {type(value).__name__} gefunden"
+
+def compile_schema(schema):
+    """Übersetzt ein Schema in eine Funktion check(value, path, ctx).
+
+    ctx enthält "errors" (Liste von Meldungen) und gesammelte Werte (z.B. "ids").
+    Jeder Knoten wird nur mit den Schritten gebaut, die sein Schema braucht.
+    """
+    guard = compile_guard(schema)
+    steps = []
+
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+
+        def check_length(value, path, ctx):
+            if len(value) < min_length or len(value.strip()) < min_length:
+                ctx["errors"].append(f"{format_path(path)}: darf nicht leer sein")
+        steps.append(check_length)
+
+    if "minItems" in schema:
+        min_items = schema["minItems"]
+
+        def check_items_count(value, path, ctx):
+            if len(value) < min_items:
+                ctx["errors"].append(f"{format_path(path)}: mindestens {min_items} Einträge erwartet")
+        steps.append(check_items_count)
+
+    if "items" in schema:
+        check_item = compile_schema(schema["items"])
+
+        def check_items(value, path, ctx):
+            for i, item in enumerate(value):
+                check_item(item, (path, i), ctx)
+        steps.append(check_items)
+
+    if "required" in schema or "optional" in schema:
+        required = [(key, compile_schema(sub)) for key, sub in schema.get("required", {}).items()]
+        optional = [(key, compile_schema(sub)) for key, sub in schema.get("optional", {}).items()]
+
+        def check_fields(value, path, ctx):
+            for key, check in required:
+                if key in value:
+                    check(value[key], (path, key), ctx)
+                else:
+                    ctx["errors"].append(f"{format_path(path)}: Pflichtfeld '{key}' fehlt")
+            for key, check in optional:
+                if key in value:
+                    check(value[key], (path, key), ctx)
+        steps.append(check_fields)
+
+    for name in schema.get("checks", []):
+        semantic = CHECKS[name]
+        steps.append(lambda value, path, ctx, semantic=semantic: semantic(value, path, ctx["errors"]))
+
+    if "collect" in schema:
+        bucket = schema["collect"]
+        steps.append(lambda value, path, ctx: ctx.setdefault(bucket, []).append((value, path)))
+
+    if guard is None:
+        def check(value, path, ctx):
+            for step in steps:
+                step(value, path, ctx)
+    elif not steps:
+        def check(value, path, ctx):
+            error = guard(value)
+            if error:
+                ctx["errors"].append(f"{format_path(path)}: {error}")
+    elif len(steps) == 1:
+        step = steps[0]
+
+        def check(value, path, ctx):
+            error = guard(value)
+            if error:
+                ctx["errors"].append(f"{format_path(path)}: {error}")
+            else:
+                step(value, path, ctx)
+    else:
+        def check(value, path, ctx):
+            error = guard(value)
+            if error:
+                ctx["errors"].append(f"{format_path(path)}: {error}")
+                return
+            for step in steps:
+                step(value, path, ctx)
+    return check
+
+def schema_fingerprint(schema):
+    """Hash über Schema und Validator-Version (für den Cache)."""
+    text = json.dumps({"version": VALIDATOR_VERSION, "schema": schema}, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+def duplicate_ids(collected):
+    """Meldungen für mehrfach vergebene IDs aus einer Liste von (id, Pfad)."""
+    first_seen = {}
+    errors = []
+    for qid, path in collected:
+        if qid in first_seen:
+            errors.append(f"{format_path(path)}: ID '{qid}' bereits vergeben ({format_path(first_seen[qid])})")
+        else:
+            first_seen[qid] = path
+    return errors
+
+def validate(check, value, name):
+    """Prüft einen Wert mit einem kompilierten Validator: (Fehler, gesammelte IDs)."""
+    ctx = {"errors": []}
+    check(value, name, ctx)
+    ids = ctx.get("ids", [])
+    return ctx["errors"] + duplicate_ids(ids), [qid for qid, _ in ids]
+
+# Einmal beim Import kompiliert
+TOPIC_VALIDATOR = compile_schema(TOPIC_FILE)
+BANK_VALIDATOR = compile_schema(BANK)
+
+def load_cache(fingerprint):
+    if not CACHE_PATH.exists():
+        return {}
+    with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    return cache["files"] if cache.get("schema") == fingerprint else {}
+
+def save_cache(fingerprint, files):
+    BUILD_DIR.mkdir(exist_ok=True)
+    with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump({"schema": fingerprint, "files": files}, f, ensure_ascii=False)
+
+def topic_validation_cache(force=False):
+    """(Schema-Fingerprint, Cache Content-Hash -> Ergebnis) für die Topic-Dateien."""
+    fingerprint = schema_fingerprint(TOPIC_FILE)
+    return fingerprint, {} if force else load_cache(fingerprint)
+
+def validate_topic_content(content, cached):
+    """Prüft den Inhalt (bytes) einer Topic-Datei: (Content-Hash, Ergebnis, neu geprüft?).
+
+    Hängt nur vom Inhalt ab und kann deshalb parallel zum Lesen laufen.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    entry = cached.get(digest)
+    if entry is not None:
+        return digest, entry, False
+    # Meldungen ohne Dateinamen speichern, damit der Eintrag nur vom Inhalt abhängt
+    # Topic-Dateien sind UTF-8 (read_json liest sie so); json.loads(bytes) nähme auch UTF-16
+    try:
+        file_errors, file_ids = validate(TOPIC_VALIDATOR, json.loads(content.decode('utf-8')), "")
+    except UnicodeDecodeError as e:
+        file_errors, file_ids = [f": kein gültiges UTF-8 ({e})"], []
+    except json.JSONDecodeError as e:
+        file_errors, file_ids = [f": kein gültiges JSON ({e})"], []
+    return digest, {"errors": file_errors, "ids": file_ids}, True
+
+def collect_topic_results(fingerprint, names, results):
+    """Fehler aller Topic-Dateien (inkl. doppelter IDs) aus den Einzelergebnissen; speichert den Cache."""
+    files = {}
+    errors = []
+    ids = []
+    checked = []
+    for name, (digest, entry, was_checked) in zip(names, results):
+        if was_checked:
+            checked.append(name)
+            count("geprüfte dateien")
+        files[digest] = entry
+        errors += [name + error for error in entry["errors"]]
+        ids += [(qid, name) for qid in entry["ids"]]
+
+    save_cache(fingerprint, files)
+    return errors + duplicate_ids(ids), checked
+
+@instrumented()
+def validate_topic_files(paths, force=False):
+    """Prüft Topic-Dateien (mit Cache nach Content-Hash); gibt (Fehler, geprüfte Dateien) zurück."""
+    fingerprint, cached = topic_validation_cache(force)
+    results = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            results.append(validate_topic_content(f.read(), cached))
+    return collect_topic_results(fingerprint, [path.name for path in paths], results)
+
+@instrumented()
+def validate_bank(data):
+    """Prüft die kombinierte Fragen-Datenbank (im Speicher) in einem Durchlauf."""
+    errors, _ = validate(BANK_VALIDATOR, data, "questions.json")
+    return errors
+
+def ensure_valid(errors, what):
+    """Bricht mit einer lesbaren Meldung ab, wenn die Prüfung Fehler gefunden hat."""
+    if errors:
+        shown = "\n  ".join(errors[:20])
+        more = f"\n  ... und {len(errors) - 20} weitere" if len(errors) > 20 else ""
+        raise ValueError(f"{what} ungültig ({len(errors)} Fehler):\n  {shown}{more}")
+
+def main():
+    import combine_questions
+
+    parser = argparse.ArgumentParser(description="Topic-Dateien und questions.json gegen das Schema prüfen")
+    parser.add_argument("--force", action="store_true", help="Validierungs-Cache ignorieren")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = combine_questions.find_topic_files()
+    topic_errors, checked = validate_topic_files(paths, force=args.force)
+    print(f"Topic-Dateien: {len(paths)} ({len(checked)} geprüft, {len(paths) - len(checked)} aus dem Cache)")
+
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        bank_errors = validate_bank(json.load(f))
+    print(f"questions.json geprüft ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    for error in topic_errors + bank_errors:
+        print(f"  ✗ {error}")
+    if topic_errors or bank_errors:
+        sys.exit(1)
+    print("Keine Fehler gefunden")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Baut einen invertierten Suchindex über alle Fragen für die Suche im Frontend.
+
+1. Zerlegt Fragestamm, Antwortoptionen, Erklärung (bzw. Musterlösung und
+   Kernpunkte bei offenen Fragen) in Tokens
+2. Normalisiert: Kleinschreibung, Umlaut-Faltung (ä -> ae, ß -> ss),
+   Stoppwörter raus, einfaches Suffix-Stemming
+3. Gewichtet Treffer nach Feld (Stamm zählt mehr als Erklärung) und TF-IDF
+4. Speichert kompakt: Begriff -> [Dokument, Gewicht, Dokument, Gewicht, ...]
+
+Die Normalisierung muss mit normalizeSearchTerms() in js/data.js übereinstimmen.
+Geteilte Erklärungsblöcke (explanationBlocks) werden nicht indexiert, weil sie
+für alle Fragen eines Themas gleich sind.
+
+Aufruf:
+    python search_index.py                 # Statistik für questions.json
+    python search_index.py "macht vertrauen"   # Testsuche
+"""
+
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent
+INDEX_VERSION = 1
+
+UMLAUTS = {"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"}
+
+# Werden vor dem Stemming (nach der Umlaut-Faltung) entfernt
+STOPWORDS = {
+    "der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "eines", "einem", "einen",
+    "und", "oder", "aber", "als", "auch", "auf", "aus", "bei", "bis", "durch", "fuer", "gegen",
+    "hat", "haben", "ist", "sind", "war", "waren", "wird", "werden", "wurde", "wurden", "kann",
+    "koennen", "im", "in", "ins", "mit", "nach", "nicht", "noch", "nur", "ob", "ohne", "sich",
+    "so", "um", "unter", "vom", "von", "vor", "wie", "was", "welche", "welcher", "welches",
+    "wenn", "zu", "zum", "zur", "am", "an", "es", "er", "sie", "man", "dass", "sehr", "mehr",
+}
+
+# Erster passender Suffix wird abgeschnitten, wenn mindestens 4 Zeichen übrig bleiben
+SUFFIXES = ["ungen", "heiten", "keiten", "ung", "heit", "keit", "lich", "isch",
+            "ern", "em", "en", "er", "es", "e", "s", "n"]
+MIN_STEM_LENGTH = 4
+
+# Feldgewichte: Treffer im Fragestamm zählen dreifach
+FIELD_WEIGHTS = {
+    "stem": 3.0,
+    "options": 1.5,
+    "keyPoints": 1.5,
+    "explanation": 1.0,
+    "modelAnswer": 1.0,
+}
+
+def load_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def fold_umlauts(text):
+    return "".join(UMLAUTS.get(c, c) for c in text)
+
+def stem(token):
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+def normalize_terms(text):
+    """Text -> Liste normalisierter Suchbegriffe (wie normalizeSearchTerms im Frontend)."""
+    tokens = re.findall(r"[a-z0-9]+", fold_umlauts(text.lower()))
+    return [stem(t) for t in tokens if len(t) > 1 and t not in STOPWORDS]
+
+def question_fields(q):
+    """Die indexierten Felder einer MC- oder offenen Frage."""
+    fields = {"stem": q.get("stem", ""), "explanation": q.get("explanation", "")}
+    if "options" in q:
+        fields["options"] = " ".join(opt["text"] for opt in q["options"])
+    if "modelAnswer" in q:
+        fields["modelAnswer"] = q["modelAnswer"]
+        fields["keyPoints"] = " ".join(q.get("keyPoints", []))
+    return fields
+
+def term_weights(q):
+    """Feldgewichtete Termhäufigkeit einer Frage."""
+    weights = {}
+    for field, text in question_fields(q).items():
+        for term in normalize_terms(text):
+            weights[term] = weights.get(term, 0.0) + FIELD_WEIGHTS[field]
+    return weights
+
+def build_search_index(data):
+    """Erzeugt den Index: Dokumentliste plus Postings mit ganzzahligen TF-IDF-Gewichten."""
+    questions = data["mcQuestions"] + data["openQuestions"]
+    doc_terms = [term_weights(q) for q in questions]
+
+    document_frequency = {}
+    for weights in doc_terms:
+        for term in weights:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    n = len(questions)
+    postings = {}
+    for doc, weights in enumerate(doc_terms):
+        for term, tf in weights.items():
+            idf = math.log(1 + n / document_frequency[term])
+            postings.setdefault(term, []).extend([doc, round(100 * (1 + math.log(tf)) * idf)])
+
+    return {
+        "version": INDEX_VERSION,
+        "docs": [q["id"] for q in questions],
+        "topics": [q.get("topicId") for q in questions],
+        "terms": dict(sorted(postings.items()))
+    }
+
+def serialize_index(index):
+    """Kompaktes JSON (ohne Einrückung) – der Index wird nur maschinell gelesen."""
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+def search(index, query, limit=10):
+    """Referenzsuche (wie searchQuestions im Frontend, ohne Präfix-Suche)."""
+    scores = {}
+    for term in set(normalize_terms(query)):
+        posting = index["terms"].get(term, [])
+        for i in range(0, len(posting), 2):
+            scores[posting[i]] = scores.get(posting[i], 0) + posting[i + 1]
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(index["docs"][doc], score) for doc, score in ranked]
+
+def main():
+    data = load_questions()
+    index = build_search_index(data)
+    size = len(serialize_index(index))
+    print(f"Dokumente: {len(index['docs'])}, Begriffe: {len(index['terms'])}, Größe: {size / 1024:.1f} KB")
+
+    query = " ".join(sys.argv[1:])
+    if query:
+        print(f"\nSuche nach '{query}' -> {normalize_terms(query)}")
+        for doc_id, score in search(index, query):
+            print(f"  {score:>6}  {doc_id}")
+
+if __name__ == "__main__":
+    main()
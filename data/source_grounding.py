@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Verknüpft jede Frage mit den Handout-Seiten, aus denen sie vermutlich stammt.
+
+1. Lädt die Seiten aus qa_scripts/handout_topic*.json und normalisiert sie wie
+   der Suchindex (Umlaut-Faltung, Stoppwörter, Stemming; siehe search_index.py)
+2. Baut einmal einen BM25-Index; die BM25-Gewichte pro (Begriff, Seite) werden
+   dabei schon vorberechnet
+3. Pro Frage (Stamm, richtige Antworten, Erklärung bzw. Musterlösung) werden
+   die Gewichte der Suchbegriffe nur noch aufsummiert (np.bincount)
+4. Hängt die besten Seiten mit Score als "sources" an jede MC- und offene Frage
+
+Berücksichtigt werden nur Seiten aus dem Handout des eigenen Themas
+(handout_topicN gehört zu topicId N); Themen ohne Handout bekommen keine Quellen.
+
+Aufruf:
+    python source_grounding.py              # Statistik + Beispiele, ohne zu speichern
+    python pipeline.py --only source_grounding   # Quellen in questions.json schreiben
+"""
+
+import json
+import math
+import re
+from pathlib import Path
+
+import numpy as np
+
+from instrumentation import instrumented
+from search_index import normalize_terms
+
+DATA_DIR = Path(__file__).parent
+HANDOUT_DIR = DATA_DIR.parent / "qa_scripts"
+
+# Übliche BM25-Parameter
+K1 = 1.5
+B = 0.75
+TOP_K = 3
+MIN_SCORE = 1.0
+
+def load_handout_pages(handout_dir=HANDOUT_DIR):
+    """Alle Handout-Seiten als Liste von {handout, topicId, page, text}."""
+    def topic_number(path):
+        match = re.search(r"(\d+)$", path.stem)
+        return int(match.group(1)) if match else 0
+
+    pages = []
+    for path in sorted(handout_dir.glob("handout_topic*.json"), key=topic_number):
+        with open(path, 'r', encoding='utf-8') as f:
+            handout = json.load(f)
+        for page in handout["pages"]:
+            pages.append({
+                "handout": path.stem,
+                "topicId": topic_number(path),
+                "page": page["page"],
+                "text": page["text"]
+            })
+    return pages
+
+def build_bm25_index(pages, k1=K1, b=B):
+    """Begriff -> (Seitenindizes, BM25-Gewichte) als NumPy-Arrays."""
+    page_terms = [normalize_terms(page["text"]) for page in pages]
+    lengths = np.array([len(terms) for terms in page_terms], dtype=np.float64)
+    avg_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+
+    postings = {}
+    for index, terms in enumerate(page_terms):
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((index, tf))
+
+    n = len(pages)
+    index = {}
+    for term, entries in postings.items():
+        idf = math.log(1 + (n - len(entries) + 0.5) / (len(entries) + 0.5))
+        page_ids = np.array([i for i, _ in entries], dtype=np.int64)
+        tf = np.array([t for _, t in entries], dtype=np.float64)
+        norm = k1 * (1 - b + b * lengths[page_ids] / avg_length)
+        index[term] = (page_ids, idf * tf * (k1 + 1) / (tf + norm))
+
+    topics = np.array([page["topicId"] for page in pages], dtype=np.int64)
+    return {"pages": pages, "topics": topics, "terms": index}
+
+def query_text(q):
+    """Suchtext einer Frage: Stamm, richtige Antworten und eigene Erklärung."""
+    parts = [q.get("stem", "")]
+    parts += [opt["text"] for opt in q.get("options", []) if opt["correct"]]
+    parts.append(q.get("modelAnswer", ""))
+    parts += q.get("keyPoints", [])
+    parts.append(q.get("explanation", ""))
+    return " ".join(parts)
+
+def score_pages(index, text):
+    """BM25-Score aller Seiten für einen Suchtext."""
+    n = len(index["pages"])
+    hits = [index["terms"][t] for t in set(normalize_terms(text)) if t in index["terms"]]
+    if not hits:
+        return np.zeros(n)
+    page_ids = np.concatenate([ids for ids, _ in hits])
+    weights = np.concatenate([w for _, w in hits])
+    return np.bincount(page_ids, weights=weights, minlength=n)
+
+def top_sources(index, text, topic_id=None, top_k=TOP_K, min_score=MIN_SCORE):
+    """Die besten Seiten (optional nur eines Themas) als Liste von {handout, page, score}."""
+    scores = score_pages(index, text)
+    if topic_id is not None:
+        scores = np.where(index["topics"] == topic_id, scores, 0.0)
+    if not len(scores):
+        return []
+    k = min(top_k, len(scores))
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.lexsort((best, -scores[best]))]
+    return [
+        {
+            "handout": index["pages"][i]["handout"],
+            "page": index["pages"][i]["page"],
+            "score": round(float(scores[i]), 2)
+        }
+        for i in best if scores[i] >= min_score
+    ]
+
+@instrumented()
+def ground_questions(data, index=None, top_k=TOP_K):
+    """Hängt an jede Frage die passendsten Handout-Seiten an (Feld "sources").
+
+    Fragen ohne passende Seite bekommen kein Feld (ein altes wird entfernt).
+    """
+    index = index or build_bm25_index(load_handout_pages())
+    grounded = 0
+    for key in ("mcQuestions", "openQuestions"):
+        for q in data[key]:
+            sources = top_sources(index, query_text(q), q.get("topicId"), top_k)
+            if sources:
+                q["sources"] = sources
+                grounded += 1
+            else:
+                q.pop("sources", None)
+    return data, grounded
+
+def main():
+    pages = load_handout_pages()
+    index = build_bm25_index(pages)
+    print(f"Handout-Seiten: {len(pages)}, Begriffe: {len(index['terms'])}")
+
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data, grounded = ground_questions(data, index)
+    total = len(data["mcQuestions"]) + len(data["openQuestions"])
+    print(f"Fragen mit Quelle: {grounded}/{total}")
+
+    for q in data["mcQuestions"][:5]:
+        sources = ", ".join(f"{s['handout']} S.{s['page']} ({s['score']})" for s in q.get("sources", [])) or "-"
+        print(f"  {q['id']}: {sources}")
+
+if __name__ == "__main__":
+    main()
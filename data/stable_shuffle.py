@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Deterministischer Zufall pro Frage.
+
+Statt eines globalen random.seed() bekommt jede Frage einen eigenen
+Zufallsgenerator, dessen Seed aus einem Hash von ID und Inhalt (Stamm,
+Optionen) berechnet wird. Dadurch hängt die Optionsreihenfolge einer Frage
+nur von der Frage selbst ab:
+- Hinzufügen, Entfernen oder Umsortieren anderer Fragen ändert nichts
+- Unveränderte Fragen bleiben byte-identisch (kleine Diffs)
+- Fragen können einzeln, parallel oder inkrementell verarbeitet werden
+
+Die Optionen werden vor dem Mischen kanonisch sortiert; mehrfaches Mischen
+derselben Frage ergibt deshalb immer dieselbe Reihenfolge.
+"""
+
+import hashlib
+import random
+
+def question_seed(q, purpose=""):
+    """Stabiler 64-Bit-Seed aus Zweck, ID und Inhalt einer Frage."""
+    h = hashlib.sha256()
+    h.update(purpose.encode('utf-8') + b"\0")
+    h.update(str(q.get("id", "")).encode('utf-8') + b"\0")
+    h.update(q.get("stem", "").encode('utf-8') + b"\0")
+    for opt in canonical_options(q.get("options", [])):
+        h.update(("1" if opt["correct"] else "0").encode('utf-8') + opt["text"].encode('utf-8') + b"\0")
+    return int.from_bytes(h.digest()[:8], "big")
+
+def question_rng(q, purpose=""):
+    """Eigener Zufallsgenerator für eine Frage."""
+    return random.Random(question_seed(q, purpose))
+
+def canonical_options(options):
+    """Optionen in einer von der aktuellen Reihenfolge unabhängigen Ordnung."""
+    return sorted(options, key=lambda opt: (opt["text"], bool(opt["correct"])))
+
+def shuffle_options(q):
+    """Mischt die Optionen einer Frage deterministisch (idempotent)."""
+    options = canonical_options(q["options"])
+    question_rng(q, "options").shuffle(options)
+    q["options"] = options
+    return q
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Watch-Modus zum Schreiben von Fragen: beobachtet die Topic-Dateien und baut nach
+jedem Speichern nur das geänderte Thema neu.
+
+1. Fragt alle --interval Sekunden Änderungszeit und Größe der Topic-Dateien ab
+   (ein Verzeichnis-Scan, funktioniert überall ohne inotify)
+2. Wartet nach der letzten Änderung --debounce Sekunden, damit Editoren, die in
+   mehreren Schritten speichern, nur einen Rebuild auslösen
+3. Für jedes geänderte Thema: Schema-Prüfung, Zusammenführen und die Pipeline-Passes
+   nur auf den Fragen dieses Themas. Die Passes arbeiten pro Frage bzw. pro Thema und
+   die Metadaten sind Summen über die Fragen, deshalb ergibt das Zusammensetzen
+   dasselbe wie pipeline.py --from-topics
+4. Schreibt questions.json und die Artefakte im Schnellmodus: nur der Shard des
+   geänderten Themas bekommt einen neuen Namen; Prüfungsvarianten bleiben vom letzten
+   vollen Build, solange ihre Fragen-IDs noch existieren, die Patch-Kette wird
+   verworfen (siehe artifacts.py)
+
+Themenübergreifende Schritte laufen nicht mit: der Dubletten-Check meldet nur
+Cluster mit dem geänderten Thema auf der Konsole, Qualitäts- und Dubletten-Report
+werden nicht überschrieben. Für einen Release danach einmal pipeline.py --from-topics.
+
+Aufruf:
+    python watch.py                          # beobachten, Strg+C beendet
+    python watch.py --interval 0.1 --debounce 0.2
+"""
+
+import argparse
+import os
+import time
+
+import combine_questions
+import near_duplicates
+import schema_validation
+from artifacts import write_artifacts
+from bank_delta import bank_version
+from combine_questions import DATA_DIR, TOPIC_FILE_PATTERN, file_hash, find_topic_files, read_json
+from pipeline import PASS_ORDER, load_bank, run_pipeline, save_bank
+
+POLL_INTERVAL = 0.2
+DEBOUNCE = 0.3
+
+# Passes, die alle Themen gemeinsam betrachten und deshalb nicht pro Thema laufen
+GLOBAL_PASSES = {"near_duplicates"}
+TOPIC_PASSES = [name for name in PASS_ORDER if name not in GLOBAL_PASSES]
+
+def scan_topic_files(directory=DATA_DIR):
+    """Dateiname -> (Änderungszeit, Größe) aller Topic-Dateien (ein Verzeichnis-Scan)."""
+    stamps = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if TOPIC_FILE_PATTERN.match(entry.name) and entry.is_file():
+                stat = entry.stat()
+                stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+def changed_files(before, after):
+    return {name for name in before.keys() | after.keys() if before.get(name) != after.get(name)}
+
+def build_topic(path):
+    """Zusammenführen + themenlokale Passes für eine Topic-Datei (eigene kleine Datenbank)."""
+    topic = combine_questions.combine_questions([read_json(path)])
+    topic, _ = run_pipeline(topic, TOPIC_PASSES, {"dry_run": True})
+    return topic
+
+def merge_metadata(parts):
+    """Summiert die Zähler der Themen-Metadaten (Texte wie course bleiben)."""
+    merged = dict(parts[0])
+    for part in parts[1:]:
+        for key, value in part.items():
+            if isinstance(value, dict):
+                merged[key] = {k: merged[key].get(k, 0) + v for k, v in value.items()}
+            elif isinstance(value, int):
+                merged[key] += value
+    return merged
+
+def assemble_bank(topics):
+    """Setzt die Datenbank aus den Themen zusammen (nach Topic-ID, wie combine_questions)."""
+    parts = [topics[topic_id] for topic_id in sorted(topics)]
+    data = {
+        "metadata": merge_metadata([part["metadata"] for part in parts]),
+        "topics": [topic for part in parts for topic in part["topics"]],
+        "mcQuestions": [q for part in parts for q in part["mcQuestions"]],
+        "openQuestions": [q for part in parts for q in part["openQuestions"]],
+    }
+    blocks = {}
+    for part in parts:
+        blocks.update(part.get("explanationBlocks", {}))
+    if blocks:
+        data["explanationBlocks"] = blocks
+    return data
+
+def report_duplicates(data, topic_ids):
+    """Gibt die Dubletten-Cluster aus, an denen eines der geänderten Themen beteiligt ist."""
+    report = near_duplicates.near_duplicate_report(data)
+    for key in ("mcQuestions", "openQuestions"):
+        for cluster in report[key]:
+            if not topic_ids & set(cluster["topicIds"]):
+                continue
+            print(f"  Dublette ({cluster['size']} Fragen, min. Ähnlichkeit {cluster['minSimilarity']}):")
+            for q in cluster["questions"]:
+                print(f"    - {q['id']} (Thema {q['topicId']}): {q['stem']}...")
+
+def rebuild(state, names, write=True):
+    """Baut die geänderten Topic-Dateien neu und schreibt die Ausgaben. Gibt True bei Erfolg."""
+    paths = find_topic_files()
+    errors, _ = schema_validation.validate_topic_files(paths)
+    if errors:
+        print(f"  Schema-Fehler ({len(errors)}), Ausgaben bleiben unverändert:")
+        for error in errors[:20]:
+            print(f"    {error}")
+        return False
+
+    # Erst alles bauen, dann den Zustand ändern: schlägt ein Pass fehl, bleibt der alte Stand
+    by_name = {path.name: path for path in paths}
+    removed = [name for name in sorted(names) if name not in by_name and name in state["files"]]
+    built = {}
+    for name in sorted(names & by_name.keys()):
+        digest = file_hash(by_name[name])
+        old = state["files"].get(name)
+        if old is not None and old["hash"] == digest:
+            continue
+        print(f"  {name}:")
+        built[name] = {"hash": digest, "topic": build_topic(by_name[name])}
+
+    if not built and not removed:
+        print("  keine inhaltliche Änderung")
+        return True
+
+    for name in removed + list(built):
+        old = state["files"].pop(name, None)
+        if old is not None:
+            state["topics"].pop(old["topicId"], None)
+    for name, entry in built.items():
+        entry["topicId"] = entry["topic"]["topics"][0]["id"]
+        state["files"][name] = entry
+        state["topics"][entry["topicId"]] = entry["topic"]
+    for name in removed:
+        print(f"  {name}: entfernt")
+    changed_topics = {entry["topicId"] for entry in built.values()}
+
+    data = assemble_bank(state["topics"])
+    try:
+        schema_validation.ensure_valid(schema_validation.validate_bank(data), "Fragen-Datenbank")
+    except ValueError as e:
+        print(f"  {e}\n  Ausgaben bleiben unverändert")
+        return False
+
+    report_duplicates(data, changed_topics)
+    if write and bank_version(data) != state["version"]:
+        save_bank(data)
+        write_artifacts(data, quick=True)
+        state["version"] = bank_version(data)
+    return True
+
+def initial_state():
+    """Baut alle Themen einmal, ohne zu schreiben (erst eine Änderung löst Ausgaben aus)."""
+    state = {"files": {}, "topics": {}, "version": bank_version(load_bank())}
+    if not rebuild(state, {path.name for path in find_topic_files()}, write=False):
+        raise SystemExit("Erster Build fehlgeschlagen, bitte Topic-Dateien korrigieren")
+    return state
+
+def watch(interval=POLL_INTERVAL, debounce=DEBOUNCE):
+    start = time.perf_counter()
+    print("Erster Build aller Themen:")
+    state = initial_state()
+    print(f"Bereit ({(time.perf_counter() - start) * 1000:.0f} ms), beobachte {DATA_DIR}/topic_*.json")
+
+    stamps = scan_topic_files()
+    pending = set()
+    last_change = 0.0
+    while True:
+        time.sleep(interval)
+        current = scan_topic_files()
+        changed = changed_files(stamps, current)
+        stamps = current
+        if changed:
+            pending |= changed
+            last_change = time.perf_counter()
+            continue
+        if pending and time.perf_counter() - last_change >= debounce:
+            start = time.perf_counter()
+            print(f"\n[{time.strftime('%H:%M:%S')}] Änderung: {', '.join(sorted(pending))}")
+            try:
+                ok = rebuild(state, pending)
+            except Exception as e:
+                # Halbfertige Topic-Datei o.ä.: melden und weiter beobachten
+                print(f"  Fehler: {e!r}")
+                ok = False
+            pending = set()
+            status = "fertig" if ok else "fehlgeschlagen"
+            print(f"  {status} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Topic-Dateien beobachten und betroffene Ausgaben neu bauen")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help=f"Sekunden zwischen zwei Verzeichnis-Scans (Standard: {POLL_INTERVAL})")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help=f"Ruhezeit nach der letzten Änderung vor dem Rebuild (Standard: {DEBOUNCE})")
+    args = parser.parse_args()
+    try:
+        watch(args.interval, args.debounce)
+    except KeyboardInterrupt:
+        print("\nBeendet")
+
+if __name__ == "__main__":
+    main()
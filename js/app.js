@@ -42,6 +42,19 @@ function setupEventListeners() {
         });
     });
 
+    // Suche
+    const searchInput = document.getElementById('searchInput');
+    searchInput.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => renderSearchResults(searchInput.value), SEARCH_DELAY_MS);
+    });
+    searchInput.addEventListener('keydown', event => {
+        if (event.key === 'Enter' && searchInput.value.trim()) startSearchQuiz(searchInput.value);
+    });
+    document.getElementById('startSearchQuiz').addEventListener('click', () => {
+        if (searchInput.value.trim()) startSearchQuiz(searchInput.value);
+    });
+
     // Quiz Actions
     document.getElementById('submitAnswer').addEventListener('click', handleSubmitAnswer);
     document.getElementById('nextQuestion').addEventListener('click', handleNextQuestion);
@@ -50,6 +63,9 @@ function setupEventListeners() {
     // Exam
     document.getElementById('startExam').addEventListener('click', startExam);
 
+    // Fortschritt
+    document.getElementById('exportProgress').addEventListener('click', exportProgress);
+
     // Open Question Modal
     document.getElementById('closeModal').addEventListener('click', () => {
         document.getElementById('openQuestionModal').classList.add('hidden');
@@ -83,6 +99,16 @@ function showView(viewName) {
     }
 }
 
+/**
+ * Meldet, dass die Fragen für einen Quiz-/Prüfungsstart nicht geladen werden konnten
+ * (z.B. offline), und kehrt zur Ausgangsansicht zurück
+ */
+function showStartError(error, viewName) {
+    console.error('Fehler beim Laden der Fragen:', error);
+    alert('Die Fragen konnten nicht geladen werden. Bitte Verbindung prüfen und erneut versuchen.');
+    showView(viewName);
+}
+
 /**
  * Rendert die Themen-Übersicht
  */
@@ -95,8 +121,8 @@ function renderTopics() {
 
     topics.forEach(topic => {
         const stats = getTopicStats(topic.id);
-        const { mcQuestions, openQuestions } = getQuestionsByTopic(topic.id);
-        const totalQuestions = mcQuestions.length + openQuestions.length;
+        const counts = getTopicQuestionCount(topic.id);
+        const totalQuestions = counts.mc + counts.open;
 
         const card = document.createElement('div');
         card.className = 'topic-card';
@@ -143,6 +169,60 @@ function renderTopics() {
     grid.appendChild(mixedCard);
 }
 
+// Suche beim Tippen: erst nach einer kurzen Pause, nicht bei jedem Zeichen
+const SEARCH_DELAY_MS = 200;
+let searchTimer = null;
+
+/**
+ * Zeigt die besten Suchtreffer unter dem Suchfeld an
+ */
+async function renderSearchResults(query) {
+    const container = document.getElementById('searchResults');
+    if (!query.trim()) {
+        container.classList.add('hidden');
+        container.innerHTML = '';
+        return;
+    }
+
+    let questions;
+    try {
+        questions = await getQuestionsForHits(await searchQuestions(query, 5));
+    } catch (error) {
+        console.error('Fehler bei der Suche:', error);
+        questions = null;
+    }
+
+    // Inzwischen weitergetippt: ältere Ergebnisse verwerfen
+    if (document.getElementById('searchInput').value !== query) return;
+
+    container.innerHTML = '';
+    container.classList.remove('hidden');
+
+    if (!questions || questions.length === 0) {
+        const empty = document.createElement('p');
+        empty.className = 'search-empty';
+        empty.textContent = questions ? 'Keine Treffer' : 'Suche nicht verfügbar (offline?)';
+        container.appendChild(empty);
+        return;
+    }
+
+    const topicNames = new Map(getTopics().map(topic => [topic.id, topic.name]));
+    questions.forEach(question => {
+        const row = document.createElement('div');
+        row.className = 'search-result';
+
+        const topic = document.createElement('span');
+        topic.className = 'search-result-topic';
+        topic.textContent = topicNames.get(question.topicId) || '';
+
+        const stem = document.createElement('span');
+        stem.textContent = question.stem;
+
+        row.append(topic, stem);
+        container.appendChild(row);
+    });
+}
+
 let countdownInterval = null;
 
 /**
@@ -209,7 +289,6 @@ function updateProgressView() {
 
     topics.forEach(topic => {
         const stats = getTopicStats(topic.id);
-        const { mcQuestions } = getQuestionsByTopic(topic.id);
 
         const item = document.createElement('div');
         item.className = 'topic-progress-item';
@@ -261,8 +340,14 @@ let examState = {
     phase: 'mc' // 'mc' oder 'open'
 };
 
-function startExam() {
-    const examQuestions = getExamQuestions(20, 3);
+async function startExam() {
+    let examQuestions;
+    try {
+        examQuestions = await getExamQuestions(20, 3);
+    } catch (error) {
+        showStartError(error, 'exam');
+        return;
+    }
 
     examState = {
         mcQuestions: examQuestions.mc,
@@ -363,7 +448,7 @@ function reviewExamAnswers(answers) {
                     <span class="review-status">${isCorrect ? '✓' : '✗'}</span>
                 </div>
                 <p class="review-question">${question.stem}</p>
-                <p class="review-explanation">${question.explanation || ''}</p>
+                <p class="review-explanation">${getExplanation(question)}</p>
             </div>
         `;
     });
@@ -2,20 +2,57 @@
  * Data Module - Lädt und verwaltet die Fragen-Datenbank
  */
 
-// Globales Datenobjekt
+// Globales Datenobjekt (Metadaten + Themen aus dem Manifest)
 let questionsData = null;
 
+// Geladene Themen-Shards: topicId -> Promise<{ mcQuestions, openQuestions }>
+const topicShards = {};
+
+// Promise für die komplette Fragen-Datenbank (nur für gemischte Modi)
+let fullBankPromise = null;
+
+// Lokale Kopie der Datenbank ({ version, bank }), wird per Delta-Patch aktualisiert
+const BANK_STORAGE_KEY = 'klausurTrainer_bank';
+
+// Geteilte Erklärungsblöcke (z.B. Kernwissen pro Thema), key -> Text
+const explanationBlocks = {};
+
+// Trenner zwischen Frage-Erklärung und geteiltem Block (wie im Python-Build)
+const EXPLANATION_SEPARATOR = '\n\n' + '─'.repeat(40) + '\n\n';
+
+// Promise für den Suchindex (wird erst bei der ersten Suche geladen)
+let searchIndexPromise = null;
+
+// Promise für die vorab erzeugten Prüfungsvarianten (data/exam_variants.py)
+let examVariantsPromise = null;
+
+// Normalisierung für die Suche – muss mit data/search_index.py übereinstimmen
+const SEARCH_UMLAUTS = { 'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss' };
+const SEARCH_STOPWORDS = new Set([
+    'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einer', 'eines', 'einem', 'einen',
+    'und', 'oder', 'aber', 'als', 'auch', 'auf', 'aus', 'bei', 'bis', 'durch', 'fuer', 'gegen',
+    'hat', 'haben', 'ist', 'sind', 'war', 'waren', 'wird', 'werden', 'wurde', 'wurden', 'kann',
+    'koennen', 'im', 'in', 'ins', 'mit', 'nach', 'nicht', 'noch', 'nur', 'ob', 'ohne', 'sich',
+    'so', 'um', 'unter', 'vom', 'von', 'vor', 'wie', 'was', 'welche', 'welcher', 'welches',
+    'wenn', 'zu', 'zum', 'zur', 'am', 'an', 'es', 'er', 'sie', 'man', 'dass', 'sehr', 'mehr'
+]);
+const SEARCH_SUFFIXES = ['ungen', 'heiten', 'keiten', 'ung', 'heit', 'keit', 'lich', 'isch',
+    'ern', 'em', 'en', 'er', 'es', 'e', 's', 'n'];
+const SEARCH_MIN_STEM_LENGTH = 4;
+
 /**
- * Lädt die Fragen aus der JSON-Datei
+ * Lädt das Manifest mit Metadaten, Themen und Fragenanzahl.
+ * Die Fragen selbst werden erst pro Thema nachgeladen.
  */
 async function loadQuestionsData() {
     try {
-        const response = await fetch('data/questions.json?v=' + Date.now());
+        // Das Manifest wird immer revalidiert, alle anderen Dateien haben Hash-Namen
+        const response = await fetch('data/manifest.json', { cache: 'no-cache' });
         if (!response.ok) {
-            throw new Error('Konnte Fragen nicht laden');
+            throw new Error('Konnte Manifest nicht laden');
         }
         questionsData = await response.json();
-        console.log('Fragen geladen:', questionsData.metadata);
+        console.log('Manifest geladen:', questionsData.metadata);
         return questionsData;
     } catch (error) {
         console.error('Fehler beim Laden der Fragen:', error);
@@ -25,6 +62,142 @@ async function loadQuestionsData() {
     }
 }
 
+/**
+ * Lädt eine JSON-Datei aus dem data-Verzeichnis.
+ * Die Dateinamen aus dem Manifest enthalten einen Content-Hash und dürfen
+ * deshalb unbegrenzt aus dem Browser-/CDN-Cache kommen.
+ */
+async function fetchDataFile(path) {
+    const response = await fetch('data/' + path);
+    if (!response.ok) {
+        throw new Error('Konnte ' + path + ' nicht laden');
+    }
+    return response.json();
+}
+
+/**
+ * Liest die lokal gespeicherte Datenbank ({ version, bank } oder null)
+ */
+function loadStoredBank() {
+    try {
+        const stored = JSON.parse(localStorage.getItem(BANK_STORAGE_KEY));
+        return stored && stored.version && stored.bank ? stored : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+/**
+ * Speichert die Datenbank lokal (bei vollem Speicher ohne Kopie weiter)
+ */
+function storeBank(version, bank) {
+    if (!version) return;
+    try {
+        localStorage.setItem(BANK_STORAGE_KEY, JSON.stringify({ version, bank }));
+    } catch (error) {
+        localStorage.removeItem(BANK_STORAGE_KEY);
+        console.warn('Fragen-Datenbank konnte nicht lokal gespeichert werden:', error);
+    }
+}
+
+/**
+ * Wendet einen Delta-Patch an – muss mit apply_delta() in data/bank_delta.py übereinstimmen
+ */
+function applyBankPatch(bank, patch) {
+    const result = {};
+    Object.keys(bank).forEach(key => {
+        if (!patch.remove.includes(key)) result[key] = bank[key];
+    });
+    Object.entries(patch.lists).forEach(([key, change]) => {
+        const items = result[key] || [];
+        const byId = new Map(items.map(item => [item.id, item]));
+        const removed = new Set(change.remove);
+        const added = [];
+        change.upsert.forEach(item => {
+            if (!byId.has(item.id)) added.push(item.id);
+            byId.set(item.id, item);
+        });
+        // Ohne Reihenfolge: bestehende bleiben an ihrem Platz, neue kommen ans Ende
+        const order = change.order ||
+            items.map(item => item.id).filter(id => !removed.has(id)).concat(added);
+        result[key] = order.map(id => byId.get(id));
+    });
+    Object.entries(patch.objects).forEach(([key, change]) => {
+        const value = { ...(result[key] || {}) };
+        change.remove.forEach(name => delete value[name]);
+        result[key] = Object.assign(value, change.set);
+    });
+    return Object.assign(result, patch.set);
+}
+
+/**
+ * Die Patches von version bis zum aktuellen Stand (null = voller Download nötig)
+ */
+function patchesFrom(chain, version) {
+    const index = chain.map(link => link.from).lastIndexOf(version);
+    return index === -1 ? null : chain.slice(index);
+}
+
+/**
+ * Holt die Datenbank: lokale Kopie, lokale Kopie + Patches oder vollständig
+ */
+async function fetchBank() {
+    const stored = loadStoredBank();
+    if (stored && stored.version === questionsData.version) {
+        return stored.bank;
+    }
+
+    const links = stored ? patchesFrom(questionsData.patches || [], stored.version) : null;
+    if (links) {
+        try {
+            let bank = stored.bank;
+            let version = stored.version;
+            for (const link of links) {
+                const patch = await fetchDataFile(link.file);
+                if (patch.from !== version) throw new Error('Patch passt nicht zu Version ' + version);
+                bank = applyBankPatch(bank, patch);
+                version = patch.to;
+            }
+            if (version === questionsData.version) {
+                storeBank(version, bank);
+                console.log('Fragen-Datenbank per Patch aktualisiert:', links.length, 'Patch(es)');
+                return bank;
+            }
+        } catch (error) {
+            console.warn('Patches nicht anwendbar, lade vollständig:', error);
+        }
+    }
+
+    const bank = await fetchDataFile(questionsData.full);
+    storeBank(questionsData.version, bank);
+    return bank;
+}
+
+/**
+ * Lädt die komplette Fragen-Datenbank (für gemischten Quiz und Prüfung)
+ */
+function loadAllQuestions() {
+    if (!fullBankPromise) {
+        fullBankPromise = fetchBank().then(bank => {
+            Object.assign(explanationBlocks, bank.explanationBlocks || {});
+            // Themen-Cache gleich mit befüllen
+            questionsData.topics.forEach(topic => {
+                if (!topicShards[topic.id]) {
+                    topicShards[topic.id] = Promise.resolve({
+                        mcQuestions: bank.mcQuestions.filter(q => q.topicId === topic.id),
+                        openQuestions: bank.openQuestions.filter(q => q.topicId === topic.id)
+                    });
+                }
+            });
+            return bank;
+        }).catch(error => {
+            fullBankPromise = null;
+            throw error;
+        });
+    }
+    return fullBankPromise;
+}
+
 /**
  * Zeigt einen Ladefehler an
  */
@@ -55,29 +228,205 @@ function getTopics() {
 }
 
 /**
- * Gibt Fragen für ein bestimmtes Thema zurück
+ * Gibt die Anzahl der Fragen eines Themas zurück (aus dem Manifest, ohne Nachladen)
  */
-function getQuestionsByTopic(topicId) {
+function getTopicQuestionCount(topicId) {
+    if (!questionsData) return { mc: 0, open: 0 };
+    const topic = questionsData.topics.find(t => t.id === topicId);
+    if (!topic) return { mc: 0, open: 0 };
+    return { mc: topic.mcCount || 0, open: topic.openCount || 0 };
+}
+
+/**
+ * Gibt Fragen für ein bestimmtes Thema zurück (lädt nur den Shard des Themas)
+ */
+async function getQuestionsByTopic(topicId) {
+    if (!questionsData) return { mcQuestions: [], openQuestions: [] };
+
+    if (!topicShards[topicId]) {
+        const topic = questionsData.topics.find(t => t.id === topicId);
+        if (!topic || !topic.shard) return { mcQuestions: [], openQuestions: [] };
+
+        topicShards[topicId] = fetchDataFile(topic.shard).then(shard => {
+            Object.assign(explanationBlocks, shard.explanationBlocks || {});
+            return {
+                mcQuestions: shard.mcQuestions,
+                openQuestions: shard.openQuestions
+            };
+        }).catch(error => {
+            delete topicShards[topicId];
+            throw error;
+        });
+    }
+
+    return topicShards[topicId];
+}
+
+/**
+ * Setzt die vollständige Erklärung einer Frage zusammen
+ * (eigene Erklärung + referenzierte geteilte Blöcke)
+ */
+function getExplanation(question) {
+    const parts = [question.explanation || ''];
+    (question.explanationRefs || []).forEach(key => {
+        if (explanationBlocks[key]) {
+            parts.push(explanationBlocks[key]);
+        }
+    });
+    return parts.filter(Boolean).join(EXPLANATION_SEPARATOR);
+}
+
+/**
+ * Zerlegt einen Suchtext in normalisierte Begriffe (Umlaut-Faltung, Stoppwörter, Stemming)
+ */
+function normalizeSearchTerms(text) {
+    const folded = text.toLowerCase().replace(/[äöüß]/g, c => SEARCH_UMLAUTS[c]);
+    const tokens = folded.match(/[a-z0-9]+/g) || [];
+    return tokens
+        .filter(token => token.length > 1 && !SEARCH_STOPWORDS.has(token))
+        .map(token => {
+            const suffix = SEARCH_SUFFIXES.find(s =>
+                token.endsWith(s) && token.length - s.length >= SEARCH_MIN_STEM_LENGTH);
+            return suffix ? token.slice(0, -suffix.length) : token;
+        });
+}
+
+/**
+ * Lädt den vorberechneten Suchindex (Begriff -> [Dokument, Gewicht, ...])
+ */
+function loadSearchIndex() {
+    if (!searchIndexPromise) {
+        const path = getArtifactPath('searchIndex');
+        if (!path) return Promise.resolve(null);
+        searchIndexPromise = fetchDataFile(path).then(index => {
+            // Sortierte Begriffsliste für die Präfix-Suche
+            index.termList = Object.keys(index.terms).sort();
+            return index;
+        }).catch(error => {
+            searchIndexPromise = null;
+            throw error;
+        });
+    }
+    return searchIndexPromise;
+}
+
+/**
+ * Alle Begriffe des Index, die mit prefix beginnen (binäre Suche in der sortierten Liste)
+ */
+function findTermsWithPrefix(termList, prefix) {
+    let low = 0;
+    let high = termList.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (termList[mid] < prefix) low = mid + 1; else high = mid;
+    }
+    const terms = [];
+    for (let i = low; i < termList.length && termList[i].startsWith(prefix); i++) {
+        terms.push(termList[i]);
+    }
+    return terms;
+}
+
+/**
+ * Durchsucht Stämme, Optionen und Erklärungen über den Suchindex.
+ * Das letzte Wort zählt als Präfix (Suche beim Tippen).
+ * Gibt [{ id, topicId, score }] absteigend nach Relevanz zurück.
+ */
+async function searchQuestions(query, limit = 20) {
     if (!questionsData) return [];
+    const index = await loadSearchIndex();
+    if (!index) return [];
 
-    const mcQuestions = questionsData.mcQuestions.filter(q => q.topicId === topicId);
-    const openQuestions = questionsData.openQuestions.filter(q => q.topicId === topicId);
+    const terms = normalizeSearchTerms(query);
+    if (terms.length === 0) return [];
 
-    return { mcQuestions, openQuestions };
+    const scores = new Map();
+    const addPosting = term => {
+        const posting = index.terms[term] || [];
+        for (let i = 0; i < posting.length; i += 2) {
+            scores.set(posting[i], (scores.get(posting[i]) || 0) + posting[i + 1]);
+        }
+    };
+
+    // Das gerade getippte Wort als Präfix: Stemming kürzt nur, der Stamm bleibt ein Präfix
+    const last = terms.pop();
+    new Set([...terms, ...findTermsWithPrefix(index.termList, last)]).forEach(addPosting);
+
+    return [...scores.entries()]
+        .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+        .slice(0, limit)
+        .map(([doc, score]) => ({ id: index.docs[doc], topicId: index.topics[doc], score }));
+}
+
+/**
+ * Lädt die Fragen zu Suchtreffern (nur die Shards der betroffenen Themen)
+ * und gibt sie in Trefferreihenfolge zurück
+ */
+async function getQuestionsForHits(hits) {
+    const topicIds = [...new Set(hits.map(hit => hit.topicId))];
+    const shards = await Promise.all(topicIds.map(getQuestionsByTopic));
+
+    const byId = new Map();
+    shards.forEach(({ mcQuestions, openQuestions }) => {
+        mcQuestions.forEach(q => byId.set(q.id, q));
+        openQuestions.forEach(q => byId.set(q.id, { ...q, questionType: 'open' }));
+    });
+    return hits.map(hit => byId.get(hit.id)).filter(Boolean);
+}
+
+/**
+ * Lädt die Prüfungsvarianten (Themenquoten, Schwierigkeitsmix und begrenzte
+ * Überschneidung sind schon beim Build geprüft)
+ */
+function loadExamVariants() {
+    if (!examVariantsPromise) {
+        const path = getArtifactPath('examVariants');
+        if (!path) return Promise.resolve(null);
+        examVariantsPromise = fetchDataFile(path).catch(error => {
+            examVariantsPromise = null;
+            throw error;
+        });
+    }
+    return examVariantsPromise;
+}
+
+/**
+ * Wählt eine zufällige vorab erzeugte Variante (O(1)); null, wenn keine passt
+ */
+function pickExamVariant(variants, bank, mcCount, openCount) {
+    if (!variants || !variants.mc.length) return null;
+    if (variants.mcCount !== mcCount || variants.openCount !== openCount) return null;
+
+    const index = Math.floor(Math.random() * variants.mc.length);
+    const mcById = new Map(bank.mcQuestions.map(q => [q.id, q]));
+    const openById = new Map(bank.openQuestions.map(q => [q.id, q]));
+    const mc = variants.mc[index].map(i => mcById.get(variants.mcIds[i]));
+    const open = variants.open[index].map(i => openById.get(variants.openIds[i]));
+    if (mc.includes(undefined) || open.includes(undefined)) return null;
+
+    return { mc: shuffleArray(mc), open: open };
 }
 
 /**
  * Gibt zufällige Fragen für Prüfungssimulation zurück
  */
-function getExamQuestions(mcCount = 20, openCount = 3) {
+async function getExamQuestions(mcCount = 20, openCount = 3) {
     if (!questionsData) return { mc: [], open: [] };
+    const bank = await loadAllQuestions();
 
-    // Nur Single-Choice Fragen für Prüfung
-    const singleChoice = questionsData.mcQuestions.filter(q => !q.isMultiSelect);
+    try {
+        const exam = pickExamVariant(await loadExamVariants(), bank, mcCount, openCount);
+        if (exam) return exam;
+    } catch (error) {
+        console.warn('Prüfungsvarianten nicht verfügbar, ziehe zufällig:', error);
+    }
+
+    // Fallback: Nur Single-Choice Fragen für Prüfung
+    const singleChoice = bank.mcQuestions.filter(q => !q.isMultiSelect);
 
     // Shuffle und auswählen
     const shuffledMC = shuffleArray([...singleChoice]);
-    const shuffledOpen = shuffleArray([...questionsData.openQuestions]);
+    const shuffledOpen = shuffleArray([...bank.openQuestions]);
 
     return {
         mc: shuffledMC.slice(0, mcCount),
@@ -88,9 +437,18 @@ function getExamQuestions(mcCount = 20, openCount = 3) {
 /**
  * Gibt alle MC-Fragen zurück (für gemischten Quiz)
  */
-function getAllMCQuestions() {
+async function getAllMCQuestions() {
     if (!questionsData) return [];
-    return questionsData.mcQuestions;
+    const bank = await loadAllQuestions();
+    return bank.mcQuestions;
+}
+
+/**
+ * Gibt den Dateinamen eines Artefakts aus dem Manifest zurück
+ */
+function getArtifactPath(name) {
+    if (!questionsData) return null;
+    return questionsData[name] || null;
 }
 
 /**
@@ -36,8 +36,7 @@ async function loadFlashcards() {
     console.log('[Flashcards] Starting to load flashcards...');
     try {
         loadFlashcardProgress();
-        const response = await fetch('data/flashcards.json?v=' + Date.now());
-        const data = await response.json();
+        const data = await fetchDataFile(getArtifactPath('flashcards') || 'flashcards.json');
         flashcardsData = data.flashcards;
         filteredFlashcards = [...flashcardsData];
 
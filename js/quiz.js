@@ -10,6 +10,7 @@ class QuizEngine {
         this.mode = 'learn'; // 'learn' oder 'exam'
         this.topicId = null;
         this.topicName = '';
+        this.query = null;
     }
 
     /**
@@ -22,6 +23,7 @@ class QuizEngine {
         this.mode = options.mode || 'learn';
         this.topicId = options.topicId || null;
         this.topicName = options.topicName || 'Gemischt';
+        this.query = options.query || null;
 
         return this.getCurrentQuestion();
     }
@@ -74,7 +76,7 @@ class QuizEngine {
         return {
             isCorrect,
             correctIndices,
-            explanation: question.explanation || ''
+            explanation: getExplanation(question)
         };
     }
 
@@ -134,6 +136,9 @@ class QuizEngine {
 // Globale Quiz-Instanz
 const quizEngine = new QuizEngine();
 
+// Höchstens so viele Treffer landen in einem Such-Quiz
+const SEARCH_QUIZ_LIMIT = 15;
+
 /**
  * Rendert die aktuelle Frage
  */
@@ -314,8 +319,14 @@ function showQuizComplete() {
 /**
  * Startet Quiz für ein Thema
  */
-function startTopicQuiz(topicId, topicName) {
-    const { mcQuestions, openQuestions } = getQuestionsByTopic(topicId);
+async function startTopicQuiz(topicId, topicName) {
+    let mcQuestions, openQuestions;
+    try {
+        ({ mcQuestions, openQuestions } = await getQuestionsByTopic(topicId));
+    } catch (error) {
+        showStartError(error, 'topics');
+        return;
+    }
 
     // Kombiniere MC und offene Fragen
     const allQuestions = [...mcQuestions];
@@ -351,8 +362,14 @@ function startTopicQuiz(topicId, topicName) {
 /**
  * Startet gemischten Quiz
  */
-function startMixedQuiz() {
-    const allQuestions = getAllMCQuestions();
+async function startMixedQuiz() {
+    let allQuestions;
+    try {
+        allQuestions = await getAllMCQuestions();
+    } catch (error) {
+        showStartError(error, 'topics');
+        return;
+    }
 
     // Bevorzuge Fragen, die zur Wiederholung anstehen
     const dueQuestionIds = getQuestionsForReview();
@@ -372,6 +389,37 @@ function startMixedQuiz() {
     renderQuestion(quizEngine.getCurrentQuestion());
 }
 
+/**
+ * Startet Quiz mit den Treffern einer Suche (Stämme, Optionen, Erklärungen)
+ */
+async function startSearchQuiz(query) {
+    let questions;
+    try {
+        questions = await getQuestionsForHits(await searchQuestions(query, SEARCH_QUIZ_LIMIT));
+    } catch (error) {
+        showStartError(error, 'topics');
+        return;
+    }
+
+    if (questions.length === 0) {
+        alert('Keine Fragen zu dieser Suche gefunden.');
+        return;
+    }
+
+    resetQuestionCard();
+
+    const topicName = `Suche: ${query.trim()}`;
+    quizEngine.start(questions, {
+        mode: 'learn',
+        topicName,
+        query
+    });
+
+    document.getElementById('quizTopic').textContent = topicName;
+    showView('quiz');
+    renderQuestion(quizEngine.getCurrentQuestion());
+}
+
 /**
  * Startet Quiz erneut
  */
@@ -379,7 +427,9 @@ function restartQuiz() {
     const topicId = quizEngine.topicId;
     const topicName = quizEngine.topicName;
 
-    if (topicId) {
+    if (quizEngine.query) {
+        startSearchQuiz(quizEngine.query);
+    } else if (topicId) {
         startTopicQuiz(topicId, topicName);
     } else {
         startMixedQuiz();
@@ -184,6 +184,20 @@ function getWeakTopics(threshold = 70) {
     return weakTopics;
 }
 
+/**
+ * Lädt den Fortschritt als JSON-Datei herunter (für die Itemanalyse, data/item_analysis.py)
+ */
+function exportProgress() {
+    const progress = { ...getProgress(), exportedAt: new Date().toISOString() };
+    const blob = new Blob([JSON.stringify(progress)], { type: 'application/json' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = 'lernstand_' + progress.exportedAt.slice(0, 10) + '.json';
+    link.click();
+    // Erst freigeben, wenn der Browser den Download gestartet hat (sonst bricht er in Firefox/Safari ab)
+    setTimeout(() => URL.revokeObjectURL(link.href), 1000);
+}
+
 /**
  * Setzt allen Fortschritt zurück
  */
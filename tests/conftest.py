@@ -0,0 +1,7 @@
+"""Die Skripte in data/ importieren sich gegenseitig flach (import rule_engine usw.)."""
+
+import sys
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+sys.path.insert(0, str(DATA_DIR))
@@ -0,0 +1,61 @@
+"""write_artifacts: das Manifest zeigt nach jedem Lauf (auch einem abgebrochenen) auf vorhandene Dateien."""
+
+import json
+import shutil
+
+import pytest
+
+import artifacts
+from conftest import DATA_DIR
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    for name in ("questions.json", "flashcards.json"):
+        shutil.copy(DATA_DIR / name, tmp_path / name)
+    monkeypatch.setattr(artifacts, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(artifacts, "SHARD_DIR", tmp_path / "shards")
+    monkeypatch.setattr(artifacts, "PATCH_DIR", tmp_path / "patches")
+    monkeypatch.setattr(artifacts, "MANIFEST_PATH", tmp_path / "manifest.json")
+    return tmp_path
+
+def manifest_files(directory):
+    with open(directory / "manifest.json", 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    files = [manifest[key] for key in ("full", "flashcards", "searchIndex", "examVariants") if manifest[key]]
+    files += [topic["shard"] for topic in manifest["topics"]]
+    files += [link["file"] for link in manifest["patches"]]
+    return manifest, files
+
+def without_hard_questions(data):
+    for q in data["mcQuestions"]:
+        if q.get("difficulty") == "hard":
+            q["difficulty"] = "medium"
+    return data
+
+def test_unmet_quotas_write_manifest_without_variants(data_dir):
+    data = artifacts.load_questions()
+    artifacts.write_artifacts(data)
+    old_variants = manifest_files(data_dir)[0]["examVariants"]
+    assert (data_dir / old_variants).exists()
+
+    manifest = artifacts.write_artifacts(without_hard_questions(data))
+    assert manifest["examVariants"] is None
+    _, files = manifest_files(data_dir)
+    assert all((data_dir / name).exists() for name in files)
+    assert not (data_dir / old_variants).exists()
+
+def test_failed_build_keeps_previous_files(data_dir, monkeypatch):
+    data = artifacts.load_questions()
+    artifacts.write_artifacts(data)
+    _, before = manifest_files(data_dir)
+
+    def fail(*args):
+        raise RuntimeError("Abbruch")
+
+    monkeypatch.setattr(artifacts, "write_manifest", fail)
+    data["mcQuestions"] = data["mcQuestions"][1:]
+    with pytest.raises(RuntimeError):
+        artifacts.write_artifacts(data)
+    _, after = manifest_files(data_dir)
+    assert after == before
+    assert all((data_dir / name).exists() for name in before)
@@ -0,0 +1,89 @@
+"""Worklist-Balancer: balance_lengths.balance_lengths und final_balance.aggressive_balance."""
+
+import copy
+
+from balance_lengths import MAX_EXTENSIONS, balance_lengths
+from benchmark import generate_bank
+from final_balance import EXTENSIONS, EXTRA_EXTENSION, aggressive_balance, target_window
+
+def question(qid, correct, wrong, multi=False):
+    options = [{"text": correct, "correct": True}] + [{"text": text, "correct": False} for text in wrong]
+    return {"id": qid, "stem": f"Frage {qid}?", "options": options, "isMultiSelect": multi}
+
+def bank(*questions):
+    return {"metadata": {}, "mcQuestions": list(questions)}
+
+def wrong_texts(q):
+    return [opt["text"] for opt in q["options"] if not opt["correct"]]
+
+LONG = "x" * 120
+
+def test_balance_lengths_extends_until_balanced():
+    data = bank(question("q", "y" * 80, ["kurz", "z" * 70]))
+    _, modifications, unresolved = balance_lengths(data)
+    short, untouched = wrong_texts(data["mcQuestions"][0])
+    assert len(short) >= 80 - 40
+    assert untouched == "z" * 70
+    assert unresolved == []
+    assert 1 <= modifications <= MAX_EXTENSIONS
+
+def test_balance_lengths_gives_up_after_max_extensions():
+    data = bank(question("lang", "y" * 400, ["a", "b"]), question("ok", "y" * 20, ["c"]))
+    _, modifications, unresolved = balance_lengths(data)
+    assert unresolved == ["lang"]
+    # Beide zu kurzen Optionen bekommen genau MAX_EXTENSIONS Erweiterungen
+    assert modifications == 2 * MAX_EXTENSIONS
+    assert wrong_texts(data["mcQuestions"][1]) == ["c"]
+
+def test_balance_lengths_skips_multi_select():
+    data = bank(question("multi", LONG, ["a"], multi=True))
+    before = copy.deepcopy(data)
+    assert balance_lengths(data)[1:] == (0, [])
+    assert data == before
+
+def test_balance_lengths_leaves_no_short_options_except_unresolved():
+    data = generate_bank(500)
+    _, _, unresolved = balance_lengths(data)
+    for q in data["mcQuestions"]:
+        if q.get("isMultiSelect") or q["id"] in unresolved:
+            continue
+        min_len = max(len(opt["text"]) for opt in q["options"] if opt["correct"]) - 40
+        assert all(len(text) >= min_len for text in wrong_texts(q))
+
+def test_aggressive_balance_extends_short_options():
+    data = bank(question("q", "y" * 70, ["kurz", "y" * 60]))
+    target_min, _ = target_window(data["mcQuestions"][0])
+    _, modifications, unresolved = aggressive_balance(data)
+    short, untouched = wrong_texts(data["mcQuestions"][0])
+    assert any(short.startswith("kurz" + ext) for ext in EXTENSIONS)
+    # Der Zusatz kommt nur, wenn die Option nach der ersten Erweiterung noch deutlich zu kurz ist
+    if short.endswith(EXTRA_EXTENSION):
+        assert len(short) - len(EXTRA_EXTENSION) < target_min - 20
+    else:
+        assert len(short) >= target_min - 20
+    assert untouched == "y" * 60
+    assert modifications >= 1
+    assert unresolved == ([] if len(short) >= target_min else ["q"])
+
+def test_aggressive_balance_reports_unresolvable_questions():
+    data = bank(question("lang", "y" * 300, ["a"]))
+    _, _, unresolved = aggressive_balance(data)
+    assert unresolved == ["lang"]
+
+def test_aggressive_balance_is_stable_and_applies_once():
+    data = generate_bank(300)
+    alone = {}
+    for q in data["mcQuestions"]:
+        single = bank(copy.deepcopy(q))
+        aggressive_balance(single)
+        alone[q["id"]] = single["mcQuestions"][0]
+
+    # Ergebnis einer Frage hängt nicht von den anderen Fragen ab
+    aggressive_balance(data)
+    for q in data["mcQuestions"]:
+        assert q == alone[q["id"]]
+
+    # Jede Erweiterung greift höchstens einmal: ein zweiter Lauf ändert nichts
+    before = copy.deepcopy(data)
+    assert aggressive_balance(data)[1] == 0
+    assert data == before
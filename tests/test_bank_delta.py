@@ -0,0 +1,122 @@
+"""apply_delta() und applyBankPatch() (js/data.js) müssen aus jedem Patch denselben Stand machen."""
+
+import copy
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from bank_delta import apply_delta, bank_version, compute_delta, extend_chain, patches_from
+from conftest import DATA_DIR
+
+DATA_JS = DATA_DIR.parent / "js" / "data.js"
+
+# Lädt js/data.js in einen leeren Kontext und wendet die Patches aus stdin an
+NODE_SCRIPT = """
+const fs = require('fs');
+const vm = require('vm');
+const context = { console };
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8') +
+    '\\n;this.applyBankPatch = applyBankPatch; this.patchesFrom = patchesFrom;', context);
+const cases = JSON.parse(fs.readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify({
+    applied: cases.patches.map(([bank, patch]) => context.applyBankPatch(bank, patch)),
+    chains: cases.chains.map(([chain, version]) => context.patchesFrom(chain, version))
+}));
+"""
+
+def small_bank(rng, n=12):
+    return {
+        "metadata": {"course": "Test", "totalMcQuestions": n, "difficultyDistribution": {"easy": n}},
+        "topics": [{"id": t, "name": f"Thema {t}"} for t in range(1, 4)],
+        "mcQuestions": [{"id": f"mc_{i}", "stem": f"Frage {i}", "topicId": rng.randint(1, 3)}
+                        for i in range(n)],
+        "openQuestions": [{"id": f"open_{i}", "stem": f"Offen {i}"} for i in range(n // 3)],
+        "explanationBlocks": {f"b{i}": f"Block {i}" for i in range(3)},
+    }
+
+def mutate(rng, bank):
+    """Zufällige Änderungen: ändern, entfernen, hinzufügen, umsortieren, Schlüssel setzen/löschen."""
+    new = copy.deepcopy(bank)
+    questions = new["mcQuestions"]
+    for q in rng.sample(questions, min(3, len(questions))):
+        q["stem"] += " (geändert)"
+    for _ in range(rng.randint(0, 2)):
+        if questions:
+            questions.pop(rng.randrange(len(questions)))
+    # Neue Fragen am Ende brauchen keine Reihenfolge im Patch, eingefügte schon
+    at_end = rng.random() < 0.5
+    for _ in range(rng.randint(0, 3)):
+        position = len(questions) if at_end else rng.randint(0, len(questions))
+        questions.insert(position, {"id": f"neu_{rng.random()}", "stem": "Neu"})
+    if rng.random() < 0.3:
+        rng.shuffle(questions)
+    if rng.random() < 0.5:
+        new["metadata"]["totalMcQuestions"] = len(questions)
+        new["metadata"].pop("difficultyDistribution", None)
+    if rng.random() < 0.3:
+        new.pop("explanationBlocks", None)
+    if rng.random() < 0.3:
+        new["generatedBy"] = "test"
+    if rng.random() < 0.2:
+        new["openQuestions"] = []
+    return new
+
+def edit_cases(count=40, seed=3):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        old = small_bank(rng)
+        new = mutate(rng, old)
+        cases.append((old, new, compute_delta(old, new)))
+    # Ohne Änderung: leerer Patch
+    bank = small_bank(rng)
+    cases.append((bank, copy.deepcopy(bank), compute_delta(bank, bank)))
+    return cases
+
+def run_node(patches, chains):
+    payload = json.dumps({"patches": patches, "chains": chains}, ensure_ascii=False)
+    result = subprocess.run(["node", "-e", NODE_SCRIPT, str(DATA_JS)], input=payload,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def test_apply_delta_reproduces_new_bank():
+    for old, new, delta in edit_cases():
+        applied = apply_delta(old, delta)
+        # Gleicher Inhalt und gleiche Serialisierung (Schlüssel- und Listenreihenfolge)
+        assert json.dumps(applied, ensure_ascii=False) == json.dumps(new, ensure_ascii=False)
+        assert bank_version(applied) == delta["to"]
+
+def test_apply_delta_leaves_input_unchanged():
+    for old, _, delta in edit_cases(10):
+        before = copy.deepcopy(old)
+        apply_delta(old, delta)
+        assert old == before
+
+def chain_cases():
+    chain = [{"from": f"v{i}", "to": f"v{i + 1}", "size": 1} for i in range(5)]
+    looped = chain + [{"from": "v5", "to": "v1", "size": 1}, {"from": "v1", "to": "v6", "size": 1}]
+    return [(chain, version) for version in ("v0", "v3", "v5", "x")] + [(looped, "v1"), ([], "v0")]
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node nicht installiert")
+def test_js_apply_bank_patch_matches_python():
+    cases = edit_cases()
+    result = run_node([[old, delta] for old, _, delta in cases], chain_cases())
+
+    for (old, _, delta), applied in zip(cases, result["applied"]):
+        assert json.dumps(applied, ensure_ascii=False) == json.dumps(apply_delta(old, delta), ensure_ascii=False)
+    for (chain, version), links in zip(chain_cases(), result["chains"]):
+        assert links == patches_from(chain, version)
+
+def test_extend_chain_respects_limits():
+    chain = []
+    for i in range(12):
+        chain = extend_chain(chain, {"from": f"v{i}", "to": f"v{i + 1}", "size": 10}, full_size=1000)
+    assert [link["from"] for link in chain] == [f"v{i}" for i in range(4, 12)]
+
+    chain = extend_chain(chain, {"from": "v12", "to": "v13", "size": 490}, full_size=1000)
+    assert sum(link["size"] for link in chain) <= 500
+    assert chain[-1]["to"] == "v13"
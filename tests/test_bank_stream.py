@@ -0,0 +1,71 @@
+"""iter_bank -> write_bank muss byteweise dasselbe ergeben wie json.dump(indent=2)."""
+
+import json
+
+import pytest
+
+from bank_stream import iter_bank, iter_items, write_bank
+from conftest import DATA_DIR
+
+# Zeichen, die den Streaming-Parser an Chunk-Grenzen stolpern lassen könnten
+TRICKY_BANK = {
+    "metadata": {"course": "Sozi \"Klausur\" [2026]", "counts": {"easy": 1}},
+    "topics": [{"id": 1, "name": "Macht, {Führung} & Vertrauen 💡"}],
+    "mcQuestions": [
+        {"id": "q1", "stem": "Was ist \\\"Macht\\\"?] },", "options": [{"text": "ä\nö", "correct": True}]},
+        {"id": "q2", "stem": "", "options": [], "note": None, "score": -1.5e-3},
+    ],
+    "openQuestions": [],
+}
+
+def dumped(data):
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def roundtrip(source, target, chunk_size=None):
+    events = iter_bank(source) if chunk_size is None else iter_bank(source, chunk_size=chunk_size)
+    write_bank(events, target)
+    return target.read_bytes()
+
+def test_real_bank_roundtrip_is_byte_identical(tmp_path):
+    source = DATA_DIR / "questions.json"
+    with open(source, 'r', encoding='utf-8') as f:
+        expected = dumped(json.load(f))
+    assert roundtrip(source, tmp_path / "questions.json") == expected
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_chunk_boundaries(tmp_path, chunk_size):
+    source = tmp_path / "source.json"
+    source.write_bytes(dumped(TRICKY_BANK))
+    assert roundtrip(source, tmp_path / "out.json", chunk_size) == dumped(TRICKY_BANK)
+
+def test_compact_input_is_written_indented(tmp_path):
+    source = tmp_path / "source.json"
+    source.write_text(json.dumps(TRICKY_BANK, ensure_ascii=False, separators=(",", ":")), encoding='utf-8')
+    assert roundtrip(source, tmp_path / "out.json", 5) == dumped(TRICKY_BANK)
+
+def test_write_bank_may_replace_its_source(tmp_path):
+    source = tmp_path / "questions.json"
+    source.write_bytes(dumped(TRICKY_BANK))
+    counts = write_bank(iter_bank(source), source)
+    assert source.read_bytes() == dumped(TRICKY_BANK)
+    assert counts == {"mcQuestions": 2, "openQuestions": 0}
+
+def test_finalize_adjusts_small_values(tmp_path):
+    source = tmp_path / "source.json"
+    source.write_bytes(dumped(TRICKY_BANK))
+
+    def finalize(values):
+        values["metadata"]["counts"]["easy"] = 2
+        values["explanationBlocks"] = {}
+
+    write_bank(iter_bank(source), tmp_path / "out.json", finalize)
+    expected = json.loads(json.dumps(TRICKY_BANK))
+    expected["metadata"]["counts"]["easy"] = 2
+    expected["explanationBlocks"] = {}
+    assert (tmp_path / "out.json").read_bytes() == dumped(expected)
+
+def test_iter_items(tmp_path):
+    source = tmp_path / "source.json"
+    source.write_bytes(dumped(TRICKY_BANK))
+    assert list(iter_items("mcQuestions", source)) == TRICKY_BANK["mcQuestions"]
+    assert list(iter_items("openQuestions", source)) == []
@@ -0,0 +1,32 @@
+"""iter_exports: kaputte Export-Dateien werden übersprungen, nicht der ganze Lauf."""
+
+import json
+
+import instrumentation
+from item_analysis import STORAGE_KEY, iter_exports
+
+HISTORY = {"q1": {"attempts": 2, "correct": 1}}
+
+def test_iter_exports_skips_invalid_files(tmp_path):
+    files = {
+        "export.json": json.dumps({"questionHistory": HISTORY}),
+        "dump.json": json.dumps({STORAGE_KEY: json.dumps({"questionHistory": HISTORY})}),
+        "liste.json": json.dumps([HISTORY]),
+        "kaputter_dump.json": json.dumps({STORAGE_KEY: "{kein json"}),
+        "dump_liste.json": json.dumps({STORAGE_KEY: "[1, 2]"}),
+        "history_liste.json": json.dumps({"questionHistory": [1]}),
+        "abgeschnitten.json": '{"questionHistory": ',
+        "notiz.txt": "keine Export-Datei",
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    (tmp_path / "latin1.json").write_bytes('{"questionHistory": {}, "name": "Jörg"}'.encode('latin-1'))
+
+    instrumentation.enable()
+    try:
+        with instrumentation.span("exports") as record:
+            histories = list(iter_exports(tmp_path))
+    finally:
+        instrumentation.disable()
+    assert histories == [HISTORY, HISTORY]
+    assert record["counts"]["ungültige dateien"] == 6
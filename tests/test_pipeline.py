@@ -0,0 +1,22 @@
+"""Reihenfolge der Pipeline-Passes: das Ergebnis enthält keine Füllphrasen der Balancer."""
+
+import json
+import re
+
+import pipeline
+from conftest import DATA_DIR
+from improve_questions import AWKWARD_PHRASES
+
+def test_pipeline_output_has_no_awkward_phrases():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data, _ = pipeline.run_pipeline(data, options={"dry_run": True})
+
+    patterns = [re.compile(pattern) for pattern, _ in AWKWARD_PHRASES]
+    awkward = [(q["id"], opt["text"]) for q in data["mcQuestions"] for opt in q["options"]
+               if any(p.search(opt["text"]) for p in patterns)]
+    assert awkward == []
+
+def test_improve_questions_runs_after_the_balancers():
+    order = pipeline.PASS_ORDER
+    assert order.index("improve_questions") > max(order.index("balance_lengths"), order.index("final_balance"))
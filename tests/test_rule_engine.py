@@ -0,0 +1,91 @@
+"""Die Regel-Engine muss dieselben Treffer liefern wie eine Schleife über alle Regeln."""
+
+import json
+import random
+import re
+
+import pytest
+
+import deep_quality_check
+import improve_questions
+from conftest import DATA_DIR
+from rule_engine import (compile_matcher, compile_replacer, find_hits, fired_rules, literal_anchor,
+                         matches_any, replace_all)
+
+# Überlappende und ineinander steckende Anker, dazu Regeln ohne Anker (Alternation, Gruppen)
+EXTRA_PATTERNS = [
+    r"studie\s+\d",
+    r"studien",
+    r"die studie",
+    r"tudie",
+    r"(methode|verfahren)",
+    r"[0-9]+ prozent",
+    r"a|b",
+    r"\bder\b",
+]
+
+def loop_hits(patterns, flags, text):
+    hits = [(i, m.start(), m.group(0))
+            for i, p in enumerate(patterns) for m in re.finditer(p, text, flags)]
+    return sorted(hits, key=lambda hit: (hit[1], hit[0]))
+
+def loop_replace(rules, flags, text):
+    fired = []
+    for i, (pattern, replacement) in enumerate(rules):
+        text, count = re.subn(pattern, replacement, text, flags=flags)
+        if count:
+            fired.append(i)
+    return text, fired
+
+def sample_texts():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = []
+    for q in data["mcQuestions"]:
+        texts += [q["stem"], q.get("explanation", "")] + [o["text"] for o in q["options"]]
+    for q in data["openQuestions"]:
+        texts += [q["stem"], q.get("modelAnswer", "")]
+
+    rng = random.Random(7)
+    words = ["Die Studie 2", "Studien", "tudie", "Methode", "Verfahren", "12 Prozent", "der", "DER",
+             "Laborexperiment", "verwendet", "gemäß dieser Interpretation", "Stichprobe", "ab", "x"]
+    texts += [" ".join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(300)]
+    return texts
+
+TEXTS = sample_texts()
+
+MATCHERS = [
+    ([p for p, _ in deep_quality_check.PROBLEM_PATTERNS], re.IGNORECASE),
+    (improve_questions.IRRELEVANT_PATTERNS, re.IGNORECASE),
+    ([p for p, _ in deep_quality_check.PROBLEM_PATTERNS] + EXTRA_PATTERNS, re.IGNORECASE),
+    (EXTRA_PATTERNS, 0),
+]
+
+@pytest.mark.parametrize("patterns, flags", MATCHERS)
+def test_matcher_equals_rule_loop(patterns, flags):
+    engine = compile_matcher(patterns, flags)
+    for text in TEXTS:
+        expected = loop_hits(patterns, flags, text)
+        assert find_hits(engine, text) == expected
+        assert fired_rules(engine, text) == sorted({i for i, _, _ in expected})
+        assert matches_any(engine, text) == bool(expected)
+
+@pytest.mark.parametrize("rules", [
+    improve_questions.AWKWARD_PHRASES,
+    improve_questions.AWKWARD_PHRASES + [(p, "X") for p in EXTRA_PATTERNS],
+])
+def test_replacer_equals_sub_loop(rules):
+    engine = compile_replacer(rules)
+    for text in TEXTS:
+        assert replace_all(engine, text) == loop_replace(rules, 0, text)
+
+def test_anchors_are_required_literals():
+    assert literal_anchor(r"laborexperiment.*verwendet") == "laborexperiment"
+    assert literal_anchor(r"studie\s+\d") == "studie"
+    assert literal_anchor(r"(methode|verfahren)") == ""
+
+def test_one_prefilter_scan_for_all_anchors():
+    engine = compile_matcher(EXTRA_PATTERNS)
+    # Ein kombinierter Ausdruck für alle Anker, einer für alle Regeln ohne Anker
+    assert engine["prefilter"] is not None and engine["fallback"] is not None
+    assert engine["unanchored"] == [4, 5, 6]
@@ -0,0 +1,151 @@
+"""Fehlerfälle des kompilierten Schema-Validators."""
+
+import copy
+import json
+
+import pytest
+
+import schema_validation
+from conftest import DATA_DIR
+from schema_validation import TOPIC_VALIDATOR, ensure_valid, validate, validate_bank, validate_topic_files
+
+VALID_TOPIC = {
+    "topic": {"id": 1, "name": "Macht", "keyPapers": ["Paper"]},
+    "questions": {
+        "mc_existing": [
+            {"id": "q1", "stem": "Was ist Macht?", "difficulty": "easy", "isMultiSelect": False,
+             "options": [{"text": "Einfluss", "correct": True}, {"text": "Zufall", "correct": False}]}
+        ],
+        "open_generated": [
+            {"id": "o1", "stem": "Erkläre Macht.", "modelAnswer": "Macht ist ...", "keyPoints": ["Einfluss"]}
+        ]
+    }
+}
+
+def mc(topic):
+    return topic["questions"]["mc_existing"][0]
+
+def set_key(path, value):
+    def change(topic):
+        *parents, key = path
+        node = topic
+        for part in parents:
+            node = node[part]
+        node[key] = value
+    return change
+
+def delete_key(path):
+    def change(topic):
+        *parents, key = path
+        node = topic
+        for part in parents:
+            node = node[part]
+        del node[key]
+    return change
+
+MC = ("questions", "mc_existing", 0)
+
+ERROR_CASES = [
+    (delete_key(("topic", "name")), "topic: Pflichtfeld 'name' fehlt"),
+    (set_key(("topic", "id"), True), "topic.id: Ganzzahl erwartet, bool gefunden"),
+    (set_key(("topic", "keyPapers"), ["ok", 3]), "topic.keyPapers[1]: Text erwartet, int gefunden"),
+    (set_key(MC + ("stem",), "   "), "mc_existing[0].stem: darf nicht leer sein"),
+    (set_key(MC + ("options",), []), "mc_existing[0].options: mindestens 1 Einträge erwartet"),
+    (set_key(MC + ("options",), "A, B"), "mc_existing[0].options: Liste erwartet, str gefunden"),
+    (set_key(MC + ("options", 1, "correct"), "ja"), "options[1].correct: true/false erwartet, str gefunden"),
+    (set_key(MC + ("options", 0, "correct"), False), "mc_existing[0]: keine richtige Option"),
+    (set_key(MC + ("isMultiSelect",), True), "isMultiSelect=True, aber 1 richtige Option(en)"),
+    (set_key(MC + ("difficulty",), "extrem"), "difficulty: 'extrem' nicht erlaubt (easy, medium, hard)"),
+    (set_key(MC + ("difficulty",), ["hard"]), "difficulty: '['hard']' nicht erlaubt (easy, medium, hard)"),
+    (delete_key(("questions", "open_generated", 0, "modelAnswer")), "Pflichtfeld 'modelAnswer' fehlt"),
+    (set_key(("questions", "open_generated", 0, "id"), "q1"), "ID 'q1' bereits vergeben"),
+    (set_key(("questions",), []), ".questions: Objekt erwartet, list gefunden"),
+]
+
+def test_valid_topic_has_no_errors():
+    errors, ids = validate(TOPIC_VALIDATOR, VALID_TOPIC, "")
+    assert errors == []
+    assert ids == ["q1", "o1"]
+
+@pytest.mark.parametrize("change, message", ERROR_CASES)
+def test_topic_error_cases(change, message):
+    topic = copy.deepcopy(VALID_TOPIC)
+    change(topic)
+    errors, _ = validate(TOPIC_VALIDATOR, topic, "")
+    assert len(errors) == 1
+    assert message in errors[0]
+
+def test_errors_are_collected_not_stopped_at_first():
+    topic = copy.deepcopy(VALID_TOPIC)
+    del topic["topic"]["name"]
+    mc(topic)["stem"] = ""
+    mc(topic)["options"][1]["correct"] = "nein"
+    errors, _ = validate(TOPIC_VALIDATOR, topic, "")
+    assert len(errors) == 3
+
+@pytest.fixture
+def topic_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(schema_validation, "BUILD_DIR", tmp_path / ".build")
+    monkeypatch.setattr(schema_validation, "CACHE_PATH", tmp_path / ".build" / "validation_cache.json")
+    return tmp_path
+
+def write_topic(directory, name, topic):
+    path = directory / name
+    path.write_text(json.dumps(topic, ensure_ascii=False), encoding='utf-8')
+    return path
+
+def test_topic_files_report_file_names_and_cross_file_duplicates(topic_dir):
+    first = write_topic(topic_dir, "topic_01_a.json", VALID_TOPIC)
+    second = write_topic(topic_dir, "topic_02_b.json", VALID_TOPIC)
+    broken = topic_dir / "topic_03_c.json"
+    broken.write_text('{"topic": ', encoding='utf-8')
+
+    errors, checked = validate_topic_files([first, second, broken])
+    assert checked == ["topic_01_a.json", "topic_02_b.json", "topic_03_c.json"]
+    assert any(e.startswith("topic_03_c.json: kein gültiges JSON") for e in errors)
+    duplicates = [e for e in errors if "bereits vergeben" in e]
+    assert len(duplicates) == 2
+    assert all(e.startswith("topic_02_b.json") and "(topic_01_a.json" in e for e in duplicates)
+
+    with pytest.raises(ValueError, match="Topic-Dateien ungültig"):
+        ensure_valid(errors, "Topic-Dateien")
+
+def test_undecodable_topic_files_are_reported(topic_dir):
+    utf16 = topic_dir / "topic_01_a.json"
+    utf16.write_text(json.dumps(VALID_TOPIC), encoding='utf-16')
+    latin1 = topic_dir / "topic_02_b.json"
+    latin1.write_bytes(json.dumps(VALID_TOPIC, ensure_ascii=False).replace("Macht", "Übermacht").encode('latin-1'))
+
+    errors, checked = validate_topic_files([utf16, latin1])
+    assert checked == ["topic_01_a.json", "topic_02_b.json"]
+    assert len(errors) == 2
+    assert errors[0].startswith("topic_01_a.json: kein gültiges UTF-8")
+    assert errors[1].startswith("topic_02_b.json: kein gültiges UTF-8")
+
+def test_cached_results_still_report_errors(topic_dir):
+    topic = copy.deepcopy(VALID_TOPIC)
+    mc(topic)["options"][0]["correct"] = False
+    path = write_topic(topic_dir, "topic_01_a.json", topic)
+
+    errors, checked = validate_topic_files([path])
+    assert checked == ["topic_01_a.json"]
+    cached_errors, checked = validate_topic_files([path])
+    assert checked == []
+    assert cached_errors == errors
+    assert validate_topic_files([path], force=True)[1] == ["topic_01_a.json"]
+
+def test_real_bank_is_valid():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert validate_bank(data) == []
+
+def test_bank_questions_need_topic_id():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    del data["mcQuestions"][3]["topicId"]
+    data["openQuestions"][0]["topicId"] = "1"
+    errors = validate_bank(data)
+    assert errors == [
+        "questions.json.mcQuestions[3]: Pflichtfeld 'topicId' fehlt",
+        "questions.json.openQuestions[0].topicId: Ganzzahl erwartet, str gefunden",
+    ]
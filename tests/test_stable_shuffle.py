@@ -0,0 +1,56 @@
+"""Die Optionsreihenfolge hängt nur von der Frage selbst ab (siehe stable_shuffle.py)."""
+
+import copy
+import json
+import random
+
+import fix_patterns
+from conftest import DATA_DIR
+from stable_shuffle import question_seed, shuffle_options
+
+def real_questions():
+    with open(DATA_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)["mcQuestions"]
+
+def option_order(q):
+    return [(opt["text"], opt["correct"]) for opt in q["options"]]
+
+def test_shuffle_is_idempotent():
+    for q in real_questions():
+        once = shuffle_options(copy.deepcopy(q))
+        twice = shuffle_options(copy.deepcopy(once))
+        assert option_order(once) == option_order(twice)
+
+def test_shuffle_ignores_incoming_option_order():
+    rng = random.Random(7)
+    for q in real_questions()[:100]:
+        expected = option_order(shuffle_options(copy.deepcopy(q)))
+        permuted = copy.deepcopy(q)
+        rng.shuffle(permuted["options"])
+        assert option_order(shuffle_options(permuted)) == expected
+
+def test_shuffle_keeps_options():
+    for q in real_questions():
+        shuffled = shuffle_options(copy.deepcopy(q))
+        assert sorted(option_order(shuffled)) == sorted(option_order(q))
+
+def test_other_questions_do_not_change_the_order():
+    questions = real_questions()
+    alone = {q["id"]: option_order(shuffle_options(copy.deepcopy(q))) for q in questions}
+
+    # Andere Reihenfolge der Bank, eine Frage weniger, eine neue dazu
+    data = {"metadata": {}, "mcQuestions": copy.deepcopy(questions[::-1][1:])}
+    data["mcQuestions"].append({"id": "neu", "stem": "Neu?", "options": [
+        {"text": "a", "correct": True}, {"text": "b", "correct": False}]})
+    fix_patterns.fix_questions(data)
+    for q in data["mcQuestions"]:
+        if q["id"] in alone:
+            assert option_order(q) == alone[q["id"]]
+
+def test_seed_depends_on_purpose_and_content():
+    q = real_questions()[0]
+    assert question_seed(q, "options") == question_seed(copy.deepcopy(q), "options")
+    assert question_seed(q, "options") != question_seed(q, "extensions")
+    changed = copy.deepcopy(q)
+    changed["stem"] += " "
+    assert question_seed(changed, "options") != question_seed(q, "options")